@@ -0,0 +1,149 @@
+"""
+bench_conversion.py
+
+Measures the numeric conversions of the typed getters against the ones they replaced,
+for scalars and for lists of numbers as loaded from a file.
+
+The previous getters turned every value into a string, searched it with an uncompiled
+regular expression and parsed it back, one item at a time for the lists. The conversion
+module returns numbers as they are, parses strings without regular expressions, and
+converts lists holding only numbers, or only numeric strings, in bulk. Both are checked
+to give the same result before being timed.
+
+Usage:
+    python benchmarks/bench_conversion.py [--size N] [--repeat R]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable-next=wrong-import-position
+from yaml_manager import conversion
+
+
+def _float_before(value: any) -> any:
+    """
+    Converts a value into a float as the previous `float()` getter did.
+    """
+    string = str(value)
+    return float(string) if re.search(r"^-?\d+(\.\d+)?$", string) else None
+
+
+def _int_before(value: any) -> any:
+    """
+    Converts a value into an integer as the previous `int()` getter did.
+    """
+    string = str(value)
+    return int(string) if re.search(r"^-?\d+$", string) else None
+
+
+def _float_list_before(items: list) -> list:
+    """
+    Converts a list into a list of floats as the previous `float_list()` getter did.
+    """
+    float_list = []
+
+    for item in items:
+        if isinstance(item, (float, int)):
+            float_list.append(float(item))
+
+        else:
+            string = str(item)
+            float_list.append(float(string) if re.search(r"^-?\d+(\.\d+)?$", string) else 0.0)
+
+    return float_list
+
+
+def _int_list_before(items: list) -> list:
+    """
+    Converts a list into a list of integers as the previous `int_list()` getter did.
+
+    Its pattern did not escape the dot, so strings of decimal numbers raised ValueError
+    instead of being truncated: only integer strings are measured.
+    """
+    int_list = []
+
+    for item in items:
+        if isinstance(item, (int, float)):
+            int_list.append(int(item))
+
+        else:
+            string = str(item)
+            int_list.append(int(string) if re.search(r"^-?\d+(.\d+)?$", string) else 0)
+
+    return int_list
+
+
+def _cases(size: int) -> list[tuple]:
+    """
+    Gets the name, previous conversion, new conversion, value and number of calls of each
+    measure.
+    """
+    floats = [i / 8 + 0.5 for i in range(size)]
+    ints = list(range(-size // 2, size - size // 2))
+    mixed = [i if i % 2 else i + 0.25 for i in range(size)]
+    strings = [str(i) for i in ints]
+
+    return [
+        ("float(2.5)", _float_before, conversion.to_float, 2.5, 100000),
+        ("float(5432)", _float_before, conversion.to_float, 5432, 100000),
+        ("float('2.5')", _float_before, conversion.to_float, "2.5", 100000),
+        ("int(5432)", _int_before, conversion.to_int, 5432, 100000),
+        ("int('5432')", _int_before, conversion.to_int, "5432", 100000),
+        ("float_list(floats)", _float_list_before, conversion.to_float_list, floats, 1),
+        ("float_list(ints)", _float_list_before, conversion.to_float_list, ints, 1),
+        ("float_list(mixed)", _float_list_before, conversion.to_float_list, mixed, 1),
+        ("float_list(strings)", _float_list_before, conversion.to_float_list, strings, 1),
+        ("int_list(ints)", _int_list_before, conversion.to_int_list, ints, 1),
+        ("int_list(mixed)", _int_list_before, conversion.to_int_list, mixed, 1),
+        ("int_list(strings)", _int_list_before, conversion.to_int_list, strings, 1),
+    ]
+
+
+def _best(function: any, value: any, repeat: int, number: int) -> float:
+    """
+    Gets the best time of a call of a function on a value, in µs.
+    """
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            function(value)
+
+        best = min(best, time.perf_counter() - start)
+
+    return best / number * 1e6
+
+
+def main() -> None:
+    """
+    Prints the time of the previous and new conversion of each value.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--size", type=int, default=100000,
+                        help="number of items of the lists")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'conversion':<20} {'before':>13} {'after':>13} {'speedup':>8}")
+
+    for name, before, after, value, number in _cases(args.size):
+        if before(value) != after(value):
+            raise SystemExit(f"{name}: the conversions give different results.")
+
+        previous = _best(before, value, args.repeat, number)
+        current = _best(after, value, args.repeat, number)
+
+        print(f"{name:<20} {previous:>10.3f} µs {current:>10.3f} µs "
+              f"{previous / current:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
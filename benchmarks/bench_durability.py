@@ -0,0 +1,95 @@
+"""
+bench_durability.py
+
+Measures the time of save() for each durability level, with and without the advisory
+lock of `file_lock`.
+
+Every save writes a temporary file and renames it over the target. The "file" level
+also syncs the temporary file before the rename, and "full" also syncs the directory
+after it, while the lock adds the opening and locking of the lock file. Each save
+changes one key, so that none is skipped. Syncs cost nothing on a tmpfs, such as /tmp
+on many systems: use --directory to measure on the disk the files are kept on.
+
+Usage:
+    python benchmarks/bench_durability.py [--saves S] [--keys K] [--format {json,yaml}]
+        [--directory DIR]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable-next=wrong-import-position
+from yaml_manager import FileController, JSONFile, YAMLFile
+
+
+def _data(keys: int) -> dict:
+    """
+    Builds a configuration of `keys` integers, fifty per section.
+    """
+    data = {}
+
+    for i in range(keys):
+        data.setdefault(f"section{i // 50}", {})[f"key{i}"] = i
+
+    return data
+
+
+def _save_times(file: FileController, saves: int) -> list[float]:
+    """
+    Gets the time of each save of a file, in ms, changing one key before each of them.
+    """
+    times = []
+
+    for i in range(saves):
+        file.set("counter", i)
+        start = time.perf_counter()
+        file.save()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return times
+
+
+def main() -> None:
+    """
+    Prints the mean and 99th percentile of the save time, and the saves per second, for
+    each durability level with and without the lock.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=1000,
+                        help="number of keys of the saved file")
+    parser.add_argument("--format", choices=["json", "yaml"], default="json")
+    parser.add_argument("--directory", default=None,
+                        help="directory of the saved files (default is the temporary one)")
+    args = parser.parse_args()
+
+    file_class = JSONFile if args.format == "json" else YAMLFile
+    data = _data(args.keys)
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        print(f"{'durability':>10} {'lock':>5} {'mean':>10} {'p99':>10} {'saves/s':>8}")
+
+        for durability in ("none", "file", "full"):
+            for file_lock in (False, True):
+                file = file_class(os.path.join(directory, f"config.{args.format}"))
+                file.durability = durability
+                file.file_lock = file_lock
+                file.data = data
+                file.save()
+
+                times = _save_times(file, args.saves)
+                p99 = statistics.quantiles(times, n=100)[98] if len(times) > 1 else times[0]
+
+                print(f"{durability:>10} {'on' if file_lock else 'off':>5} "
+                      f"{statistics.mean(times):>7.3f} ms {p99:>7.3f} ms "
+                      f"{1000 / statistics.mean(times):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
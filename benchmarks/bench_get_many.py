@@ -0,0 +1,105 @@
+"""
+bench_get_many.py
+
+Measures get_many() against the equivalent calls of the typed getters, for settings
+read from the same subtree, as startup code reads them.
+
+Each getter validates and splits its key and walks the data from the root, while
+get_many() checks the spec once and looks the keys up with a plan cached for the same
+keys, which walks each parent once. The values mix the types of the getters, and both
+are measured with the flat key index of `key_index` disabled and enabled. For a handful
+of keys with the index enabled, checking the spec costs about what it saves.
+
+Usage:
+    python benchmarks/bench_get_many.py [--keys K [K ...]] [--depth D] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable-next=wrong-import-position
+from yaml_manager.json_file import JSONFile
+
+# The values of the settings, by type
+_VALUES = {int: 5432, str: "db.example.com", bool: True, float: 2.5}
+
+
+def _settings(count: int, depth: int) -> tuple[dict, dict]:
+    """
+    Builds the data holding `count` settings under a subtree `depth` levels deep, and
+    the spec of get_many() reading them.
+    """
+    prefix = ".".join(["db", "primary", "pool", "options", "tuning"][:depth])
+    types = list(_VALUES)
+    node = data = {}
+
+    for name in prefix.split("."):
+        node = node.setdefault(name, {})
+
+    spec = {}
+
+    for i in range(count):
+        value_type = types[i % len(types)]
+        node[f"setting{i}"] = _VALUES[value_type]
+        spec[f"{prefix}.setting{i}"] = value_type
+
+    return data, spec
+
+
+def _best(function: any, repeat: int, number: int) -> float:
+    """
+    Gets the best time of a call of a function, in µs.
+    """
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            function()
+
+        best = min(best, time.perf_counter() - start)
+
+    return best / number * 1e6
+
+
+def main() -> None:
+    """
+    Prints the time of the getter calls and of get_many() for each number of keys.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--keys", type=int, nargs="+", default=[5, 20, 50, 200])
+    parser.add_argument("--depth", type=int, default=2,
+                        help="number of levels of the subtree holding the settings (1-5)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = JSONFile(os.path.join(directory, "config.json"))
+        getters = {int: file.int, str: file.string, bool: file.boolean, float: file.float}
+
+        print(f"{'keys':>5} {'index':>6} {'getters':>11} {'get_many':>11} {'speedup':>8}")
+
+        for count in args.keys:
+            data, spec = _settings(count, args.depth)
+            file.data = data
+            items = [(getters[value_type], key) for key, value_type in spec.items()]
+            number = max(1, 20000 // count)
+
+            for key_index in (False, True):
+                file.key_index = key_index
+                calls = _best(lambda items=items: [getter(key) for getter, key in items],
+                              args.repeat, number)
+                batched = _best(lambda spec=spec: file.get_many(spec), args.repeat, number)
+
+                print(f"{count:>5} {'on' if key_index else 'off':>6} {calls:>8.1f} µs "
+                      f"{batched:>8.1f} µs {calls / batched:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
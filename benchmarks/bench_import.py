@@ -0,0 +1,102 @@
+"""
+bench_import.py
+
+Measures the import time of the package in fresh interpreters with `-X importtime`, and
+fails when importing the package takes longer than a limit.
+
+The package imports its modules on the first use of their names, so importing it does
+not import PyYAML, and using JSONFile does not either. The eager import of the three
+modules the package used to import is measured as a reference. Each time is the median
+over the runs of the cumulative time of the modules imported by the statement, excluding
+the startup of the interpreter.
+
+Usage:
+    python benchmarks/bench_import.py [--runs R] [--max-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# The root of the repository, from which the package is imported
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The statements measured, the first one being checked against --max-ms
+_STATEMENTS = [
+    ("import yaml_manager", "import yaml_manager"),
+    ("JSONFile", "from yaml_manager import JSONFile"),
+    ("YAMLFile", "from yaml_manager import YAMLFile"),
+    ("eager (previous package)",
+     "from yaml_manager.file_controller import FileController; "
+     "from yaml_manager.json_file import JSONFile; "
+     "from yaml_manager.yaml_file import YAMLFile"),
+]
+
+# Written to stderr before the statement, to leave out the imports of the startup
+_MARK = "-- import start --"
+
+
+def _measure(statement: str) -> tuple[float, bool]:
+    """
+    Runs a statement in a fresh interpreter and gets its import time in ms, and whether
+    it imported PyYAML.
+    """
+    code = f"import sys; sys.stderr.write({_MARK!r} + '\\n'); sys.stderr.flush(); {statement}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=_ROOT,
+                            capture_output=True, text=True, check=True)
+    lines = result.stderr.splitlines()
+    total = 0
+    imported_yaml = False
+
+    for line in lines[lines.index(_MARK) + 1:]:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+
+        if not cumulative.strip().isdecimal():
+            continue
+
+        # The modules imported by other modules are indented under them
+        if not name.startswith("  "):
+            total += int(cumulative)
+
+        imported_yaml = imported_yaml or name.strip() == "yaml"
+
+    return total / 1000, imported_yaml
+
+
+def main() -> None:
+    """
+    Prints the median import time of each statement, and exits with status 1 if the
+    package takes longer than --max-ms to import.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="maximum median time of `import yaml_manager`")
+    args = parser.parse_args()
+
+    # Compiles the bytecode first, so that no run pays for it
+    subprocess.run([sys.executable, "-c", _STATEMENTS[-1][1] + "; import yaml"], cwd=_ROOT,
+                   check=True)
+
+    print(f"{'statement':<26} {'median':>10} {'yaml':>5}")
+    medians = []
+
+    for label, statement in _STATEMENTS:
+        results = [_measure(statement) for _ in range(args.runs)]
+        medians.append(statistics.median(time for time, _ in results))
+        imported_yaml = any(imported for _, imported in results)
+
+        print(f"{label:<26} {medians[-1]:>7.2f} ms {'yes' if imported_yaml else 'no':>5}")
+
+    if args.max_ms is not None and medians[0] > args.max_ms:
+        print(f"import yaml_manager took {medians[0]:.2f} ms, more than {args.max_ms} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
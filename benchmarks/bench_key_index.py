@@ -0,0 +1,107 @@
+"""
+bench_key_index.py
+
+Measures the lookups of a FileController with and without the flat key index of
+`key_index`, by depth and number of keys of the tree.
+
+Without the index a lookup walks one dictionary per level of the key, while with it a
+lookup is one hash probe whatever the depth. The index is built on the first lookup
+after each load or assignment of `data`, so its build time is reported separately: it is
+paid again after each reload.
+
+Usage:
+    python benchmarks/bench_key_index.py [--depths D [D ...]] [--sizes N [N ...]]
+        [--lookups L] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable-next=wrong-import-position
+from yaml_manager.json_file import JSONFile
+
+
+def _tree(depth: int, size: int) -> tuple[dict, list[str]]:
+    """
+    Builds a tree of `size` integers at `depth` levels, spread over eight branches per
+    level, and gets their dotted keys.
+    """
+    data = {}
+    keys = []
+
+    for i in range(size):
+        path = [f"s{(i >> (3 * level)) % 8}" for level in range(depth - 1)] + [f"key{i}"]
+        node = data
+
+        for name in path[:-1]:
+            node = node.setdefault(name, {})
+
+        node[path[-1]] = i
+        keys.append(".".join(path))
+
+    return data, keys
+
+
+def _lookup_time(file: JSONFile, keys: list[str], repeat: int) -> float:
+    """
+    Gets the best time of a lookup of each key with `int()`, in ns per lookup.
+    """
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for key in keys:
+            file.int(key)
+
+        best = min(best, time.perf_counter() - start)
+
+    return best / len(keys) * 1e9
+
+
+def main() -> None:
+    """
+    Prints the lookup time with and without the index, and the time to build it.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 3, 6, 10])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=10000,
+                        help="number of keys looked up in each measure")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = JSONFile(os.path.join(directory, "config.json"))
+
+        print(f"{'depth':>5} {'keys':>8} {'walk':>10} {'index':>10} {'speedup':>8} "
+              f"{'build':>10}")
+
+        for depth in args.depths:
+            for size in args.sizes:
+                data, keys = _tree(depth, size)
+                sample = [keys[i * len(keys) // args.lookups % len(keys)]
+                          for i in range(args.lookups)]
+
+                file.data = data
+                file.key_index = False
+                walk = _lookup_time(file, sample, args.repeat)
+
+                # Enabling the index drops it, so the next lookup builds it
+                file.key_index = True
+                start = time.perf_counter()
+                file.int(sample[0])
+                build = time.perf_counter() - start
+                index = _lookup_time(file, sample, args.repeat)
+
+                print(f"{depth:>5} {size:>8} {walk:>7.0f} ns {index:>7.0f} ns "
+                      f"{walk / index:>7.2f}x {build * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
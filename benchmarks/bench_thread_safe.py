@@ -0,0 +1,144 @@
+"""
+bench_thread_safe.py
+
+Measures a FileController shared by reader and writer threads, guarded by its thread-safe
+mode or by one global mutex around every call, as callers did before the mode existed.
+
+In thread-safe mode the readers share the lock, and the writers call `set()` and `save()`
+without holding it themselves, so that each save only holds write access to take a snapshot
+of the data and writes the file without the lock. Under the global mutex the writers hold
+it to change and save the data at once, as callers sharing an instance had to.
+
+The readers work on each value they read, outside the lock, and the writers pause between
+their writes, as an application changes its configuration much less often than it reads
+it. Without that work, the threads waiting for a lock released and taken again at once by
+a tight loop can wait for the whole run, whatever the lock. For the same reason the worst
+latency is not reported, only the 99th and 99.9th percentiles. The saves sync the file to
+the disk, see `FileController.durability`, as the time they spend waiting for the disk is
+what holding the mutex during the write costs the readers.
+
+Usage:
+    python benchmarks/bench_thread_safe.py [--readers N] [--writers M] [--seconds S]
+        [--keys K] [--work W] [--pause P] [--durability none|file|full]
+"""
+
+from contextlib import nullcontext
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable-next=wrong-import-position
+from yaml_manager.json_file import JSONFile
+
+
+def _run(file: JSONFile, guard: any, write_guard: any, args: argparse.Namespace,
+         saves: bool) -> tuple[float, float, float, float]:
+    """
+    Runs the reader and writer threads for a number of seconds, the readers holding
+    `guard` around each read and the writers holding `write_guard` around each write.
+
+    Returns
+    -------
+    tuple
+        The reads per second, the writes per second, and the 99th and 99.9th percentile
+        read latencies in ms.
+    """
+    stop = threading.Event()
+    latencies = [[] for _ in range(args.readers)]
+    writes = [0] * args.writers
+
+    def read(index: int) -> None:
+        key = f"section{index % 10}.key{index}"
+
+        while not stop.is_set():
+            start = time.perf_counter()
+
+            with guard:
+                value = file.int(key, 0)
+
+            latencies[index].append(time.perf_counter() - start)
+            sum(range(value % 10 + args.work))
+
+    def write(index: int) -> None:
+        while not stop.is_set():
+            with write_guard:
+                file.set(f"section{index % 10}.key{index}", writes[index])
+
+                if saves:
+                    file.save()
+
+            writes[index] += 1
+            stop.wait(args.pause)
+
+    threads = ([threading.Thread(target=read, args=(i,)) for i in range(args.readers)] +
+               [threading.Thread(target=write, args=(i,)) for i in range(args.writers)])
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.seconds)
+    stop.set()
+
+    for thread in threads:
+        thread.join()
+
+    samples = sorted(latency for thread_latencies in latencies for latency in thread_latencies)
+    return (len(samples) / args.seconds, sum(writes) / args.seconds,
+            samples[int(len(samples) * 0.99)] * 1000, samples[int(len(samples) * 0.999)] * 1000)
+
+
+def main() -> None:
+    """
+    Prints the throughput of each mode, with writers that only change the data and with
+    writers that save it.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--keys", type=int, default=3000)
+    parser.add_argument("--work", type=int, default=100,
+                        help="size of the loop each reader runs on a value it read")
+    parser.add_argument("--durability", choices=("none", "file", "full"), default="full")
+    parser.add_argument("--pause", type=float, default=0.05,
+                        help="seconds each writer waits between its writes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config.json")
+        data = {f"section{i % 10}": {} for i in range(10)}
+
+        for i in range(args.keys):
+            data[f"section{i % 10}"][f"key{i}"] = i
+
+        print(f"{args.readers} readers, {args.writers} writers, {args.keys} keys, "
+              f"durability {args.durability}")
+        print(f"{'writers':<8} {'mode':<14} {'reads/s':>10} {'writes/s':>9} "
+              f"{'p99 read':>11} {'p99.9 read':>11}")
+
+        for saves in (False, True):
+            for mode in ("global mutex", "thread_safe"):
+                file = JSONFile(path)
+                file.data = data
+                file.save(force=True)
+                file.durability = args.durability
+                file.thread_safe = mode == "thread_safe"
+
+                # The calls of the thread-safe mode take the lock themselves
+                if mode == "global mutex":
+                    guard = write_guard = threading.Lock()
+                else:
+                    guard = write_guard = nullcontext()
+
+                reads, writes, p99, p999 = _run(file, guard, write_guard, args, saves)
+                print(f"{'save' if saves else 'set':<8} {mode:<14} {reads:>10.0f} "
+                      f"{writes:>9.0f} {p99:>8.3f} ms {p999:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Tests of the array getters and their cache, through JSONFile.
+"""
+
+from array import array
+
+import pytest
+
+from yaml_manager import conversion
+from yaml_manager.json_file import JSONFile
+
+
+@pytest.fixture(name="numpy", params=["array", "numpy"])
+def fixture_numpy(request, monkeypatch):
+    if request.param == "numpy":
+        return pytest.importorskip("numpy")
+
+    monkeypatch.setattr(conversion, "numpy_module", lambda: None)
+    return None
+
+
+@pytest.fixture(name="file")
+def fixture_file(tmp_path):
+    return JSONFile(str(tmp_path / "config.json"))
+
+
+def test_arrays_follow_the_list_rules(file, numpy):
+    file.set("xs", [1, 2.5, "3.75", "x", True, -4])
+
+    floats = file.float_array("xs")
+    ints = file.int_array("xs")
+
+    assert list(floats) == file.float_list("xs")
+    assert list(ints) == file.int_list("xs")
+
+    if numpy is None:
+        assert (floats.typecode, ints.typecode) == ("d", "q")
+    else:
+        assert (floats.dtype, ints.dtype) == (numpy.float64, numpy.int64)
+
+
+def test_missing_array_stores_its_default(file, numpy):
+    assert file.float_array("xs") is None
+    assert list(file.int_array("xs", [3, 4])) == [3, 4]
+    assert file.data == {"xs": [3, 4]}
+
+    with pytest.raises(TypeError):
+        file.float_array("ys", "1, 2")
+
+    with pytest.raises(OverflowError):
+        file.int_array("big", [2 ** 70])
+
+
+def test_arrays_are_cached_until_the_key_changes(file, numpy):
+    file.set("xs", [1, 2, 3])
+    first = file.float_array("xs")
+    second = file.float_array("xs")
+
+    if numpy is None:
+        assert isinstance(first, array) and first is not second
+        first[0] = 100.0
+        assert file.float_array("xs")[0] == 1.0
+    else:
+        assert first is second
+        assert not first.flags.writeable
+
+    file.set("xs", [4, 5])
+
+    assert list(file.float_array("xs")) == [4.0, 5.0]
+
+
+def test_array_cache_sees_items_changed_in_place(file, numpy):
+    file.set("xs", [1, 2, 3])
+
+    assert list(file.float_array("xs")) == [1.0, 2.0, 3.0]
+    assert list(file.int_array("xs")) == [1, 2, 3]
+
+    file.data["xs"][0] = 9
+
+    assert list(file.float_array("xs")) == [9.0, 2.0, 3.0]
+    assert list(file.int_array("xs")) == [9, 2, 3]
+
+    file.data["xs"][1] = True
+    file.data["xs"].append(7)
+
+    assert list(file.int_array("xs")) == file.int_list("xs")
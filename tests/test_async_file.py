@@ -0,0 +1,136 @@
+"""
+Tests of the asyncio file classes.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from yaml_manager.async_file import AsyncJSONFile, AsyncYAMLFile
+from yaml_manager.json_file import JSONFile
+from yaml_manager.yaml_file import YAMLFile
+
+
+def test_loop_getters_are_not_blocked_by_asave_and_areload(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+
+    async def check(file, method, start_io):
+        started = threading.Event()
+        release = threading.Event()
+        original = getattr(file, method)
+
+        def slow(*args):
+            started.set()
+            release.wait(5)
+            return original(*args)
+
+        monkeypatch.setattr(file, method, slow)
+        task = asyncio.ensure_future(start_io())
+        assert await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+
+        start = time.monotonic()
+        assert file.int("a") == 1
+        assert time.monotonic() - start < 1
+
+        release.set()
+        assert await task
+
+    async def main():
+        file = AsyncJSONFile(str(path))
+        await file.aload()
+        await check(file, "_dump_data", lambda: file.asave(force=True))
+        await check(file, "_load_data", lambda: file.areload(force=True))
+
+    asyncio.run(main())
+
+
+def _touch(path, content):
+    path.write_text(content, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_aload_areload_and_asave(tmp_path):
+    path = tmp_path / "config.json"
+    _touch(path, '{"a": 1}')
+
+    async def main():
+        file = AsyncJSONFile(str(path))
+        assert not file.is_loaded
+
+        await file.aload()
+        assert file.is_loaded and file.thread_safe
+        assert file.data == {"a": 1}
+
+        assert not await file.areload()
+        _touch(path, '{"a": 2}')
+        assert await file.areload()
+        assert file.int("a") == 2
+
+        assert not await file.asave()
+        file.set("b", 3)
+        assert await file.asave()
+
+        with pytest.raises(TypeError):
+            await file.asave(force="yes")
+
+    asyncio.run(main())
+    assert JSONFile(str(path)).data == {"a": 2, "b": 3}
+
+
+def test_concurrent_asaves_are_coalesced(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    writes = []
+
+    async def main():
+        file = AsyncJSONFile(str(path))
+        write_file = file._write_file
+
+        def slow_write(data):
+            time.sleep(0.05)
+            writes.append(json.loads(json.dumps(data)))
+            write_file(data)
+
+        monkeypatch.setattr(file, "_write_file", slow_write)
+        calls = []
+
+        for i in range(10):
+            file.set("n", i)
+            calls.append(asyncio.ensure_future(file.asave()))
+            await asyncio.sleep(0)
+
+        # A cancelled caller does not cancel the save shared with the other ones
+        calls[-1].cancel()
+        results = await asyncio.gather(*calls[:-1])
+
+        assert all(results)
+        assert len(writes) == 2
+        assert writes[-1] == {"n": 9}
+
+    asyncio.run(main())
+    assert JSONFile(str(path)).data == {"n": 9}
+
+
+def test_process_pool_parses_and_serializes(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: [1, 2]\nb: {c: text}\n", encoding="utf-8")
+
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            file = AsyncYAMLFile(str(path), safe=True)
+            file.executor = executor
+
+            await file.aload()
+            assert file.data == {"a": [1, 2], "b": {"c": "text"}}
+
+            file.set("b.c", "changed")
+            assert await file.asave()
+
+    asyncio.run(main())
+    assert YAMLFile(str(path)).data == {"a": [1, 2], "b": {"c": "changed"}}
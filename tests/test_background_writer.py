@@ -0,0 +1,65 @@
+"""
+Tests of the BackgroundWriter of the write-behind mode, through JSONFile.
+"""
+
+import gc
+import os
+import threading
+import time
+import weakref
+
+import pytest
+
+from yaml_manager.background_writer import WRITER
+from yaml_manager.json_file import JSONFile
+
+
+def _failing_replace(*_):
+    raise OSError("disk full")
+
+
+def test_failed_write_does_not_keep_the_controller_alive(tmp_path, monkeypatch):
+    file = JSONFile(str(tmp_path / "config.json"))
+    file.write_behind = 0.0
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", _failing_replace)
+        file.set("n", 1)
+        file.save()
+        assert WRITER.flush(file, 5.0)
+
+    reference = weakref.ref(file)
+    del file
+    gc.collect()
+
+    assert reference() is None
+
+
+def test_flush_all_gives_up_after_its_timeout(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.write_behind = 0.0
+    release = threading.Event()
+    write_file = file._write_file
+
+    def blocked_write(data):
+        release.wait(5.0)
+        write_file(data)
+
+    monkeypatch.setattr(file, "_write_file", blocked_write)
+    file.set("n", 1)
+    file.save()
+
+    try:
+        start = time.monotonic()
+
+        with pytest.warns(RuntimeWarning, match="config.json"):
+            assert not WRITER.flush_all(0.2)
+
+        assert time.monotonic() - start < 2.0
+
+    finally:
+        release.set()
+
+    assert WRITER.flush_all(5.0)
+    assert JSONFile(path).data == {"n": 1}
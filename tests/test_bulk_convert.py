@@ -0,0 +1,22 @@
+"""
+Tests of the conversion of directory trees.
+"""
+
+import json
+
+from yaml_manager.bulk_convert import convert_directory
+
+
+def test_files_with_the_same_output_are_reported(tmp_path):
+    (tmp_path / "a.yaml").write_text("source: yaml\n", encoding="utf-8")
+    (tmp_path / "a.yml").write_text("source: yml\n", encoding="utf-8")
+    (tmp_path / "b.yml").write_text("source: b\n", encoding="utf-8")
+
+    report = convert_directory(str(tmp_path), processes=1)
+
+    assert report.converted == 1
+    assert sorted(report.failures) == [str(tmp_path / "a.yaml"), str(tmp_path / "a.yml")]
+    assert str(tmp_path / "a.yml") in report.failures[str(tmp_path / "a.yaml")]
+    assert str(tmp_path / "a.yaml") in report.failures[str(tmp_path / "a.yml")]
+    assert not (tmp_path / "a.json").exists()
+    assert json.loads((tmp_path / "b.json").read_text(encoding="utf-8")) == {"source": "b"}
@@ -0,0 +1,123 @@
+"""
+Tests of loading every JSON and YAML file of a directory.
+"""
+
+import json
+import os
+
+import pytest
+import yaml
+
+from yaml_manager.bulk_load import load_directory
+from yaml_manager.json_file import JSONFile
+from yaml_manager.yaml_file import YAMLFile
+
+FILES = {
+    "10-base.yaml": "db: {host: localhost, port: 5432}\nlevels: [info]\nname: base\n",
+    "20-local.yml": "db: {host: db.local}\nlevels: [debug]\n",
+    "30-empty.yaml": "",
+    "conf.d/40-app.json": json.dumps({"db": {"pool": 4}, "app": {"workers": 2}}),
+    "conf.d/50-cache.YAML": "cache: {ttl: 60}\n",
+    "notes.txt": "not: loaded\n",
+}
+
+
+@pytest.fixture(name="directory")
+def fixture_directory(tmp_path):
+    for name, content in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    return str(tmp_path)
+
+
+def _path(directory, name):
+    return os.path.join(directory, *name.split("/"))
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_data_of_each_file_by_path(directory, processes):
+    data = load_directory(directory, processes=processes)
+
+    assert list(data) == sorted(_path(directory, name) for name in FILES
+                                if not name.endswith(".txt"))
+    assert data[_path(directory, "10-base.yaml")] == {
+        "db": {"host": "localhost", "port": 5432}, "levels": ["info"], "name": "base"}
+    assert data[_path(directory, "30-empty.yaml")] is None
+    assert data[_path(directory, "conf.d/40-app.json")] == {"db": {"pool": 4},
+                                                            "app": {"workers": 2}}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_loaded_files_by_path(directory, processes):
+    files = load_directory(directory, pattern="*.y*ml", result="files", processes=processes)
+
+    assert list(files) == [_path(directory, name)
+                           for name in ("10-base.yaml", "20-local.yml", "30-empty.yaml")]
+    assert all(isinstance(file, YAMLFile) and file.is_loaded for file in files.values())
+
+    base = files[_path(directory, "10-base.yaml")]
+
+    assert not base.is_dirty
+    assert not base.reload()
+
+    base.set("name", "changed")
+    assert base.save()
+    assert YAMLFile(base.file_path).string("name") == "changed"
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_merged_data_in_path_order(directory, processes):
+    merged = load_directory(directory, result="merged", processes=processes)
+
+    assert merged == {
+        "db": {"host": "db.local", "port": 5432, "pool": 4},
+        "levels": ["debug"],
+        "name": "base",
+        "app": {"workers": 2},
+        "cache": {"ttl": 60},
+    }
+
+
+def test_pattern_selects_the_files(directory):
+    files = load_directory(directory, pattern="conf.d/*.json", result="files")
+
+    assert list(files) == [_path(directory, "conf.d/40-app.json")]
+    assert isinstance(files[_path(directory, "conf.d/40-app.json")], JSONFile)
+    assert load_directory(directory, pattern="*.txt") == {}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_invalid_files_raise(directory, processes):
+    with open(_path(directory, "15-broken.yaml"), "w", encoding="utf-8") as file:
+        file.write("a: [unclosed\n")
+
+    with pytest.raises(yaml.YAMLError):
+        load_directory(directory, processes=processes)
+
+    os.remove(_path(directory, "15-broken.yaml"))
+
+    with open(_path(directory, "15-broken.json"), "w", encoding="utf-8") as file:
+        file.write('{"a": ')
+
+    with pytest.raises(ValueError):
+        load_directory(directory, processes=processes)
+
+
+def test_merging_a_file_without_a_dictionary_raises(directory):
+    with open(_path(directory, "60-list.json"), "w", encoding="utf-8") as file:
+        file.write("[1, 2]")
+
+    with pytest.raises(ValueError, match="60-list.json"):
+        load_directory(directory, result="merged")
+
+
+def test_arguments_are_checked(directory):
+    for arguments in ({"directory": 1}, {"pattern": None}, {"result": "tree"},
+                      {"processes": 0}, {"processes": True}):
+        with pytest.raises(TypeError):
+            load_directory(**{"directory": directory, **arguments})
+
+    with pytest.raises(NotADirectoryError):
+        load_directory(_path(directory, "10-base.yaml"))
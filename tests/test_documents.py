@@ -0,0 +1,84 @@
+"""
+Tests of iterating over the documents of multi-document YAML files.
+"""
+
+import io
+
+import pytest
+import yaml
+
+from yaml_manager import yaml_stream
+from yaml_manager.yaml_file import YAMLFile
+
+DOCUMENTS = """\
+first: 1
+---
+- a
+- b
+--- !!map
+text: |
+  --- not a start, as it is indented
+  last line
+...
+%YAML 1.1
+---
+version: 1.1
+--- plain scalar
+---
+nested: {deep: [1, 2, {x: y}]}
+"""
+
+
+def _file(tmp_path, content):
+    path = tmp_path / "documents.yaml"
+    path.write_text(content, encoding="utf-8")
+    return YAMLFile(str(path), safe=True, lazy=True)
+
+
+def _many_documents(count):
+    return "".join(f"---\nindex: {i}\nitems: [{i}, {i + 1}]\n" for i in range(count))
+
+
+def test_documents_are_yielded_in_order(tmp_path):
+    file = _file(tmp_path, DOCUMENTS)
+
+    assert list(file.iter_documents()) == list(yaml.safe_load_all(DOCUMENTS))
+    assert not file.is_loaded
+
+
+@pytest.mark.parametrize("batch_size", [1, 40, 1 << 20])
+def test_parallel_documents_match_the_sequential_ones(tmp_path, batch_size):
+    file = _file(tmp_path, DOCUMENTS + _many_documents(50))
+
+    assert (list(file.iter_documents(processes=2, batch_size=batch_size)) ==
+            list(file.iter_documents()))
+
+
+def test_batches_hold_whole_documents():
+    content = DOCUMENTS + _many_documents(20)
+    batches = list(yaml_stream._split_batches(io.StringIO(content), 30))
+
+    assert len(batches) > 1
+    assert "".join(batches) == content
+    assert [document for batch in batches for document in yaml.safe_load_all(batch)] == list(
+        yaml.safe_load_all(content))
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_invalid_document_raises(tmp_path, processes):
+    file = _file(tmp_path, "a: 1\n---\nb: [unclosed\n")
+
+    with pytest.raises(yaml.YAMLError):
+        list(file.iter_documents(processes=processes))
+
+
+def test_arguments_are_checked(tmp_path):
+    file = _file(tmp_path, DOCUMENTS)
+
+    for processes in (0, -1, True, 1.5):
+        with pytest.raises(TypeError):
+            file.iter_documents(processes=processes)
+
+    for batch_size in (0, False, "1"):
+        with pytest.raises(TypeError):
+            file.iter_documents(processes=2, batch_size=batch_size)
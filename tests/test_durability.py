@@ -0,0 +1,140 @@
+"""
+Tests of the atomic saves, their durability levels and the advisory file lock, through
+JSONFile.
+"""
+
+import os
+import stat
+import threading
+
+import pytest
+
+from yaml_manager import file_lock
+from yaml_manager.json_file import JSONFile
+
+
+def _saved_file(path, data):
+    file = JSONFile(str(path))
+    file.data = data
+    file.save()
+    return file
+
+
+def _failing_dump(*_):
+    raise ValueError("cannot serialize")
+
+
+def test_save_replaces_the_file_atomically(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    file = _saved_file(path, {"a": 1})
+    inode = os.stat(path).st_ino
+
+    file.set("a", 2)
+    file.save()
+
+    assert os.stat(path).st_ino != inode
+    assert os.listdir(tmp_path) == ["config.json"]
+
+    monkeypatch.setattr(file, "_dump_data", _failing_dump)
+    file.set("a", 3)
+
+    with pytest.raises(ValueError):
+        file.save()
+
+    assert JSONFile(str(path)).data == {"a": 2}
+    assert os.listdir(tmp_path) == ["config.json"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_save_keeps_the_permissions_and_symbolic_links(tmp_path):
+    path = tmp_path / "config.json"
+    file = _saved_file(path, {"a": 1})
+    os.chmod(path, 0o640)
+
+    file.set("a", 2)
+    file.save()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+    link = tmp_path / "link.json"
+    link.symlink_to(path)
+    linked = JSONFile(str(link))
+    linked.set("a", 3)
+    linked.save()
+
+    assert link.is_symlink()
+    assert JSONFile(str(path)).data == {"a": 3}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+@pytest.mark.parametrize("durability, syncs", [("none", 0), ("file", 1), ("full", 2)])
+def test_durability_levels_sync_the_file_and_directory(tmp_path, monkeypatch, durability,
+                                                       syncs):
+    file = _saved_file(tmp_path / "config.json", {"a": 1})
+    file.durability = durability
+    calls = []
+    fsync = os.fsync
+
+    def counting_fsync(descriptor):
+        calls.append(descriptor)
+        fsync(descriptor)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    file.set("a", 2)
+    file.save()
+
+    assert len(calls) == syncs
+
+    file.durability = "always"
+    file.set("a", 3)
+
+    with pytest.raises(TypeError):
+        file.save()
+
+
+@pytest.mark.skipif(file_lock.fcntl is None, reason="no advisory locks without fcntl")
+def test_locked_save_waits_for_the_lock_holder(tmp_path):
+    path = tmp_path / "config.json"
+    file = _saved_file(path, {"a": 1})
+    file.file_lock = True
+    file.lock_timeout = 0.1
+
+    with file_lock.locked(str(path), exclusive=True):
+        file.set("a", 2)
+
+        with pytest.raises(TimeoutError):
+            file.save()
+
+        assert JSONFile(str(path)).data == {"a": 1}
+
+    assert os.path.exists(file_lock.lock_path(str(path)))
+    assert file.save()
+    assert JSONFile(str(path)).data == {"a": 2}
+
+
+@pytest.mark.skipif(file_lock.fcntl is None, reason="no advisory locks without fcntl")
+def test_readers_share_the_lock(tmp_path):
+    path = tmp_path / "config.json"
+    _saved_file(path, {"a": 1})
+    reader = JSONFile(str(path))
+    reader.file_lock = True
+    reader.lock_timeout = 1.0
+    errors = []
+
+    def writer():
+        try:
+            with file_lock.locked(str(path), exclusive=True, timeout=0.1):
+                pass
+
+        except TimeoutError as error:
+            errors.append(error)
+
+    with file_lock.locked(str(path), exclusive=False):
+        assert reader.reload(force=True)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
+    assert file_lock.lock_path(str(path)) == str(tmp_path / ".config.json.lock")
@@ -0,0 +1,167 @@
+"""
+Tests of the FileController base class, through JSONFile.
+"""
+
+import dataclasses
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from yaml_manager.json_file import JSONFile
+
+
+def _failing_replace(*_):
+    raise OSError("disk full")
+
+
+def test_failed_background_write_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.set("n", 0)
+    file.save()
+    file.write_behind = 0.0
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", _failing_replace)
+        file.set("n", 1)
+        file.save()
+
+        with pytest.raises(OSError, match="disk full"):
+            file.flush()
+
+    assert file.is_dirty
+    assert file.save()
+    file.flush()
+    assert JSONFile(path).data == {"n": 1}
+
+
+def test_failed_transaction_restores_the_data_in_order(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.data = {"x": 5, "a": {"b": 1, "c": 2}, "d": {"e": 3}, "z": 0}
+    file.save()
+    before = json.dumps(file.data)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", _failing_replace)
+
+        with pytest.raises(OSError):
+            with file.transaction() as changes:
+                changes.update({"x": None, "a.b": 9, "a.new": 1, "d.e": None, "z.deep": 1})
+
+    assert json.dumps(file.data) == before
+    assert not file.is_dirty
+    assert not file.save()
+
+
+def test_reload_rejected_by_a_view_keeps_the_old_data(tmp_path):
+    @dataclasses.dataclass
+    class Server:
+        host: str
+        port: int
+
+    path = tmp_path / "config.json"
+    path.write_text('{"host": "a", "port": 1}', encoding="utf-8")
+    file = JSONFile(str(path))
+    view = file.bind(Server)
+
+    path.write_text('{"host": "b", "port": "invalid"}', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        file.reload(force=True)
+
+    assert file.data == {"host": "a", "port": 1}
+    assert (view.host, view.port) == ("a", 1)
+
+    path.write_text('{"host": "c", "port": 3}', encoding="utf-8")
+    assert file.reload(force=True)
+    assert (view.host, view.port) == ("c", 3)
+
+
+def test_thread_safe_saves_write_every_change(tmp_path):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.thread_safe = True
+
+    def work(index):
+        for key in range(50):
+            file.set(f"thread{index}.key{key}", key)
+            file.int(f"thread{(index + 1) % 4}.key{key}", 0)
+            file.save()
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    file.save()
+    assert JSONFile(path).data == file.data
+    assert all(file.int(f"thread{index}.key49") == 49 for index in range(4))
+
+
+def test_failing_subscriber_is_raised_after_the_others(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1, "b": 1}', encoding="utf-8")
+    file = JSONFile(str(path))
+    calls = []
+
+    def failing(_, changes):
+        calls.append(("failing", changes.changed))
+        raise RuntimeError("subscriber failed")
+
+    file.subscribe("a", failing)
+    file.subscribe("", lambda _, changes: calls.append(("all", changes.changed)))
+
+    path.write_text('{"a": 2, "b": 2}', encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="subscriber failed"):
+        file.reload(force=True)
+
+    assert calls == [("failing", ("a",)), ("all", ("a", "b"))]
+    assert file.data == {"a": 2, "b": 2}
+
+
+def test_numeric_string_lists_keep_the_item_rules(tmp_path):
+    file = JSONFile(str(tmp_path / "config.json"))
+    file.data = {"valid": ["1", "-2.5", "007"], "invalid": ["1", "1e3", ".5", "2."]}
+
+    assert file.float_list("valid") == [1.0, -2.5, 7.0]
+    assert file.int_list("valid") == [1, -2, 7]
+    assert file.float_list("invalid") == [1.0, 0.0, 0.0, 0.0]
+    assert file.int_list("invalid") == [1, 0, 0, 0]
+
+
+def test_thread_safe_save_writes_its_snapshot_without_the_lock(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.thread_safe = True
+    file.set("a", 1)
+    writing = threading.Event()
+    release = threading.Event()
+    dump = file._dump_data
+
+    def slow_dump(data, stream):
+        writing.set()
+        release.wait(5)
+        dump(data, stream)
+
+    monkeypatch.setattr(file, "_dump_data", slow_dump)
+    saving = threading.Thread(target=file.save)
+    saving.start()
+    assert writing.wait(5)
+
+    start = time.monotonic()
+    assert file.int("a") == 1
+    file.set("b", 2)
+    assert time.monotonic() - start < 1
+
+    release.set()
+    saving.join()
+    assert JSONFile(path).data == {"a": 1}
+    assert file.is_dirty
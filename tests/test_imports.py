@@ -0,0 +1,51 @@
+"""
+Tests of the lazy imports of the package, in fresh interpreters.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import yaml_manager
+
+# The root of the repository, from which the package is imported
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _modules_after(statement):
+    code = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_importing_the_package_imports_no_format_module():
+    modules = _modules_after("import yaml_manager")
+
+    assert "yaml_manager" in modules
+    assert not {"yaml", "json", "yaml_manager.file_controller"} & modules
+
+
+def test_json_files_do_not_import_yaml(tmp_path):
+    path = str(tmp_path / "config.json")
+    modules = _modules_after(f"from yaml_manager import JSONFile; JSONFile({path!r}).set('a', 1)")
+
+    assert "yaml_manager.json_file" in modules
+    assert "yaml" not in modules
+
+
+def test_yaml_files_import_yaml():
+    assert "yaml" in _modules_after("from yaml_manager import YAMLFile")
+
+
+@pytest.mark.parametrize("name", yaml_manager.__all__)
+def test_every_public_name_resolves(name):
+    assert getattr(yaml_manager, name) is not None
+    assert name in dir(yaml_manager)
+
+
+def test_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError, match="no_such_name"):
+        getattr(yaml_manager, "no_such_name")
@@ -0,0 +1,46 @@
+"""
+Tests of the lazy sections of JSONFile against eager loading.
+"""
+
+import json
+
+import pytest
+
+from yaml_manager.json_file import JSONFile
+
+
+@pytest.mark.parametrize("content", [
+    '{"a": tru, "b": 1}',
+    '{"a": 1x, "b": 1}',
+    '{"a": 01}',
+    '{"a": -, "b": 1}',
+    '{"a": }',
+])
+@pytest.mark.parametrize("lazy_sections", [1, 2])
+def test_invalid_scalar_is_rejected_as_when_eager(tmp_path, content, lazy_sections):
+    path = tmp_path / "config.json"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        JSONFile(str(path))
+
+    with pytest.raises(json.JSONDecodeError):
+        JSONFile(str(path), lazy_sections=lazy_sections)
+
+
+def test_invalid_second_level_scalar_is_rejected(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": {"b": nul, "c": 1}}', encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        JSONFile(str(path), lazy_sections=2)
+
+
+@pytest.mark.parametrize("lazy_sections", [1, 2])
+def test_valid_scalars_load_as_when_eager(tmp_path, lazy_sections):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": -1.5e+3, "b": {"c": true, "d": null, "e": 0}, "f": false,'
+                    ' "g": NaN, "h": -Infinity, "i": 10}', encoding="utf-8")
+
+    assert (json.dumps(JSONFile(str(path), lazy_sections=lazy_sections).data) ==
+            json.dumps(JSONFile(str(path)).data))
@@ -0,0 +1,123 @@
+"""
+Tests of the compiled key path cache and of the flat key index, through JSONFile.
+"""
+
+import os
+
+import pytest
+
+from yaml_manager import key_path
+from yaml_manager.json_file import JSONFile
+
+
+def _failing_replace(*_):
+    raise OSError("disk full")
+
+
+@pytest.fixture(name="file", params=[False, True], ids=["walk", "index"])
+def fixture_file(tmp_path, request):
+    file = JSONFile(str(tmp_path / "config.json"))
+    file.key_index = request.param
+    file.data = {"db": {"host": "localhost", "port": 5432, "pool": {"size": 4}}}
+    return file
+
+
+def test_compiled_key_paths_are_cached():
+    key_path.clear_key_cache()
+
+    first = key_path.compile_key("db.pool.size")
+    second = key_path.compile_key("db.pool.size")
+
+    assert first == ("db", "pool", "size")
+    assert second is first
+    assert key_path.key_cache_info().hits == 1
+    assert key_path.key_cache_info().misses == 1
+
+    key_path.clear_key_cache()
+    assert key_path.key_cache_info().currsize == 0
+
+
+def test_cache_size_is_validated_and_replaces_the_cache():
+    for maxsize in (0, -1, 1.5, True, "8"):
+        with pytest.raises(TypeError):
+            key_path.set_key_cache_size(maxsize)
+
+    try:
+        key_path.set_key_cache_size(2)
+        for key in ("a", "b", "c"):
+            key_path.compile_key(key)
+
+        assert key_path.key_cache_info().maxsize == 2
+        assert key_path.key_cache_info().currsize == 2
+
+    finally:
+        key_path.set_key_cache_size(key_path.KEY_CACHE_SIZE)
+
+
+def test_lookups_follow_set(file):
+    assert file.int("db.pool.size") == 4
+
+    file.set("db.pool.size", 8)
+    file.set("db.pool.timeout", 30)
+
+    assert file.int("db.pool.size") == 8
+    assert file.get_many({"db.pool.size": int, "db.pool.timeout": int, "db.port": int},
+                         as_tuple=True) == (8, 30, 5432)
+
+
+def test_lookups_follow_a_replaced_subtree(file):
+    file.set("db.pool", {"max": 10})
+
+    assert not file.contains("db.pool.size")
+    assert file.int("db.pool.max") == 10
+
+    file.set("db", "sqlite")
+
+    assert not file.contains("db.host")
+    assert file.string("db") == "sqlite"
+
+    file.set("db.host", "remote")
+
+    assert file.string("db.host") == "remote"
+    assert not file.contains("db.port")
+
+
+def test_lookups_follow_delete(file):
+    file.set("db.pool.size", None)
+
+    assert not file.contains("db.pool.size")
+    assert not file.contains("db.pool")
+    assert file.get_many({"db.pool.size": int, "db.host": str}, as_tuple=True) == (
+        None, "localhost")
+
+    file.set("db", None)
+
+    assert not file.contains("db.host")
+    assert file.data == {}
+
+
+def test_lookups_follow_set_many_and_its_rollback(file, monkeypatch):
+    file.set_many({"db.port": 6543, "db.pool": None, "cache.ttl": 60})
+
+    assert file.int("db.port") == 6543
+    assert not file.contains("db.pool.size")
+    assert file.int("cache.ttl") == 60
+
+    monkeypatch.setattr(os, "replace", _failing_replace)
+
+    with pytest.raises(OSError, match="disk full"):
+        with file.transaction() as changes:
+            changes["db.port"] = 1
+            changes["cache"] = None
+
+    assert file.int("db.port") == 6543
+    assert file.int("cache.ttl") == 60
+
+
+def test_lookups_follow_replaced_data(file):
+    assert file.int("db.port") == 5432
+
+    file.data = {"db": {"port": 1}}
+
+    assert file.int("db.port") == 1
+    assert not file.contains("db.host")
@@ -0,0 +1,123 @@
+"""
+Tests of lazily opened files and of prefetch(), through JSONFile.
+"""
+
+import json
+import threading
+
+import pytest
+
+from yaml_manager.file_controller import FileController, prefetch
+from yaml_manager.json_file import JSONFile
+
+
+@pytest.fixture(name="parses")
+def fixture_parses(monkeypatch):
+    parses = []
+    load_data = JSONFile._load_data
+
+    def counting_load(self, file):
+        parses.append(self.file_path)
+        return load_data(self, file)
+
+    monkeypatch.setattr(JSONFile, "_load_data", counting_load)
+    return parses
+
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_lazy_file_is_parsed_on_first_access(tmp_path, parses):
+    file = JSONFile(_write(tmp_path, "config.json", {"a": 1, "b": 2}), lazy=True)
+
+    assert not file.is_loaded
+    assert not file.is_dirty
+    assert not parses
+
+    assert file.int("a") == 1
+    assert file.is_loaded
+    assert file.data == {"a": 1, "b": 2}
+    assert len(parses) == 1
+
+
+def test_set_on_a_lazy_file_keeps_the_other_keys(tmp_path, parses):
+    path = _write(tmp_path, "config.json", {"a": 1, "b": 2})
+    file = JSONFile(path, lazy=True)
+    file.set("a", 5)
+    file.save()
+
+    assert len(parses) == 1
+    assert JSONFile(path).data == {"a": 5, "b": 2}
+
+
+def test_assigned_data_replaces_the_unparsed_file(tmp_path, parses):
+    file = JSONFile(_write(tmp_path, "config.json", {"a": 1}), lazy=True)
+    file.data = {"c": 3}
+
+    assert file.is_loaded
+    assert file.data == {"c": 3}
+    assert not parses
+
+
+def test_default_lazy_applies_to_new_files(tmp_path, monkeypatch, parses):
+    monkeypatch.setattr(FileController, "default_lazy", True)
+    file = JSONFile(_write(tmp_path, "config.json", {"a": 1}))
+
+    assert not file.is_loaded
+    assert not parses
+
+    with pytest.raises(TypeError):
+        JSONFile(str(tmp_path / "config.json"), lazy="yes")
+
+
+def test_concurrent_first_accesses_parse_once(tmp_path, parses):
+    file = JSONFile(_write(tmp_path, "config.json", {"a": 1}), lazy=True)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def access():
+        barrier.wait()
+        results.append(file.int("a"))
+
+    threads = [threading.Thread(target=access) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert results == [1] * 8
+    assert len(parses) == 1
+
+
+def test_prefetch_loads_every_lazy_file(tmp_path, parses):
+    files = [JSONFile(_write(tmp_path, f"config{i}.json", {"i": i}), lazy=True)
+             for i in range(6)]
+    files[0].load()
+
+    prefetch(files, max_workers=3)
+
+    assert all(file.is_loaded for file in files)
+    assert [file.int("i") for file in files] == list(range(6))
+    assert sorted(parses) == sorted(file.file_path for file in files)
+
+
+def test_prefetch_raises_after_loading_the_other_files(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    files = [JSONFile(_write(tmp_path, "first.json", {"a": 1}), lazy=True),
+             JSONFile(str(broken), lazy=True),
+             JSONFile(_write(tmp_path, "last.json", {"b": 2}), lazy=True)]
+
+    with pytest.raises(ValueError):
+        prefetch(files)
+
+    assert files[0].is_loaded and files[2].is_loaded
+    assert not files[1].is_loaded
+
+    with pytest.raises(TypeError):
+        prefetch([files[0], "config.json"])
@@ -0,0 +1,123 @@
+"""
+Tests of the persistent parse cache, through JSONFile and YAMLFile.
+"""
+
+import datetime
+import os
+
+import pytest
+
+from yaml_manager import parse_cache
+from yaml_manager.file_controller import FileController
+from yaml_manager.json_file import JSONFile
+from yaml_manager.key_path import MISSING
+from yaml_manager.yaml_file import YAMLFile
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path, monkeypatch):
+    directory = str(tmp_path / "cache")
+    monkeypatch.setattr(FileController, "parse_cache", directory)
+    return directory
+
+
+@pytest.fixture(name="parses")
+def fixture_parses(monkeypatch):
+    parses = []
+
+    for file_class in (JSONFile, YAMLFile):
+        def counting_load(self, file, load_data=file_class._load_data):
+            parses.append(self.file_path)
+            return load_data(self, file)
+
+        monkeypatch.setattr(file_class, "_load_data", counting_load)
+
+    return parses
+
+
+def _write(path, content):
+    path.write_text(content, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return str(path)
+
+
+def test_unchanged_file_is_read_from_the_cache(tmp_path, cache, parses):
+    path = _write(tmp_path / "config.json", '{"a": {"b": [1, 2]}}')
+
+    assert JSONFile(path).data == {"a": {"b": [1, 2]}}
+    assert len(parses) == 1
+    assert os.listdir(cache)
+
+    assert JSONFile(path).data == {"a": {"b": [1, 2]}}
+    assert len(parses) == 1
+
+
+def test_changed_file_misses_the_cache(tmp_path, cache, parses):
+    path = _write(tmp_path / "config.json", '{"a": 1}')
+    JSONFile(path)
+
+    # Same size, so only the modification time tells the change
+    _write(tmp_path / "config.json", '{"a": 2}')
+
+    assert JSONFile(path).data == {"a": 2}
+    assert len(parses) == 2
+
+    assert JSONFile(path).data == {"a": 2}
+    assert len(parses) == 2
+
+
+def test_other_loader_settings_miss_the_cache(tmp_path, cache, parses):
+    path = _write(tmp_path / "config.yaml", "a: 1\nb: [x, y]\n")
+
+    # A file has a single entry, replaced by the parse with other settings
+    assert YAMLFile(path, safe=True).data == {"a": 1, "b": ["x", "y"]}
+    assert YAMLFile(path, safe=False).data == {"a": 1, "b": ["x", "y"]}
+    assert YAMLFile(path, safe=False).data == {"a": 1, "b": ["x", "y"]}
+    assert len(parses) == 2
+
+    assert YAMLFile(path, safe=False, subtrees=["b"]).data == {"b": ["x", "y"]}
+    assert YAMLFile(path, safe=False, subtrees=["b"]).data == {"b": ["x", "y"]}
+    assert len(parses) == 3
+
+
+def test_data_marshal_cannot_hold_is_pickled(tmp_path, cache, parses):
+    path = _write(tmp_path / "config.yaml", "when: 2024-05-01\n")
+    expected = {"when": datetime.date(2024, 5, 1)}
+
+    assert YAMLFile(path).data == expected
+    assert YAMLFile(path).data == expected
+    assert len(parses) == 1
+
+
+def test_corrupt_entry_is_ignored(tmp_path, cache, parses):
+    path = _write(tmp_path / "config.json", '{"a": 1}')
+    JSONFile(path)
+
+    for name in os.listdir(cache):
+        with open(os.path.join(cache, name), "wb") as entry:
+            entry.write(b"M\x00garbage")
+
+    assert JSONFile(path).data == {"a": 1}
+    assert len(parses) == 2
+
+
+def test_entries_are_keyed_by_path_and_key(tmp_path):
+    directory = str(tmp_path / "cache")
+    source = str(tmp_path / "config.json")
+    parse_cache.store_entry(directory, source, (1, 2, ()), {"a": 1})
+
+    assert parse_cache.load_entry(directory, source, (1, 2, ())) == {"a": 1}
+    assert parse_cache.load_entry(directory, source, (1, 3, ())) is MISSING
+    assert parse_cache.load_entry(directory, str(tmp_path / "other.json"),
+                                  (1, 2, ())) is MISSING
+
+
+def test_unpicklable_data_is_not_cached(tmp_path):
+    directory = str(tmp_path / "cache")
+    source = str(tmp_path / "config.json")
+
+    with pytest.warns(RuntimeWarning, match="Cannot cache"):
+        parse_cache.store_entry(directory, source, (1, 2, ()), {"a": lambda: None})
+
+    assert parse_cache.load_entry(directory, source, (1, 2, ())) is MISSING
@@ -0,0 +1,106 @@
+"""
+Tests of reload() skipping the files that did not change, through JSONFile.
+"""
+
+import os
+
+import pytest
+
+from yaml_manager.json_file import JSONFile
+
+
+@pytest.fixture(name="parses")
+def fixture_parses(monkeypatch):
+    parses = []
+    load_data = JSONFile._load_data
+
+    def counting_load(self, file):
+        parses.append(self.file_path)
+        return load_data(self, file)
+
+    monkeypatch.setattr(JSONFile, "_load_data", counting_load)
+    return parses
+
+
+def _touch(path, content=None):
+    if content is not None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_file_is_not_parsed_again(tmp_path, parses):
+    path = str(tmp_path / "config.json")
+    _touch(path, '{"a": 1}')
+    file = JSONFile(path)
+
+    assert not file.reload()
+    assert not file.reload()
+    assert len(parses) == 1
+
+
+def test_changed_file_is_parsed_again(tmp_path, parses):
+    path = str(tmp_path / "config.json")
+    _touch(path, '{"a": 1}')
+    file = JSONFile(path)
+
+    # Same size, so only the modification time tells the change
+    _touch(path, '{"a": 2}')
+
+    assert file.reload()
+    assert file.data == {"a": 2}
+    assert len(parses) == 2
+
+
+def test_changed_data_is_discarded_unless_kept(tmp_path, parses):
+    path = str(tmp_path / "config.json")
+    _touch(path, '{"a": 1}')
+    file = JSONFile(path)
+    file.set("a", 5)
+
+    assert not file.reload(keep_changes=True)
+    assert file.data == {"a": 5}
+
+    assert file.reload()
+    assert file.data == {"a": 1}
+    assert len(parses) == 2
+
+
+def test_own_save_is_not_parsed_again(tmp_path, parses):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.set("a", 1)
+    file.save()
+
+    assert not file.reload()
+    assert not parses
+
+
+def test_force_parses_an_unchanged_file(tmp_path, parses):
+    path = str(tmp_path / "config.json")
+    _touch(path, '{"a": 1}')
+    file = JSONFile(path)
+
+    assert file.reload(force=True)
+    assert len(parses) == 2
+
+
+def test_content_hash_skips_a_touched_file(tmp_path, parses):
+    path = str(tmp_path / "config.json")
+    _touch(path, '{"a": 1}')
+    file = JSONFile(path)
+    file.content_hash = True
+    file.reload(force=True)
+
+    _touch(path)
+
+    assert not file.reload()
+    assert len(parses) == 2
+
+    _touch(path, '{"a": 3}')
+
+    assert file.reload()
+    assert file.data == {"a": 3}
+    assert len(parses) == 3
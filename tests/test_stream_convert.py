@@ -0,0 +1,150 @@
+"""
+Tests of the streaming conversions between JSON and YAML files, against the conversions
+through a dictionary.
+"""
+
+import random
+
+import pytest
+
+from yaml_manager.converters import (
+    json_file_to_yaml_file, stream_json_file_to_yaml_file, stream_yaml_file_to_json_file,
+    yaml_file_to_json_file
+)
+from yaml_manager.json_file import JSONFile
+from yaml_manager.yaml_file import LIBYAML_AVAILABLE, YAMLFile
+
+BACKENDS = ["python", pytest.param("libyaml", marks=pytest.mark.skipif(
+    not LIBYAML_AVAILABLE, reason="PyYAML was not built with LibYAML"))]
+
+DATA = {
+    "name": "service",
+    "port": 8080,
+    "ratio": -0.25,
+    "big": 10 ** 20,
+    "exponent": 1e-07,
+    "enabled": True,
+    "nothing": None,
+    "keywords": ["yes", "no", "null", "~", "1e3", "0x10", "", "2024-05-01"],
+    "text": "café 🎉\nsecond line\t\"quoted\" 'single'",
+    "nel": "a\x85b",
+    "nested": {"deep": [1, [2, {"x": []}], {}], "empty": {}},
+    "123": "numeric key",
+    "x" * 200: "long key",
+}
+
+
+def _random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 3 else 4)
+
+    if kind == 0:
+        return rng.choice([True, False, None, 0, -7, 2.5, 1e300])
+    if kind == 1:
+        return rng.randint(-10 ** 12, 10 ** 12)
+    if kind in (2, 3):
+        return "".join(rng.choice("ab :#-'\"\\\n\t{}[],&*!|>%@`é🎉0.5") for _ in range(
+            rng.randint(0, 20)))
+    if kind == 4:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+    return {str(_random_value(rng, 3)): _random_value(rng, depth + 1)
+            for _ in range(rng.randint(0, 4))}
+
+
+def _samples():
+    rng = random.Random(0)
+    return [DATA] + [{f"k{i}": _random_value(rng) for i in range(5)} for _ in range(100)]
+
+
+def _write_json(path, data):
+    file = JSONFile(str(path))
+    file.data = data
+    file.save(force=True)
+    return str(path)
+
+
+def _write_yaml(path, data, backend):
+    file = YAMLFile(str(path), backend)
+    file.data = data
+    file.save(force=True)
+    return str(path)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_json_to_yaml_stream_matches_the_dict_path(tmp_path, backend):
+    for data in _samples():
+        source = _write_json(tmp_path / "source.json", data)
+        streamed = tmp_path / "streamed.yaml"
+        converted = tmp_path / "converted.yaml"
+
+        assert stream_json_file_to_yaml_file(source, YAMLFile(str(streamed), backend, lazy=True))
+        json_file_to_yaml_file(source, YAMLFile(str(converted), backend, lazy=True), save=True)
+
+        assert streamed.read_bytes() == converted.read_bytes()
+        assert YAMLFile(str(streamed), backend).data == data
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_yaml_to_json_stream_matches_the_dict_path(tmp_path, backend):
+    for data in _samples():
+        source = _write_yaml(tmp_path / "source.yaml", data, backend)
+        streamed = tmp_path / "streamed.json"
+        converted = tmp_path / "converted.json"
+
+        assert stream_yaml_file_to_json_file(YAMLFile(source, backend, lazy=True), str(streamed))
+        yaml_file_to_json_file(YAMLFile(source, backend, lazy=True), str(converted), save=True)
+
+        assert streamed.read_bytes() == converted.read_bytes()
+        assert JSONFile(str(streamed)).data == data
+
+
+@pytest.mark.parametrize("content", [
+    "base: &base {a: 1}\ncopy: *base\n",
+    "base: {a: 1}\nmerged:\n  <<: {b: 2}\n",
+    "a: 1\na: 2\n",
+    "- 1\n- 2\n",
+])
+def test_unsupported_yaml_is_converted_through_a_dict(tmp_path, content):
+    source = tmp_path / "source.yaml"
+    source.write_text(content, encoding="utf-8")
+    streamed = tmp_path / "streamed.json"
+    converted = tmp_path / "converted.json"
+
+    assert not stream_yaml_file_to_json_file(str(source), str(streamed))
+    yaml_file_to_json_file(str(source), str(converted), save=True)
+
+    assert streamed.read_bytes() == converted.read_bytes()
+
+
+@pytest.mark.parametrize("content", ['[1, 2]', '"text"', '{"a": 1, "a": 2}', '{"a": [1, 2'])
+def test_unsupported_json_is_converted_through_a_dict(tmp_path, content):
+    source = tmp_path / "source.json"
+    source.write_text(content, encoding="utf-8")
+    streamed = tmp_path / "streamed.yaml"
+    converted = tmp_path / "converted.yaml"
+
+    try:
+        expected = json_file_to_yaml_file(str(source), str(converted), save=True)
+
+    except ValueError:
+        with pytest.raises(ValueError):
+            stream_json_file_to_yaml_file(str(source), str(streamed))
+
+        return
+
+    assert not stream_json_file_to_yaml_file(str(source), str(streamed))
+    assert streamed.read_bytes() == converted.read_bytes()
+    assert YAMLFile(str(streamed)).data == expected.data
+
+
+def test_failed_conversion_keeps_the_target(tmp_path):
+    source = tmp_path / "source.json"
+    source.write_text('{"a": [1, 2', encoding="utf-8")
+    target = tmp_path / "target.yaml"
+    target.write_text("kept: true\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        stream_json_file_to_yaml_file(str(source), str(target))
+
+    assert target.read_text(encoding="utf-8") == "kept: true\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["source.json", "target.yaml"]
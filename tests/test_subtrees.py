@@ -0,0 +1,124 @@
+"""
+Tests of loading only some subtrees of a YAML file, from its event stream.
+"""
+
+import io
+
+import pytest
+import yaml
+
+from yaml_manager.yaml_file import LIBYAML_AVAILABLE, YAMLFile
+
+BACKENDS = ["python", pytest.param("libyaml", marks=pytest.mark.skipif(
+    not LIBYAML_AVAILABLE, reason="PyYAML was not built with LibYAML"))]
+
+DOCUMENT = """\
+defaults: &defaults
+  timeout: 30
+  retries: 3
+hosts:
+  - &primary {name: db1, port: 5432}
+  - {name: db2, port: 5433}
+<<: *defaults
+services:
+  billing:
+    <<: *defaults
+    timeout: 60
+    database: *primary
+    plans: [basic, pro]
+  search:
+    shared: &shared {engine: lucene, shards: 4}
+    replicas: 2
+  reports: *shared
+  mail:
+    <<: [*defaults, {sender: noreply}]
+limits: &limits
+  cpu: 2
+  memory: {soft: 512, hard: 1024}
+quota: 10
+"""
+
+
+@pytest.fixture(name="path")
+def fixture_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(DOCUMENT, encoding="utf-8")
+    return str(path)
+
+
+def _subtrees(path, backend, safe, prefixes):
+    return YAMLFile(path, backend, safe, subtrees=prefixes).data
+
+
+@pytest.mark.parametrize("safe", [False, True])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_subtrees_match_the_whole_document(path, backend, safe):
+    full = YAMLFile(path, backend, safe).data
+
+    assert _subtrees(path, backend, safe, ["services.billing"]) == {
+        "services": {"billing": full["services"]["billing"]}}
+    assert _subtrees(path, backend, safe, ["quota", "limits.memory.hard"]) == {
+        "quota": 10, "limits": {"memory": {"hard": 1024}}}
+    assert _subtrees(path, backend, safe, ["services"]) == {"services": full["services"]}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_aliases_of_skipped_anchors_are_resolved(path, backend):
+    data = _subtrees(path, backend, True, ["services.billing.database", "services.reports"])
+
+    assert data == {"services": {"billing": {"database": {"name": "db1", "port": 5432}},
+                                 "reports": {"engine": "lucene", "shards": 4}}}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_merge_keys_are_applied_inside_and_pruned_outside(path, backend):
+    billing = _subtrees(path, backend, True, ["services.billing"])["services"]["billing"]
+    mail = _subtrees(path, backend, True, ["services.mail"])["services"]["mail"]
+
+    assert billing["timeout"] == 60 and billing["retries"] == 3
+    assert mail == {"timeout": 30, "retries": 3, "sender": "noreply"}
+
+    # The merge key of the root adds timeout and retries, which were not requested
+    assert _subtrees(path, backend, True, ["quota"]) == {"quota": 10}
+    assert _subtrees(path, backend, True, ["retries"]) == {"retries": 3}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_prefixes_inside_an_anchored_mapping(path, backend):
+    data = _subtrees(path, backend, True, ["limits.memory.soft", "services.search.shared.shards"])
+
+    assert data == {"limits": {"memory": {"soft": 512}},
+                    "services": {"search": {"shared": {"shards": 4}}}}
+
+
+def test_missing_prefixes_and_scalar_parents_are_left_out(path):
+    assert _subtrees(path, "python", True, ["nothing", "quota.deeper"]) == {}
+    assert _subtrees(path, "python", True, []) == {}
+
+
+def test_subtrees_of_empty_or_non_mapping_documents(tmp_path):
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("", encoding="utf-8")
+    listing = tmp_path / "list.yaml"
+    listing.write_text("[1, 2]\n", encoding="utf-8")
+
+    assert YAMLFile(str(empty), subtrees=["a"]).data == {}
+    assert YAMLFile(str(listing), subtrees=["a"]).data == {}
+
+
+def test_several_documents_are_rejected(tmp_path):
+    path = tmp_path / "multi.yaml"
+    path.write_text("a: 1\n---\na: 2\n", encoding="utf-8")
+
+    with pytest.raises(yaml.YAMLError):
+        YAMLFile(str(path), subtrees=["a"])
+
+
+def test_partial_file_cannot_be_saved(path):
+    file = YAMLFile(path, subtrees=["quota"])
+
+    with pytest.raises(io.UnsupportedOperation):
+        file.save(force=True)
+
+    with pytest.raises(TypeError):
+        YAMLFile(path, subtrees="quota")
@@ -0,0 +1,26 @@
+"""
+Tests of the configuration tree helpers.
+"""
+
+from yaml_manager.json_file import JSONFile
+from yaml_manager.tree import fingerprint
+
+
+def test_fingerprint_tells_apart_values_sharing_a_hash():
+    assert hash(-1) == hash(-2)
+    assert fingerprint({"x": -1}) != fingerprint({"x": -2})
+    assert fingerprint({"x": [1]}) != fingerprint({"x": [True]})
+    assert fingerprint({"x": {"a": 1.5}}) == fingerprint({"x": {"a": 1.5}})
+
+
+def test_direct_change_to_a_value_sharing_a_hash_is_saved(tmp_path):
+    path = str(tmp_path / "config.json")
+    file = JSONFile(path)
+    file.set("x", -1)
+    file.save()
+
+    file.data["x"] = -2
+
+    assert file.is_dirty
+    assert file.save()
+    assert JSONFile(path).data == {"x": -2}
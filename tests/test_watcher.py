@@ -0,0 +1,64 @@
+"""
+Tests of the Watcher reloading files changed on disk.
+"""
+
+import json
+import time
+
+import pytest
+
+from yaml_manager.json_file import JSONFile
+from yaml_manager.watcher import Watcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_own_save_keeps_later_changes(tmp_path, use_inotify):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+    file = JSONFile(str(path))
+    calls = []
+
+    with Watcher(debounce=0.05, poll_interval=0.05, use_inotify=use_inotify) as watcher:
+        watcher.watch(file, lambda *args: calls.append(args))
+        file.set("a", 2)
+        file.save()
+        file.set("b", 3)
+        time.sleep(0.5)
+
+    assert file.data == {"a": 2, "b": 3}
+    assert not calls
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_external_change_is_reloaded_unless_unsaved(tmp_path, use_inotify):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+    file = JSONFile(str(path))
+    calls = []
+
+    with Watcher(debounce=0.05, poll_interval=0.05, use_inotify=use_inotify) as watcher:
+        watcher.watch(file, lambda _, old, new: calls.append((old, new)))
+        time.sleep(0.1)
+        path.write_text(json.dumps({"a": 2, "pad": "x"}), encoding="utf-8")
+        time.sleep(0.5)
+
+        assert calls == [({"a": 1}, {"a": 2, "pad": "x"})]
+
+        file.set("b", 3)
+        path.write_text(json.dumps({"a": 4}), encoding="utf-8")
+        time.sleep(0.5)
+
+    assert file.data == {"a": 2, "pad": "x", "b": 3}
+    assert len(calls) == 1
+
+
+def test_backend_is_opened_by_the_first_watch(tmp_path):
+    file = JSONFile(str(tmp_path / "config.json"))
+    watcher = Watcher(use_inotify=False)
+    assert watcher.backend is None
+
+    with watcher:
+        watcher.watch(file)
+        assert watcher.backend == "polling"
+
+    Watcher().stop()
@@ -0,0 +1,105 @@
+"""
+Parity and round-trip tests of the YAMLFile backends.
+"""
+
+import random
+
+import pytest
+import yaml
+
+from yaml_manager.yaml_file import LIBYAML_AVAILABLE, YAMLFile, _Dumper
+
+BACKENDS = ["python", pytest.param("libyaml", marks=pytest.mark.skipif(
+    not LIBYAML_AVAILABLE, reason="PyYAML was not built with LibYAML"))]
+
+DOCUMENT = """\
+name: service
+port: 8080
+ratio: 0.25
+enabled: yes
+nothing: ~
+when: 2024-05-01
+big: 100000000000000000000
+special: [.inf, -.inf, 0x1F, 0o17]
+quoted: "a\\tb\\u0085c\\U0001F389"
+multiline: |
+  first line
+  second line
+folded: >
+  folded
+  text
+anchors:
+  base: &base {host: localhost, tags: [a, b]}
+  copy: *base
+"""
+
+DATA = {
+    "plain": "text",
+    "unicode": "café 🎉 日本",
+    "nel": "a\x85b",
+    "controls": "tab\tnull\0bell\x07",
+    "quotes": "say \"hi\" and 'bye'",
+    "lines": "one\ntwo\n\nthree\n",
+    "spaces": "  leading and trailing  ",
+    "keywords": ["yes", "no", "null", "~", "1e3", "0x10", ""],
+    "long": "word " * 60,
+    "x" * 200: {"nested": [1, 2.5, True, None, {"deep": []}]},
+    "numbers": [0, -1, 1.5, 10 ** 20, float("inf")],
+    "empty": {},
+}
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def _random_string(rng):
+    alphabet = "ab :#-'\"\\\n\t\x85 ﻿\U0001F389é{[,&*!|>%@`"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 150)))
+
+
+@pytest.mark.parametrize("safe", [False, True])
+def test_backends_load_identical_data(tmp_path, safe):
+    path = _write(tmp_path, "config.yaml", DOCUMENT)
+    loaded = [YAMLFile(path, backend, safe).data for backend in ("python", "libyaml")
+              if backend == "python" or LIBYAML_AVAILABLE]
+
+    assert all(data == loaded[0] for data in loaded)
+    assert loaded[0]["quoted"] == "a\tb\x85c\U0001F389"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip(tmp_path, backend):
+    path = str(tmp_path / "config.yaml")
+    file = YAMLFile(path, backend)
+    file.data = DATA
+    file.save()
+
+    assert YAMLFile(path, backend).data == DATA
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dumper_matches_the_backend(tmp_path, backend):
+    file = YAMLFile(str(tmp_path / "config.yaml"), backend, lazy=True)
+
+    assert file.dumper is (yaml.CDumper if backend == "libyaml" else _Dumper)
+    assert file.dumper.yaml_representers == yaml.Dumper.yaml_representers
+
+
+@pytest.mark.skipif(not LIBYAML_AVAILABLE, reason="PyYAML was not built with LibYAML")
+def test_backends_read_back_each_other_files(tmp_path):
+    rng = random.Random(0)
+    samples = [DATA] + [{_random_string(rng): [_random_string(rng), {"n": _random_string(rng)}]}
+                        for _ in range(200)]
+
+    for data in samples:
+        for writer in ("python", "libyaml"):
+            path = str(tmp_path / f"{writer}.yaml")
+            file = YAMLFile(path, writer)
+            file.data = data
+            file.save(force=True)
+
+            for reader in ("python", "libyaml"):
+                assert YAMLFile(path, reader).data == data
@@ -0,0 +1,83 @@
+"""
+__main__.py
+
+This module provides the command line interface of the package.
+
+Commands:
+    convert: Converts the YAML files of a directory tree into JSON, or the JSON files
+        into YAML, with `python -m yaml_manager convert SOURCE [TARGET] --to json|yaml`.
+"""
+
+from typing import Union
+import argparse
+import sys
+
+from yaml_manager.bulk_convert import convert_directory
+
+
+def _parser() -> argparse.ArgumentParser:
+    """
+    Creates the parser of the command line arguments.
+    """
+    parser = argparse.ArgumentParser(prog="python -m yaml_manager",
+                                     description="Manages JSON and YAML files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser(
+        "convert", help="convert the files of a directory tree",
+        description="Converts the YAML files of a directory tree into JSON, or the JSON "
+                    "files into YAML, skipping the files whose output is up to date.")
+    convert.add_argument("source", help="the directory holding the files to convert")
+    convert.add_argument("target", nargs="?", default=None,
+                         help="the directory receiving the output (default: SOURCE)")
+    convert.add_argument("--to", choices=("json", "yaml"), default="json",
+                         help="the output format (default: json)")
+    convert.add_argument("-j", "--processes", type=int, default=None,
+                         help="the number of worker processes (default: number of CPUs)")
+    convert.add_argument("--chunk-size", type=int, default=64,
+                         help="the maximum number of files sent to a process at a time "
+                              "(default: 64)")
+    convert.add_argument("-f", "--force", action="store_true",
+                         help="convert the files whose output is up to date too")
+
+    return parser
+
+
+def main(argv: Union[list[str], None] = None) -> int:
+    """
+    Runs the command line interface.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        The command line arguments (default is `sys.argv[1:]`).
+
+    Returns
+    -------
+    int
+        The exit status, 1 if a file could not be converted.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    try:
+        report = convert_directory(args.source, args.target, args.to,
+                                   processes=args.processes, chunk_size=args.chunk_size,
+                                   force=args.force)
+
+    except (TypeError, OSError) as error:
+        parser.error(str(error))
+
+    for path, message in report.failures.items():
+        print(f"ERROR: Cannot convert {path}: {message}", file=sys.stderr)
+
+    print(f"Converted {report.converted} files ({report.source_bytes / 1e6:.1f} MB) in "
+          f"{report.seconds:.2f}s: {report.files_per_second:.0f} files/s, "
+          f"{report.megabytes_per_second:.1f} MB/s; {report.skipped} up to date, "
+          f"{len(report.failures)} failed.")
+
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
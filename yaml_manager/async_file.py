@@ -0,0 +1,363 @@
+"""
+async_file.py
+
+This module provides the asyncio counterparts of the file classes, whose loads and saves
+do not block the event loop.
+
+Classes:
+    AsyncFileController: Adds non-blocking loads and saves to a FileController subclass.
+    AsyncYAMLFile: A YAMLFile with non-blocking loads and saves.
+    AsyncJSONFile: A JSONFile with non-blocking loads and saves.
+"""
+
+from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, TextIO, Union
+import asyncio
+import functools
+import io
+
+from yaml_manager.file_controller import FileController
+from yaml_manager.json_file import JSONFile
+from yaml_manager.yaml_file import YAMLFile
+
+
+def _load_text(factory: Callable[[], FileController], text: str) -> dict:
+    """
+    Parses the content of a file, in a worker process.
+    """
+    # pylint: disable-next=protected-access
+    return factory()._load_data(io.StringIO(text))
+
+
+def _dump_text(factory: Callable[[], FileController], data: dict) -> str:
+    """
+    Serializes the data of a file, in a worker process.
+    """
+    buffer = io.StringIO()
+    factory()._dump_data(data, buffer)  # pylint: disable=protected-access
+    return buffer.getvalue()
+
+
+def _retrieve(task: asyncio.Future) -> None:
+    """
+    Retrieves the error of a shared save, so that it is not reported as never retrieved
+    when every caller waiting for it was cancelled.
+    """
+    if not task.cancelled():
+        task.exception()
+
+
+class AsyncFileController(FileController):
+    """
+    Adds non-blocking loads and saves to a FileController subclass.
+
+    `aload()`, `areload()` and `asave()` run `load()`, `reload()` and `save()` on the
+    `executor`, so parsing and serializing the file do not block the event loop. With a
+    `ProcessPoolExecutor`, the reading and writing run on the default executor of the event
+    loop, and only the parsing and serializing run in the worker processes, which is faster
+    for large YAML files but not for JSON, as the parsed data is sent back by pickling it.
+
+    The instances are thread-safe (see `FileController.thread_safe`), as the executor
+    threads share them with the event loop. The executor threads read, parse, serialize
+    and write the file without holding the lock of the instance, so the getters called on
+    the event loop meanwhile only wait while a snapshot of the data is taken or the parsed
+    data is installed. Cancelling a call does not cancel the work once it started: it
+    completes in the background, so the data and the file are never left half updated.
+
+    Attributes
+    ----------
+    executor : concurrent.futures.Executor or None
+        The executor running the loads and saves, or None for the default executor of
+        the event loop.
+    """
+
+    # The executor running the loads and saves, None for the default executor of the event
+    # loop, overridable per instance
+    executor = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Initializes the AsyncFileController instance, see the synchronous class.
+        """
+        self.__saving = None
+        self.__queued = None
+        self.__queued_force = False
+
+        super().__init__(*args, **kwargs)
+        self.thread_safe = True
+
+    @abstractmethod
+    def _process_factory(self) -> Callable[[], FileController]:
+        """
+        Abstract method for getting a picklable callable creating a lazily opened instance
+        of the synchronous class with the same settings, which parses and serializes the
+        file in worker processes.
+        Must be implemented by subclasses.
+
+        Returns
+        -------
+        Callable[[], FileController]
+            The callable.
+        """
+
+    def _load_data(self, file: TextIO) -> dict:
+        """
+        Parses the content of the file, in a worker process of `executor` if it is a
+        `ProcessPoolExecutor`.
+
+        Parameters
+        ----------
+        file : TextIO
+            The file opened for reading.
+
+        Returns
+        -------
+        dict
+            The parsed data.
+        """
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return self.executor.submit(_load_text, self._process_factory(),
+                                        file.read()).result()
+
+        return super()._load_data(file)
+
+    def _dump_data(self, data: dict, file: TextIO) -> None:
+        """
+        Serializes data into the file, in a worker process of `executor` if it is a
+        `ProcessPoolExecutor`.
+
+        Parameters
+        ----------
+        data : dict
+            The data to serialize.
+        file : TextIO
+            The file opened for writing.
+        """
+        if isinstance(self.executor, ProcessPoolExecutor):
+            file.write(self.executor.submit(_dump_text, self._process_factory(),
+                                            data).result())
+        else:
+            super()._dump_data(data, file)
+
+    async def aload(self) -> None:
+        """
+        Parses the file if it was opened lazily and was not parsed yet, see `load()`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file no longer exists.
+        ValueError
+            If the file content is not valid for the format of the file.
+        """
+        if not self.is_loaded:
+            await self.__run(self.load)
+
+    async def areload(self, force: bool = False, keep_changes: bool = False) -> bool:
+        """
+        Loads the data from the file, see `reload()`.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the file is parsed even if it did not change (default is False).
+        keep_changes : bool, optional
+            If True, the file is not parsed while the data has unsaved changes (default
+            is False).
+
+        Returns
+        -------
+        bool
+            True if the file was parsed, False if it did not change or its unsaved changes
+            were kept.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+        ValueError
+            If the file content is not valid for the format of the file.
+        """
+        return await self.__run(self.reload, force, keep_changes)
+
+    async def asave(self, force: bool = False) -> bool:
+        """
+        Saves the data back to the file, see `save()`.
+
+        Concurrent calls are coalesced: while a save runs, the calls made meanwhile share
+        a single save, started once the running one completes, which writes the data as
+        it is then. Cancelling a call does not cancel the save shared with other calls.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the file is written even if the data is not dirty (default is False).
+
+        Returns
+        -------
+        bool
+            True if the file was written or scheduled to be, False if it was already up to date.
+
+        Raises
+        ------
+        TypeError
+            If force is not a boolean.
+        OSError
+            If there is an error in creating directories or writing to the file.
+        """
+        if not isinstance(force, bool):
+            raise TypeError("force must be a boolean.")
+
+        self.__queued_force = self.__queued_force or force
+
+        if self.__queued is None:
+            self.__queued = asyncio.ensure_future(self.__save_after(self.__saving))
+            self.__queued.add_done_callback(_retrieve)
+
+        return await asyncio.shield(self.__queued)
+
+    async def __save_after(self, previous: Union[asyncio.Future, None]) -> bool:
+        """
+        Saves the file once the previous save completed, for every call queued until then.
+
+        Parameters
+        ----------
+        previous : asyncio.Future or None
+            The save running when this one was queued, or None.
+
+        Returns
+        -------
+        bool
+            True if the file was written or scheduled to be, False if it was already up to date.
+        """
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        # The calls made from now on queue another save, as the data may change again
+        self.__saving = self.__queued
+        self.__queued = None
+        force = self.__queued_force
+        self.__queued_force = False
+
+        return await self.__run(self.save, force)
+
+    async def __run(self, function: Callable, *args: any) -> any:
+        """
+        Runs a blocking method on the executor.
+
+        Parameters
+        ----------
+        function : Callable
+            The method.
+        *args : Any
+            The arguments of the method.
+
+        Returns
+        -------
+        Any
+            The result of the method.
+        """
+        executor = self.executor
+
+        # The worker processes only parse and serialize, the files are read by threads
+        if isinstance(executor, ProcessPoolExecutor):
+            executor = None
+
+        return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+
+class AsyncYAMLFile(AsyncFileController, YAMLFile):
+    """
+    A YAMLFile with non-blocking loads and saves, see `AsyncFileController`.
+
+    The file is opened lazily by default, so creating an instance does not block the event
+    loop: `await aload()` parses it.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        file_path: str,
+        backend: Union[str, None] = None,
+        safe: bool = False,
+        lazy: bool = True,
+        subtrees: Union[Iterable[str], None] = None
+    ) -> None:
+        """
+        Initializes the AsyncYAMLFile instance.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the YAML file to be managed.
+        backend : str, optional
+            The backend to use, `"auto"`, `"libyaml"` or `"python"`
+            (default is `YAMLFile.default_backend`).
+        safe : bool, optional
+            If True, the file is parsed with the safe loader (default is False).
+        lazy : bool, optional
+            If True (default), the file is only parsed by `aload()` or the first access to
+            its data.
+        subtrees : Iterable[str], optional
+            The keys, separated by dots, of the only subtrees to load (default is None, the
+            whole file).
+
+        Raises
+        ------
+        TypeError
+            If file_path is not a string, safe or lazy is not a boolean, or subtrees is not
+            an iterable of non-empty strings.
+        ValueError
+            If backend is not a known backend, or is `"libyaml"` while LibYAML is unavailable.
+        """
+        super().__init__(file_path, backend, safe, lazy, subtrees)
+
+    def _process_factory(self) -> Callable[[], YAMLFile]:
+        """
+        Gets a picklable callable creating a lazily opened YAMLFile with the same settings.
+        """
+        return functools.partial(YAMLFile, self.file_path, self.backend, self.safe, True,
+                                 self.subtrees)
+
+
+class AsyncJSONFile(AsyncFileController, JSONFile):
+    """
+    A JSONFile with non-blocking loads and saves, see `AsyncFileController`.
+
+    The file is opened lazily by default, so creating an instance does not block the event
+    loop: `await aload()` parses it.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        lazy: bool = True,
+        lazy_sections: int = 0
+    ) -> None:
+        """
+        Initializes the AsyncJSONFile instance.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the JSON file to be managed.
+        lazy : bool, optional
+            If True (default), the file is only parsed by `aload()` or the first access to
+            its data.
+        lazy_sections : int, optional
+            0 (default) to decode the whole file when it is loaded, 1 or 2 to decode the
+            values of the top-level keys, or of their keys, on first access.
+
+        Raises
+        ------
+        TypeError
+            If file_path is not a string, lazy is not a boolean, or lazy_sections is not
+            0, 1 or 2.
+        """
+        super().__init__(file_path, lazy, lazy_sections)
+
+    def _process_factory(self) -> Callable[[], JSONFile]:
+        """
+        Gets a picklable callable creating a lazily opened JSONFile with the same settings.
+        """
+        return functools.partial(JSONFile, self.file_path, True, self.lazy_sections)
@@ -0,0 +1,219 @@
+"""
+background_writer.py
+
+This module provides the BackgroundWriter used by the write-behind mode of FileController.
+
+Classes:
+    BackgroundWriter: Writes snapshots of FileController data on a background thread.
+
+Attributes:
+    WRITER: The BackgroundWriter shared by every FileController.
+"""
+
+from typing import Union
+import atexit
+import threading
+import time
+import traceback
+import warnings
+import weakref
+
+
+class BackgroundWriter:
+    """
+    Writes snapshots of FileController data on a background thread.
+
+    Each controller has at most one pending snapshot. Scheduling a new snapshot before
+    the pending one is written replaces it, so every save made within the delay of the
+    first one results in a single write. Errors raised by a write are kept until they
+    are taken by `pop_error`, and the controller is marked dirty, so that its next save
+    writes the data again. The errors do not keep their controller alive.
+    """
+
+    # The maximum number of seconds the flush at interpreter exit waits for the writes
+    exit_timeout = 10.0
+
+    def __init__(self) -> None:
+        """
+        Initializes the BackgroundWriter and registers a flush at interpreter exit.
+        """
+        self.__condition = threading.Condition()
+        self.__pending = {}
+        self.__writing = set()
+        self.__errors = weakref.WeakKeyDictionary()
+        self.__thread = None
+
+        atexit.register(self.__flush_at_exit)
+
+    def schedule(
+        self,
+        controller: any,
+        data: any,
+        delay: float
+    ) -> None:
+        """
+        Schedules a snapshot of the data of a controller to be written.
+
+        Parameters
+        ----------
+        controller : FileController
+            The controller whose file is written.
+        data : Any
+            The snapshot of the data to write.
+        delay : float
+            The number of seconds to wait for other saves before writing.
+        """
+        with self.__condition:
+            if controller in self.__pending:
+                deadline = self.__pending[controller][1]
+            else:
+                deadline = time.monotonic() + delay
+
+            self.__pending[controller] = (data, deadline)
+
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(
+                    target=self.__run, name="yaml_manager-writer", daemon=True)
+                self.__thread.start()
+
+            self.__condition.notify_all()
+
+    def flush(
+        self,
+        controller: any,
+        timeout: Union[float, None] = None
+    ) -> bool:
+        """
+        Writes the pending snapshot of a controller now and waits for it.
+
+        Parameters
+        ----------
+        controller : FileController
+            The controller whose pending snapshot is written.
+        timeout : float, optional
+            The maximum number of seconds to wait (default is None, no limit).
+
+        Returns
+        -------
+        bool
+            True if nothing is left to write for the controller, False on timeout.
+        """
+        with self.__condition:
+            if controller in self.__pending:
+                self.__pending[controller] = (self.__pending[controller][0], 0.0)
+                self.__condition.notify_all()
+
+            return self.__condition.wait_for(
+                lambda: controller not in self.__pending and controller not in self.__writing,
+                timeout
+            )
+
+    def flush_all(self, timeout: Union[float, None] = None) -> bool:
+        """
+        Writes every pending snapshot now and waits for them.
+
+        Write errors, and the files still being written when the timeout expires, are
+        reported as `RuntimeWarning`, as there is no caller to raise them to at exit.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait (default is None, no limit).
+
+        Returns
+        -------
+        bool
+            True if nothing is left to write, False on timeout.
+        """
+        with self.__condition:
+            for controller, (data, _) in self.__pending.items():
+                self.__pending[controller] = (data, 0.0)
+
+            self.__condition.notify_all()
+            flushed = self.__condition.wait_for(
+                lambda: not self.__pending and not self.__writing, timeout)
+
+            if not flushed:
+                paths = sorted({controller.file_path for controller in
+                                (*self.__pending, *self.__writing)})
+                warnings.warn(f"Gave up waiting for the writes of {', '.join(paths)} after "
+                              f"{timeout} seconds.", RuntimeWarning)
+
+            for controller, error in self.__errors.items():
+                warnings.warn(f"Could not write {controller.file_path}: {error}", RuntimeWarning)
+
+            self.__errors.clear()
+            return flushed
+
+    def pop_error(self, controller: any) -> Union[Exception, None]:
+        """
+        Takes the error raised by the last failed write of a controller.
+
+        Parameters
+        ----------
+        controller : FileController
+            The controller whose error is taken.
+
+        Returns
+        -------
+        Exception or None
+            The error, or None if no write failed since the last call.
+        """
+        with self.__condition:
+            return self.__errors.pop(controller, None)
+
+    def __flush_at_exit(self) -> None:
+        """
+        Flushes every pending snapshot at interpreter exit, for at most `exit_timeout`.
+        """
+        self.flush_all(self.exit_timeout)
+
+    def __run(self) -> None:
+        """
+        Writes the pending snapshots as their deadlines expire.
+        """
+        while True:
+            with self.__condition:
+                while True:
+                    now = time.monotonic()
+                    due = [controller for controller, (_, deadline) in self.__pending.items()
+                           if deadline <= now]
+
+                    if due:
+                        break
+
+                    if self.__pending:
+                        deadline = min(deadline for _, deadline in self.__pending.values())
+                        self.__condition.wait(deadline - now)
+
+                    else:
+                        self.__condition.wait()
+
+                batch = [(controller, self.__pending.pop(controller)[0]) for controller in due]
+                self.__writing.update(due)
+
+            for controller, data in batch:
+                try:
+                    # pylint: disable-next=protected-access
+                    controller._write_file(data)
+
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    # The file does not hold the data, the next save must write it again
+                    controller._mark_dirty()  # pylint: disable=protected-access
+
+                    # The locals of the failed frames would keep the controller alive
+                    traceback.clear_frames(error.__traceback__)
+
+                    with self.__condition:
+                        self.__errors[controller] = error
+
+            with self.__condition:
+                self.__writing.difference_update(due)
+                self.__condition.notify_all()
+
+            # The thread would otherwise keep the last controllers alive while it waits
+            due = batch = controller = data = None
+
+
+# The BackgroundWriter shared by every FileController
+WRITER = BackgroundWriter()
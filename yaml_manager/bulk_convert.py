@@ -0,0 +1,312 @@
+"""
+bulk_convert.py
+
+This module provides the conversion of every JSON or YAML file of a directory tree, by a
+pool of processes.
+
+Classes:
+    ConversionReport: The outcome of the conversion of a directory tree.
+
+Functions:
+    convert_directory: Converts the YAML files of a directory tree into JSON, or the
+        JSON files into YAML.
+"""
+
+from typing import Iterator, NamedTuple, Union
+import os
+import time
+
+from yaml_manager import converters
+from yaml_manager.yaml_file import YAMLFile
+
+# The extensions of the source files, and the extension of their output, by output format
+_FORMATS = {
+    "json": ((".yaml", ".yml"), ".json"),
+    "yaml": ((".json",), ".yaml")
+}
+
+# The number of chunks queued per process, so that the processes finish together
+_CHUNKS_PER_PROCESS = 4
+
+
+class ConversionReport(NamedTuple):
+    """
+    The outcome of the conversion of a directory tree.
+
+    Attributes
+    ----------
+    converted : int
+        The number of files converted.
+    skipped : int
+        The number of files skipped, as their output was up to date.
+    failures : dict[str, str]
+        The error message of each file that could not be converted, by path.
+    source_bytes : int
+        The total size of the files converted.
+    seconds : float
+        The duration of the conversion.
+    """
+    converted: int
+    skipped: int
+    failures: dict[str, str]
+    source_bytes: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        """
+        The number of files converted per second.
+        """
+        return self.converted / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """
+        The size of the files converted per second, in MB.
+        """
+        return self.source_bytes / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def _is_up_to_date(output_path: str, source_mtime_ns: int) -> bool:
+    """
+    Checks whether an output file exists and is at least as recent as its source.
+    """
+    try:
+        return os.stat(output_path).st_mtime_ns >= source_mtime_ns
+
+    except FileNotFoundError:
+        return False
+
+
+def _source_files(source: str, extensions: tuple[str, ...]) -> Iterator[tuple[str, str]]:
+    """
+    Iterates over the files of a directory tree with some extensions, in a stable order,
+    giving their path and their path relative to the tree, without extension.
+    """
+    for directory, subdirectories, names in os.walk(source):
+        subdirectories.sort()
+
+        for name in sorted(names):
+            stem, extension = os.path.splitext(name)
+
+            if extension.lower() in extensions:
+                yield (os.path.join(directory, name),
+                       os.path.normpath(os.path.join(os.path.relpath(directory, source), stem)))
+
+
+def _conflicts(sources: list[tuple[str, str]]) -> dict[str, str]:
+    """
+    Gets the error message of each of the files sharing the same output, by path.
+    """
+    conflicts = {}
+
+    for source_path, output_path in sources:
+        others = ", ".join(other for other, _ in sources if other != source_path)
+        conflicts[source_path] = f"Conflict: {others} has the same output {output_path}"
+
+    return conflicts
+
+
+def _find_jobs(
+    source: str,
+    target: str,
+    output_format: str,
+    force: bool
+) -> tuple[list[tuple[str, str, int]], int, dict[str, str]]:
+    """
+    Lists the files of a directory tree to convert.
+
+    Files with the same output, such as `a.yaml` and `a.yml`, are not converted, as one
+    would overwrite the other.
+
+    Returns
+    -------
+    tuple
+        The source path, output path and size of each file to convert, in a stable
+        order, the number of files whose output is up to date, and the error message
+        of each file sharing its output with another one, by path.
+    """
+    extensions, output_extension = _FORMATS[output_format]
+    outputs = {}
+    jobs = []
+    skipped = 0
+    conflicts = {}
+
+    for source_path, relative_stem in _source_files(source, extensions):
+        output_path = os.path.join(target, relative_stem + output_extension)
+        outputs.setdefault(os.path.normcase(output_path), []).append((source_path, output_path))
+
+    for sources in outputs.values():
+        if len(sources) > 1:
+            conflicts.update(_conflicts(sources))
+            continue
+
+        source_path, output_path = sources[0]
+        stat = os.stat(source_path)
+
+        if not force and _is_up_to_date(output_path, stat.st_mtime_ns):
+            skipped += 1
+        else:
+            jobs.append((source_path, output_path, stat.st_size))
+
+    return jobs, skipped, conflicts
+
+
+def _convert_chunk(
+    jobs: list[tuple[str, str, int]],
+    output_format: str,
+    backend: str
+) -> dict[str, str]:
+    """
+    Converts a chunk of files, in a worker process.
+
+    Returns
+    -------
+    dict[str, str]
+        The error message of each file that could not be converted, by path.
+    """
+    failures = {}
+
+    for source_path, output_path, _ in jobs:
+        try:
+            if output_format == "json":
+                converters.stream_yaml_file_to_json_file(
+                    YAMLFile(source_path, backend, lazy=True), output_path)
+            else:
+                converters.stream_json_file_to_yaml_file(
+                    source_path, YAMLFile(output_path, backend, lazy=True))
+
+        # A file may fail with about any error, which must not stop the other ones
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            failures[source_path] = f"{type(error).__name__}: {error}"
+
+    return failures
+
+
+def _convert_chunks(
+    chunks: list[list[tuple[str, str, int]]],
+    output_format: str,
+    processes: int
+) -> dict[str, str]:
+    """
+    Converts chunks of files, by a pool of processes if there are several chunks.
+
+    Returns
+    -------
+    dict[str, str]
+        The error message of each file that could not be converted, by path.
+    """
+    backend = YAMLFile.default_backend
+    failures = {}
+
+    if processes == 1 or len(chunks) < 2:
+        for chunk in chunks:
+            failures.update(_convert_chunk(chunk, output_format, backend))
+
+        return failures
+
+    # Only imported here, as it is slow to import and rarely needed
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor, as_completed)
+
+    with ProcessPoolExecutor(min(processes, len(chunks))) as executor:
+        futures = {executor.submit(_convert_chunk, chunk, output_format, backend): chunk
+                   for chunk in chunks}
+
+        for future in as_completed(futures):
+            try:
+                failures.update(future.result())
+
+            # A crashed worker fails its whole chunk
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                for source_path, _, _ in futures[future]:
+                    failures[source_path] = f"{type(error).__name__}: {error}"
+
+    return failures
+
+
+def convert_directory(  # pylint: disable=too-many-arguments
+    source: str,
+    target: Union[str, None] = None,
+    output_format: str = "json",
+    *,
+    processes: Union[int, None] = None,
+    chunk_size: int = 64,
+    force: bool = False
+) -> ConversionReport:
+    """
+    Converts the YAML files of a directory tree into JSON, or the JSON files into YAML.
+
+    The output of each file is written at the same relative path of the target directory,
+    with the extension of the output format, by the streaming converters. Files whose
+    output is at least as recent as themselves are skipped, unless `force` is True. Files
+    with the same output, such as `a.yaml` and `a.yml`, are not converted and are reported
+    in the failures.
+
+    The files are converted by a pool of processes, in chunks of up to `chunk_size` files,
+    so that the cost of sending work to a process is shared by many small files. A file that
+    cannot be converted is reported in the failures, and does not stop the other ones.
+
+    Parameters
+    ----------
+    source : str
+        The directory holding the files to convert.
+    target : str, optional
+        The directory receiving the output (default is `source`).
+    output_format : str, optional
+        `"json"` (default) to convert the `.yaml` and `.yml` files into `.json` files,
+        `"yaml"` to convert the `.json` files into `.yaml` files.
+    processes : int, optional
+        The number of worker processes (default is the number of CPUs). With 1, or a
+        single chunk of files, the files are converted in this process.
+    chunk_size : int, optional
+        The maximum number of files converted by a process at a time (default is 64).
+    force : bool, optional
+        If True, the files whose output is up to date are converted too (default is False).
+
+    Returns
+    -------
+    ConversionReport
+        The number of files converted and skipped, the failures and the throughput.
+
+    Raises
+    ------
+    TypeError
+        If an argument does not have the expected type or value.
+    NotADirectoryError
+        If `source` is not a directory.
+    """
+    if not isinstance(source, str) or not (target is None or isinstance(target, str)):
+        raise TypeError("source must be a string, and target a string or None.")
+
+    if output_format not in _FORMATS:
+        raise TypeError("output_format must be 'json' or 'yaml'.")
+
+    for name, value in (("processes", 1 if processes is None else processes),
+                        ("chunk_size", chunk_size)):
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise TypeError(f"{name} must be a positive integer.")
+
+    if not isinstance(force, bool):
+        raise TypeError("force must be a boolean.")
+
+    if not os.path.isdir(source):
+        raise NotADirectoryError(f"{source} is not a directory.")
+
+    start = time.perf_counter()
+    jobs, skipped, conflicts = _find_jobs(source, source if target is None else target,
+                               output_format, force)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    # Smaller chunks for few files, so that every process gets some
+    size = max(1, min(chunk_size, -(-len(jobs) // (processes * _CHUNKS_PER_PROCESS))))
+    failures = _convert_chunks([jobs[i:i + size] for i in range(0, len(jobs), size)],
+                               output_format, processes)
+    source_bytes = sum(job_size for source_path, _, job_size in jobs
+                       if source_path not in failures)
+
+    return ConversionReport(len(jobs) - len(failures), skipped,
+                            dict(sorted({**failures, **conflicts}.items())), source_bytes,
+                            time.perf_counter() - start)
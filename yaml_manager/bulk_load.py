@@ -0,0 +1,247 @@
+"""
+bulk_load.py
+
+This module provides the loading of every JSON and YAML file of a directory, in parallel.
+
+Functions:
+    load_directory: Loads the JSON and YAML files of a directory matching a glob pattern.
+"""
+
+from typing import Union
+import glob
+import os
+
+from yaml_manager.file_controller import FileController
+from yaml_manager.json_file import JSONFile
+from yaml_manager.tree import merge
+from yaml_manager.yaml_file import YAMLFile
+
+# The extensions of the files loaded, by class
+_EXTENSIONS = {
+    ".json": JSONFile,
+    ".yaml": YAMLFile,
+    ".yml": YAMLFile
+}
+
+# The results returned by load_directory
+_RESULTS = ("data", "files", "merged")
+
+# The number of chunks of YAML files queued per process, so that the processes finish
+# together
+_CHUNKS_PER_PROCESS = 4
+
+
+def _find_files(directory: str, pattern: str) -> list[str]:
+    """
+    Lists the JSON and YAML files of a directory matching a glob pattern, sorted by path.
+    """
+    paths = glob.glob(os.path.join(glob.escape(directory), pattern), recursive=True)
+
+    return sorted(path for path in paths if os.path.splitext(path)[1].lower() in _EXTENSIONS
+                  and os.path.isfile(path))
+
+
+def _open_file(path: str, backend: str) -> FileController:
+    """
+    Opens and loads a file, in a thread.
+    """
+    if _EXTENSIONS[os.path.splitext(path)[1].lower()] is JSONFile:
+        return JSONFile(path)
+
+    return YAMLFile(path, backend)
+
+
+def _parse_yaml_chunk(paths: list[str], backend: str) -> list[any]:
+    """
+    Parses a chunk of YAML files, in a worker process.
+
+    Returns
+    -------
+    list
+        The data of each file and its stat metadata, taken before it was read, or the
+        error raised while loading it.
+    """
+    parsed = []
+
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parsed.append((YAMLFile(path, backend).data, stat))
+
+        # The error is raised by load_directory, once every file was loaded
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            parsed.append(error)
+
+    return parsed
+
+
+def _parse_in_processes(paths: list[str], processes: int, backend: str) -> dict[str, any]:
+    """
+    Loads YAML files parsed by a pool of processes, in chunks.
+
+    Returns
+    -------
+    dict
+        The `YAMLFile` of each path, or the error raised while loading it.
+    """
+    # Only imported here, as it is slow to import and rarely needed
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    size = max(1, -(-len(paths) // (processes * _CHUNKS_PER_PROCESS)))
+    chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+    loaded = dict.fromkeys(paths)
+
+    with ProcessPoolExecutor(min(processes, len(chunks))) as executor:
+        futures = [(chunk, executor.submit(_parse_yaml_chunk, chunk, backend))
+                   for chunk in chunks]
+
+        for chunk, future in futures:
+            try:
+                loaded.update(zip(chunk, future.result()))
+
+            # A crashed worker fails its whole chunk
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                loaded.update(dict.fromkeys(chunk, error))
+
+    for path, outcome in loaded.items():
+        if not isinstance(outcome, Exception):
+            loaded[path] = YAMLFile(path, backend, lazy=True)
+            loaded[path].load_parsed(*outcome)
+
+    return loaded
+
+
+def _load_files(
+    paths: list[str],
+    processes: int,
+    max_workers: Union[int, None]
+) -> dict[str, FileController]:
+    """
+    Loads files, the YAML ones by a pool of processes if there are several of them, and
+    the other ones by a pool of threads meanwhile.
+
+    Raises
+    ------
+    Exception
+        The error of the first file, in order, that could not be loaded, after every other
+        file was loaded.
+    """
+    # Only imported here, as it is slow to import and rarely needed
+    from concurrent.futures import ThreadPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    backend = YAMLFile.default_backend
+    yaml_paths = [path for path in paths
+                  if _EXTENSIONS[os.path.splitext(path)[1].lower()] is YAMLFile]
+
+    if processes == 1 or len(yaml_paths) < 2:
+        yaml_paths = []
+
+    parsed = set(yaml_paths)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {path: executor.submit(_open_file, path, backend)
+                   for path in paths if path not in parsed}
+
+        loaded = _parse_in_processes(yaml_paths, processes, backend) if yaml_paths else {}
+
+    for path, future in futures.items():
+        error = future.exception()
+        loaded[path] = future.result() if error is None else error
+
+    files = {path: loaded[path] for path in paths}
+
+    for file in files.values():
+        if isinstance(file, Exception):
+            raise file
+
+    return files
+
+
+def load_directory(
+    directory: str,
+    pattern: str = "**/*",
+    result: str = "data",
+    processes: Union[int, None] = None,
+    max_workers: Union[int, None] = None
+) -> dict:
+    """
+    Loads the JSON and YAML files of a directory matching a glob pattern, in parallel.
+
+    The files whose extension is `.json`, `.yaml` or `.yml` are loaded. As parsing YAML is
+    bound by the CPU, the YAML files are parsed by a pool of processes, in chunks, while
+    the JSON files, bound by I/O, are read by a pool of threads. The files are ordered by
+    path, so a file sorting after another one, like `20-local.yaml` after
+    `10-base.yaml`, takes precedence over it when they are merged.
+
+    Parameters
+    ----------
+    directory : str
+        The directory holding the files.
+    pattern : str, optional
+        The glob pattern of the files, relative to the directory, where `**` matches any
+        number of subdirectories (default is `"**/*"`, every file of the tree).
+    result : str, optional
+        `"data"` (default) to get the data of each file by path, `"files"` to get the loaded
+        `FileController` of each file by path, or `"merged"` to get the data of every file
+        merged into a single tree, in order.
+    processes : int, optional
+        The number of processes parsing the YAML files (default is the number of CPUs).
+        With 1, or a single YAML file, they are parsed by the threads.
+    max_workers : int, optional
+        The maximum number of threads (default is the `ThreadPoolExecutor` default).
+
+    Returns
+    -------
+    dict
+        The data or the `FileController` of each file by path, sorted by path, or the
+        merged tree.
+
+    Raises
+    ------
+    TypeError
+        If an argument does not have the expected type or value.
+    NotADirectoryError
+        If `directory` is not a directory.
+    ValueError
+        If the content of one of the JSON files is not valid, after every other file was
+        loaded, or if `result` is `"merged"` and a file holds something else than a
+        dictionary.
+    yaml.YAMLError
+        If the content of one of the YAML files is not valid, after every other file was
+        loaded.
+    """
+    if not isinstance(directory, str) or not isinstance(pattern, str):
+        raise TypeError("directory and pattern must be strings.")
+
+    if result not in _RESULTS:
+        raise TypeError("result must be 'data', 'files' or 'merged'.")
+
+    if processes is not None and (isinstance(processes, bool) or
+                                  not isinstance(processes, int) or processes < 1):
+        raise TypeError("processes must be a positive integer or None.")
+
+    if not os.path.isdir(directory):
+        raise NotADirectoryError(f"{directory} is not a directory.")
+
+    files = _load_files(_find_files(directory, pattern), processes or os.cpu_count() or 1,
+                        max_workers)
+
+    if result == "files":
+        return files
+
+    if result == "data":
+        return {path: file.data for path, file in files.items()}
+
+    merged = {}
+
+    for path, file in files.items():
+        # An empty YAML file holds None
+        if file.data is None:
+            continue
+
+        if not isinstance(file.data, dict):
+            raise ValueError(f"{path} does not hold a dictionary, it cannot be merged.")
+
+        merge(merged, file.data)
+
+    return merged
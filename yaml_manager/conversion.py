@@ -0,0 +1,472 @@
+"""
+conversion.py
+
+This module provides the conversion rules of the typed getters of FileController.
+
+Classes:
+    Conversion: The rules used to get a value of one type from the configuration.
+
+Functions:
+    numpy_module: Imports NumPy the first time it is needed, if it is installed.
+
+Attributes:
+    CONVERSIONS: The conversions by the type accepted by `FileController.get_many`.
+"""
+
+from typing import Callable, NamedTuple
+from array import array
+from functools import lru_cache
+
+# Returned by a conversion when the value cannot be converted
+INVALID = object()
+
+# The types converted in bulk by the numeric list conversions
+_NUMBERS = {int, float, bool}
+
+
+class Conversion(NamedTuple):
+    """
+    The rules used to get a value of one type from the configuration.
+
+    Attributes
+    ----------
+    description : str
+        The expected type of the default value, as used in error messages.
+    accepts : Callable[[Any], bool]
+        Checks whether a value is a valid default value.
+    store : Callable[[Any], Any]
+        Converts the default value into the value stored for a missing key.
+    convert : Callable[[Any], Any]
+        Converts a value of the configuration, returning `INVALID` if it cannot. The scalar
+        conversions return None for None.
+    fallback : Callable[[Any], Any]
+        Converts the default value returned when the value cannot be converted.
+    """
+    description: str
+    accepts: Callable[[any], bool]
+    store: Callable[[any], any]
+    convert: Callable[[any], any]
+    fallback: Callable[[any], any]
+
+
+def _same(value: any) -> any:
+    """
+    Returns the value unchanged.
+    """
+    return value
+
+
+def _is_list_of(value: any, expected_type: type) -> bool:
+    """
+    Checks whether a value is a list whose items are all of the expected type.
+    """
+    return isinstance(value, list) and all(isinstance(item, expected_type) for item in value)
+
+
+def _parse_float(string: str) -> any:
+    """
+    Parses a string made of an optional minus sign, digits and optional decimals.
+    """
+    body = string[:-1] if string.endswith("\n") else string
+
+    if body.startswith("-"):
+        body = body[1:]
+
+    head, dot, tail = body.partition(".")
+
+    if head.isdecimal() and (not dot or tail.isdecimal()):
+        return float(string)
+
+    return INVALID
+
+
+def _parse_int(string: str) -> any:
+    """
+    Parses a string made of an optional minus sign and digits.
+    """
+    body = string[:-1] if string.endswith("\n") else string
+
+    if body.startswith("-"):
+        body = body[1:]
+
+    if body.isdecimal():
+        return int(string)
+
+    return INVALID
+
+
+def _parse_truncated_int(string: str) -> any:
+    """
+    Parses a string made of an optional minus sign, digits and optional decimals,
+    dropping the decimals.
+    """
+    body = string[:-1] if string.endswith("\n") else string
+    sign = ""
+
+    if body.startswith("-"):
+        sign = "-"
+        body = body[1:]
+
+    head, dot, tail = body.partition(".")
+
+    if head.isdecimal() and (not dot or tail.isdecimal()):
+        return int(sign + head)
+
+    return INVALID
+
+
+def _parse_all(strings: list[str], convert: type, decimals: bool) -> any:
+    """
+    Parses a list of strings made of an optional minus sign, digits and, if `decimals`,
+    optional decimals, all at once.
+
+    The characters of the joined strings are checked with string methods, a dot without
+    digits on both sides is rejected, and any other misplaced sign or dot is rejected by
+    `convert`. Strings that do not pass are left to the item by item conversion.
+    """
+    joined = "," + ",".join(strings) + ","
+    digits = joined.replace("-", "").replace(",", "")
+
+    if decimals:
+        if ".," in joined or ",." in joined or "-." in joined:
+            return INVALID
+
+        digits = digits.replace(".", "")
+
+    if not digits.isdecimal():
+        return INVALID
+
+    try:
+        return list(map(convert, strings))
+
+    except ValueError:
+        return INVALID
+
+
+def to_string(value: any) -> any:
+    """
+    Converts a value into its string form.
+    """
+    if value is None:
+        return None
+
+    return str(value)
+
+
+def to_boolean(value: any) -> any:
+    """
+    Converts a value into a boolean, True if its string form is "true".
+    """
+    if value is None:
+        return None
+
+    return str(value).lower() == "true"
+
+
+def to_float(value: any) -> any:
+    """
+    Converts a value into a float, if its string form is a decimal number.
+
+    Floats are valid when their string form has no exponent, that is when they are
+    zero or between 1e-4 and 1e16 in absolute value, and booleans are never valid.
+    """
+    cls = value.__class__
+
+    if cls is float:
+        return value if value == 0.0 or 1e-4 <= abs(value) < 1e16 else INVALID
+
+    if cls is int:
+        try:
+            return float(value)
+
+        except OverflowError:
+            return _parse_float(str(value))
+
+    if cls is str:
+        return _parse_float(value)
+
+    if value is None:
+        return None
+
+    return _parse_float(str(value))
+
+
+def to_int(value: any) -> any:
+    """
+    Converts a value into an integer, if its string form is an integer.
+
+    Floats and booleans are never valid.
+    """
+    cls = value.__class__
+
+    if cls is int:
+        return value
+
+    if cls is str:
+        return _parse_int(value)
+
+    if value is None:
+        return None
+
+    if cls in (float, bool):
+        return INVALID
+
+    return _parse_int(str(value))
+
+
+def to_str_list(value: any) -> any:
+    """
+    Converts a list into a list of strings.
+    """
+    if not isinstance(value, list):
+        return INVALID
+
+    if set(map(type, value)) <= {str}:
+        return list(value)
+
+    return [str(x) for x in value]
+
+
+def to_float_list(value: any) -> any:
+    """
+    Converts a list into a list of floats, items that are not numbers becoming 0.0.
+    """
+    if not isinstance(value, list):
+        return INVALID
+
+    types = set(map(type, value))
+
+    if types <= {float}:
+        return list(value)
+
+    if types <= _NUMBERS:
+        return list(map(float, value))
+
+    if types == {str}:
+        float_list = _parse_all(value, float, True)
+
+        if float_list is not INVALID:
+            return float_list
+
+    float_list = []
+
+    # Converting values to floats
+    for item in value:
+        if isinstance(item, (float, int)):
+            float_list.append(float(item))
+
+        else:
+            item = _parse_float(item if item.__class__ is str else str(item))
+            float_list.append(0.0 if item is INVALID else item)
+
+    return float_list
+
+
+def to_int_list(value: any) -> any:
+    """
+    Converts a list into a list of integers, items that are not numbers becoming 0.
+
+    Floats, and strings of decimal numbers, are truncated towards zero.
+    """
+    if not isinstance(value, list):
+        return INVALID
+
+    types = set(map(type, value))
+
+    if types <= {int}:
+        return list(value)
+
+    if types <= _NUMBERS:
+        return list(map(int, value))
+
+    if types == {str}:
+        int_list = _parse_all(value, int, False)
+
+        if int_list is not INVALID:
+            return int_list
+
+    int_list = []
+
+    # Converting values to integers
+    for item in value:
+        if isinstance(item, (int, float)):
+            int_list.append(int(item))
+
+        else:
+            item = _parse_truncated_int(item if item.__class__ is str else str(item))
+            int_list.append(0 if item is INVALID else item)
+
+    return int_list
+
+
+def to_bool_list(value: any) -> any:
+    """
+    Converts a list into a list of booleans, items being True if their string form is "true".
+    """
+    if not isinstance(value, list):
+        return INVALID
+
+    if set(map(type, value)) <= {bool}:
+        return list(value)
+
+    return [item if item.__class__ is bool else str(item).lower() == "true"
+            for item in value]
+
+
+@lru_cache(maxsize=None)
+def numpy_module() -> any:
+    """
+    Imports NumPy the first time it is needed.
+
+    Returns
+    -------
+    module or None
+        The `numpy` module, or None if it is not installed.
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def _to_array(value: any, typecode: str) -> any:
+    """
+    Converts a list into a compact array of numbers, a NumPy array if NumPy is installed.
+
+    Lists of numbers are converted in one pass, other lists follow the rules of the
+    numeric list conversions.
+    """
+    if not isinstance(value, list):
+        return INVALID
+
+    types = set(map(type, value))
+
+    if typecode == "d":
+        items = value if types <= _NUMBERS else to_float_list(value)
+    else:
+        items = value if types <= {int, bool} else to_int_list(value)
+
+    numpy = numpy_module()
+
+    if numpy is None:
+        return array(typecode, items)
+
+    return numpy.array(items, dtype=numpy.float64 if typecode == "d" else numpy.int64)
+
+
+def to_float_array(value: any) -> any:
+    """
+    Converts a list into an array of 64-bit floats, items that are not numbers becoming 0.0.
+    """
+    return _to_array(value, "d")
+
+
+def to_int_array(value: any) -> any:
+    """
+    Converts a list into an array of 64-bit integers, items that are not numbers becoming 0.
+    """
+    return _to_array(value, "q")
+
+
+STRING = Conversion(
+    "a string",
+    lambda value: isinstance(value, str),
+    _same,
+    to_string,
+    _same
+)
+
+FLOAT = Conversion(
+    "a number",
+    lambda value: isinstance(value, (float, int)),
+    str,
+    to_float,
+    float
+)
+
+INT = Conversion(
+    "an integer",
+    lambda value: isinstance(value, int),
+    str,
+    to_int,
+    int
+)
+
+BOOLEAN = Conversion(
+    "a boolean",
+    lambda value: isinstance(value, bool),
+    str,
+    to_boolean,
+    _same
+)
+
+STR_LIST = Conversion(
+    "a list of strings",
+    lambda value: _is_list_of(value, str),
+    _same,
+    to_str_list,
+    _same
+)
+
+FLOAT_LIST = Conversion(
+    "a list of numbers",
+    lambda value: _is_list_of(value, (float, int)),
+    _same,
+    to_float_list,
+    _same
+)
+
+INT_LIST = Conversion(
+    "a list of numbers",
+    lambda value: _is_list_of(value, (int, float)),
+    _same,
+    to_int_list,
+    _same
+)
+
+BOOL_LIST = Conversion(
+    "a list",
+    lambda value: isinstance(value, list),
+    _same,
+    to_bool_list,
+    _same
+)
+
+FLOAT_ARRAY = Conversion(
+    "a list of numbers",
+    lambda value: _is_list_of(value, (float, int)),
+    _same,
+    to_float_array,
+    to_float_array
+)
+
+INT_ARRAY = Conversion(
+    "a list of numbers",
+    lambda value: _is_list_of(value, (int, float)),
+    _same,
+    to_int_array,
+    to_int_array
+)
+
+DICTIONARY = Conversion(
+    "a dictionary",
+    lambda value: isinstance(value, dict),
+    _same,
+    lambda value: value if isinstance(value, dict) else INVALID,
+    _same
+)
+
+# The conversions by the type accepted by FileController.get_many
+CONVERSIONS = {
+    str: STRING,
+    float: FLOAT,
+    int: INT,
+    bool: BOOLEAN,
+    list[str]: STR_LIST,
+    list[float]: FLOAT_LIST,
+    list[int]: INT_LIST,
+    list[bool]: BOOL_LIST,
+    dict: DICTIONARY,
+}
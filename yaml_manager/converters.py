@@ -0,0 +1,456 @@
+"""
+converters.py
+
+This module provides the functions converting dictionaries, JSON files and YAML files
+into one another.
+
+Functions:
+    to_json_file: Converts a dictionary into a JSONFile.
+    json_file_to_dict: Converts a JSON file into a dictionary.
+    json_file_to_yaml_file: Converts a JSON file into a YAMLFile.
+    to_yaml_file: Converts a dictionary into a YAMLFile.
+    yaml_file_to_dict: Converts a YAML file into a dictionary.
+    yaml_file_to_json_file: Converts a YAML file into a JSONFile.
+    stream_json_file_to_yaml_file: Converts a JSON file into a YAML file without loading it.
+    stream_yaml_file_to_json_file: Converts a YAML file into a JSON file without loading it.
+"""
+
+from typing import Callable, TextIO, Union
+import os
+
+from yaml_manager import stream_convert
+from yaml_manager.json_file import JSONFile
+from yaml_manager.yaml_file import YAMLFile
+
+
+def to_json_file(
+    path: Union[str, JSONFile],
+    dictionary: dict,
+    save: bool = False
+) -> JSONFile:
+    """
+    Converts a dictionary into a JSONFile.
+
+    This function takes a dictionary and converts it into a `JSONFile`.
+    If a file path is provided, it creates a new `JSONFile`. Optionally, the file can be saved.
+
+    Parameters
+    ----------
+    path : str or JSONFile
+        The file path or an existing `JSONFile` object.
+    dictionary : dict
+        The dictionary to be converted into a JSON file.
+    save : bool, optional
+        If True, the JSON file will be saved (default is False).
+
+    Returns
+    -------
+    JSONFile
+        A `JSONFile` object containing the data from the dictionary.
+
+    Raises
+    ------
+    TypeError
+        If `path` is not a string or `JSONFile`, or if `dictionary` is not a dictionary,
+        or if `save` is not a boolean.
+    """
+    if not (isinstance(path, (str, JSONFile)) and isinstance(dictionary, dict) and
+            isinstance(save, bool)):
+
+        raise TypeError(
+            "path must be a non-empty string or a JSONFile, dictionary must be a dictionary,"
+            "and save must be a boolean."
+        )
+
+    if isinstance(path, str):
+        # The file is overwritten, so its current content is never parsed
+        file = JSONFile(path, lazy=True)
+    else:
+        file = path
+
+    file.data = dictionary
+
+    if save:
+        file.save()
+
+    return file
+
+
+def json_file_to_dict(json_path: Union[str, JSONFile]) -> dict:
+    """
+    Converts a JSON file into a dictionary.
+
+    This function loads the data from a `JSONFile` or a file path into a dictionary.
+
+    Parameters
+    ----------
+    json_path : str or JSONFile
+        The path to the JSON file or an existing `JSONFile` object.
+
+    Returns
+    -------
+    dict
+        A dictionary with the data from the JSON file.
+
+    Raises
+    ------
+    TypeError
+        If `json_path` is not a string or `JSONFile`.
+    """
+    if not isinstance(json_path, (str, JSONFile)):
+        raise TypeError("json_path must be a non-empty string or a JSONFile.")
+
+    if isinstance(json_path, str):
+        return JSONFile(json_path).data
+
+    return json_path.data
+
+
+def json_file_to_yaml_file(
+    json_path: Union[str, JSONFile],
+    yaml_path: Union[str, YAMLFile],
+    save: bool = False
+) -> YAMLFile:
+    """
+    Converts a JSON file into a YAML file and returns a new `YAMLFile` object.
+
+    This function reads a `JSONFile` and converts its content into a `YAMLFile`.
+    Optionally, the YAML file can be saved.
+
+    Parameters
+    ----------
+    json_path : str or JSONFile
+        The path to the JSON file or an existing `JSONFile` object.
+    yaml_path : str or YAMLFile
+        The path to the YAML file or an existing `YAMLFile` object.
+    save : bool, optional
+        If True, the YAML file will be saved (default is False).
+
+    Returns
+    -------
+    YAMLFile
+        A `YAMLFile` object containing the data from the JSON file.
+
+    Raises
+    ------
+    TypeError
+        If `json_path` is not a string or `JSONFile`, or if `yaml_path` is not a string or
+        `YAMLFile`, or if `save` is not a boolean.
+    """
+    if not (isinstance(json_path, (str, JSONFile)) and isinstance(yaml_path, (str, YAMLFile))
+            and isinstance(save, bool)):
+
+        raise TypeError(
+            "json_path must be a non-empty string or a JSONFile, yaml_path must be a non-empty"
+            "string or a YAMLFile, and save must be a boolean."
+        )
+
+    if isinstance(yaml_path, str):
+        # The file is overwritten, so its current content is never parsed
+        file = YAMLFile(yaml_path, lazy=True)
+    else:
+        file = yaml_path
+
+    file.data = json_file_to_dict(json_path)
+
+    if save:
+        file.save()
+
+    return file
+
+
+def to_yaml_file(
+    yaml_path: Union[str, YAMLFile],
+    dictionary: dict,
+    save: bool = False
+) -> YAMLFile:
+    """
+    Converts a dictionary into a YAMLFile object.
+
+    This function takes a dictionary and converts it into a `YAMLFile` object.
+    Optionally, the file can be saved.
+
+    Parameters
+    ----------
+    yaml_path : str or YAMLFile
+        The path to the YAML file or an existing `YAMLFile` object.
+    dictionary : dict
+        The dictionary to be converted into a YAML file.
+    save : bool, optional
+        If True, the YAML file will be saved (default is False).
+
+    Returns
+    -------
+    YAMLFile
+        A `YAMLFile` object containing the data from the dictionary.
+
+    Raises
+    ------
+    TypeError
+        If `yaml_path` is not a string or `YAMLFile`, or if `dictionary` is not a dictionary,
+        or if `save` is not a boolean.
+    """
+    if not (isinstance(yaml_path, (str, YAMLFile)) and isinstance(dictionary, dict) and
+            isinstance(save, bool)):
+        raise TypeError(
+            "yaml_path must be a non-empty string or a YAMLFile, dictionary must be a dictionary,"
+            "and save must be a boolean."
+        )
+
+    if isinstance(yaml_path, str):
+        # The file is overwritten, so its current content is never parsed
+        file = YAMLFile(yaml_path, lazy=True)
+    else:
+        file = yaml_path
+
+    file.data = dictionary
+
+    if save:
+        file.save()
+
+    return file
+
+
+def yaml_file_to_dict(yaml_path: Union[str, YAMLFile]) -> dict:
+    """
+    Converts a YAML file into a dictionary.
+
+    This function loads the data from a `YAMLFile` or a file path into a dictionary.
+
+    Parameters
+    ----------
+    yaml_path : str or YAMLFile
+        The path to the YAML file or an existing `YAMLFile` object.
+
+    Returns
+    -------
+    dict
+        A dictionary with the data from the YAML file.
+
+    Raises
+    ------
+    TypeError
+        If `yaml_path` is not a string or `YAMLFile`.
+    """
+    if not isinstance(yaml_path, (str, YAMLFile)):
+        raise TypeError("yaml_path must be a non-empty string or a YAMLFile.")
+
+    if isinstance(yaml_path, str):
+        return YAMLFile(yaml_path).data
+
+    return yaml_path.data
+
+
+def yaml_file_to_json_file(
+    yaml_path: Union[str, YAMLFile],
+    json_path: Union[str, JSONFile],
+    save: bool = False
+) -> JSONFile:
+    """
+    Converts a YAML file into a JSON file and returns a new `JSONFile` object.
+
+    This function reads a `YAMLFile` and converts its content into a `JSONFile`.
+    Optionally, the JSON file can be saved.
+
+    Parameters
+    ----------
+    yaml_path : str or YAMLFile
+        The path to the YAML file or an existing `YAMLFile` object.
+    json_path : str or JSONFile
+        The path to the JSON file or an existing `JSONFile` object.
+    save : bool, optional
+        If True, the JSON file will be saved (default is False).
+
+    Returns
+    -------
+    JSONFile
+        A `JSONFile` object containing the data from the YAML file.
+
+    Raises
+    ------
+    TypeError
+        If `json_path` is not a string or `JSONFile`, or if `yaml_path` is not a string
+        or `YAMLFile`, or if `save` is not a boolean.
+    """
+    if not (
+        isinstance(yaml_path, (str, YAMLFile))
+        and isinstance(json_path, (str, JSONFile))
+        and isinstance(save, bool)
+    ):
+        raise TypeError(
+            "yaml_path must be a non-empty string or a YAMLFile, json_path must be a non-empty"
+            "string or a JSONFile, and save must be a boolean."
+        )
+
+    if isinstance(json_path, str):
+        # The file is overwritten, so its current content is never parsed
+        file = JSONFile(json_path, lazy=True)
+    else:
+        file = json_path
+
+    file.data = yaml_file_to_dict(yaml_path)
+
+    if save:
+        file.save()
+
+    return file
+
+
+def _stream_file(
+    source_path: str,
+    target_path: str,
+    convert: Callable[[TextIO, TextIO], bool]
+) -> bool:
+    """
+    Streams the conversion of a file into a temporary file, renamed over the target.
+
+    Parameters
+    ----------
+    source_path : str
+        The path to the source file.
+    target_path : str
+        The path to the target file, whose directory is created if needed.
+    convert : Callable[[TextIO, TextIO], bool]
+        The conversion of the opened source into the opened target.
+
+    Returns
+    -------
+    bool
+        True if the target was written, False if the conversion is not supported, in which
+        case the target is left as it was.
+    """
+    directory = os.path.dirname(os.path.abspath(target_path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Created with the default permissions, unlike the files of tempfile
+    temp_path = os.path.join(directory, f".{os.path.basename(target_path)}."
+                             f"{os.urandom(6).hex()}.tmp")
+    converted = False
+
+    try:
+        with open(source_path, "r", encoding="utf-8") as source, \
+                open(temp_path, "x", encoding="utf-8") as target:
+            converted = convert(source, target)
+
+        if converted:
+            if os.path.exists(target_path):
+                os.chmod(temp_path, os.stat(target_path).st_mode & 0o7777)
+
+            os.replace(temp_path, target_path)
+
+    finally:
+        if not converted and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return converted
+
+
+def stream_json_file_to_yaml_file(
+    json_path: Union[str, JSONFile],
+    yaml_path: Union[str, YAMLFile]
+) -> bool:
+    """
+    Converts a JSON file into a YAML file without loading it into a dictionary.
+
+    The tokens of the JSON file are translated into YAML as they are read, so memory stays
+    bounded whatever the size of the file, and the YAML file is never parsed. The output is
+    written to a temporary file, renamed over the YAML file once complete, and is the same
+    as the one of `json_file_to_yaml_file` with `save`.
+
+    A file that cannot be streamed, because its root is not an object, it holds duplicate
+    keys or it is not valid JSON, is converted by `json_file_to_yaml_file` instead, which
+    reports the errors of the JSON file.
+
+    Parameters
+    ----------
+    json_path : str or JSONFile
+        The path to the JSON file or a `JSONFile` object, whose file is converted as it is on
+        disk.
+    yaml_path : str or YAMLFile
+        The path to the YAML file or a `YAMLFile` object, whose dumper is used.
+
+    Returns
+    -------
+    bool
+        True if the file was streamed, False if it was converted through a dictionary.
+
+    Raises
+    ------
+    TypeError
+        If `json_path` is not a string or `JSONFile`, or if `yaml_path` is not a string or
+        `YAMLFile`.
+    FileNotFoundError
+        If the JSON file does not exist.
+    """
+    if not (isinstance(json_path, (str, JSONFile)) and isinstance(yaml_path, (str, YAMLFile))):
+        raise TypeError("json_path must be a non-empty string or a JSONFile, and yaml_path "
+                        "must be a non-empty string or a YAMLFile.")
+
+    source_path = json_path if isinstance(json_path, str) else json_path.file_path
+    target = YAMLFile(yaml_path, lazy=True) if isinstance(yaml_path, str) else yaml_path
+
+    if _stream_file(source_path, target.file_path,
+                    lambda json_file, yaml_file: stream_convert.json_to_yaml(
+                        json_file, yaml_file, target.dumper)):
+        return True
+
+    json_file_to_yaml_file(JSONFile(source_path, lazy=True), target, save=True)
+    return False
+
+
+def stream_yaml_file_to_json_file(
+    yaml_path: Union[str, YAMLFile],
+    json_path: Union[str, JSONFile]
+) -> bool:
+    """
+    Converts a YAML file into a JSON file without loading it into a dictionary.
+
+    The events of the YAML parser are written as JSON as they are read, so memory stays
+    bounded whatever the size of the file, and the JSON file is never parsed. The output is
+    written to a temporary file, renamed over the JSON file once complete, and is the same
+    as the one of `yaml_file_to_json_file` with `save`.
+
+    A file that cannot be streamed, because its root is not a mapping, or it holds anchors,
+    aliases, merge keys, duplicate or complex keys or tags without a JSON equivalent, is
+    converted by `yaml_file_to_json_file` instead.
+
+    Parameters
+    ----------
+    yaml_path : str or YAMLFile
+        The path to the YAML file or a `YAMLFile` object, whose file is converted as it is on
+        disk with its loader.
+    json_path : str or JSONFile
+        The path to the JSON file or a `JSONFile` object.
+
+    Returns
+    -------
+    bool
+        True if the file was streamed, False if it was converted through a dictionary.
+
+    Raises
+    ------
+    TypeError
+        If `yaml_path` is not a string or `YAMLFile`, or if `json_path` is not a string or
+        `JSONFile`.
+    FileNotFoundError
+        If the YAML file does not exist.
+    yaml.YAMLError
+        If the content of the YAML file is not valid YAML.
+    ValueError
+        If a value of the YAML file is out of range for JSON.
+    """
+    if not (isinstance(yaml_path, (str, YAMLFile)) and isinstance(json_path, (str, JSONFile))):
+        raise TypeError("yaml_path must be a non-empty string or a YAMLFile, and json_path "
+                        "must be a non-empty string or a JSONFile.")
+
+    source = YAMLFile(yaml_path, lazy=True) if isinstance(yaml_path, str) else yaml_path
+    target_path = json_path if isinstance(json_path, str) else json_path.file_path
+
+    if _stream_file(source.file_path, target_path,
+                    lambda yaml_file, json_file: stream_convert.yaml_to_json(
+                        yaml_file, json_file, source.loader)):
+        return True
+
+    yaml_file_to_json_file(YAMLFile(source.file_path, source.backend, source.safe, lazy=True),
+                           json_path, save=True)
+    return False
@@ -5,22 +5,35 @@ This module provides the FileController abstract base class for managing file op
 
 Classes:
     FileController: An abstract base class to handle common file operations.
+
+Functions:
+    prefetch: Loads many lazily opened files in parallel.
 """
 
-from typing import Union
-from abc import ABC, abstractmethod
-from pathlib import Path
+from typing import Iterable, Iterator, Union
+from abc import ABCMeta
+from contextlib import contextmanager
 import os
-import re
+import threading
+
+from yaml_manager import key_path
+from yaml_manager.persistence import Persistence
+from yaml_manager.sections import Sections
+from yaml_manager.subscriptions import Subscriptions
+from yaml_manager.thread_safety import ThreadSafety
+from yaml_manager.tree import fingerprint, snapshot
+from yaml_manager.typed_getters import TypedGetters
 
 
-class FileController(ABC):
+class FileController(TypedGetters, Subscriptions, Persistence, ThreadSafety, metaclass=ABCMeta):
     """
     Abstract class to handle file operations.
 
     This class provides the base structure for managing file I/O operations.
     It verifies the file path, ensures read/write permissions, and defines 
-    abstract methods for loading and saving data.
+    abstract methods for loading and saving data. The typed getters, the typed views and
+    subscribers, the loading and saving of the file and the thread-safe mode are added by
+    the `TypedGetters`, `Subscriptions`, `Persistence` and `ThreadSafety` base classes.
 
     Attributes
     ----------
@@ -28,11 +41,51 @@ class FileController(ABC):
         The path to the file being managed.
     data : dict
         Dictionary holding the data loaded from the file.
+    key_index : bool
+        Whether lookups go through a flat index of every dotted key.
+    content_hash : bool
+        Whether `reload()` compares a hash of the file content before reparsing a file
+        whose stat metadata changed.
+    parse_cache : str or None
+        The directory where the parsed data is cached across processes, or None.
+    track_changes : bool
+        Whether a fingerprint of `data` is kept to detect direct changes to it.
+    write_behind : float or None
+        The number of seconds saves are coalesced for before a background write.
+    durability : str
+        Whether a save syncs the file (`"file"`) and its directory (`"full"`) to the disk
+        before it returns, or neither (`"none"`).
+    file_lock : bool
+        Whether saves and reloads take an advisory lock on the file, shared across processes.
+    lock_timeout : float or None
+        The maximum number of seconds to wait for the lock of the file, or None.
+    is_loaded : bool
+        Whether the file was parsed, False until the first access in lazy mode.
+    thread_safe : bool
+        Whether the data is guarded by a reader-writer lock, for sharing between threads.
+    lock : ReadWriteLock or None
+        The reader-writer lock of the thread-safe mode, or None.
     """
 
     __version__ = "1.2.4"
 
-    def __init__(self, file_path: str) -> None:
+    # Whether direct changes to data are detected by a fingerprint, overridable per instance
+    track_changes = True
+
+    # Whether new instances defer parsing the file until its data is first accessed
+    default_lazy = False
+
+    # The methods run with read access to the lock in thread-safe mode, and those run with
+    # write access, which are wrapped in the instance only when the mode is enabled
+    _read_locked_methods = ("contains", "string", "float", "int", "boolean", "str_list",
+                            "float_list", "int_list", "bool_list", "float_array", "int_array",
+                            "dictionary", "get_many", "_whole_data", "_FileController__is_dirty")
+    _write_locked_methods = ("load", "load_parsed", "set", "set_many", "bind", "unbind",
+                             "subscribe", "unsubscribe", "_FileController__set_data",
+                             "_FileController__apply", "_Persistence__commit",
+                             "_Persistence__take_snapshot")
+
+    def __init__(self, file_path: str, lazy: Union[bool, None] = None) -> None:
         """
         Initializes the FileController instance.
 
@@ -40,24 +93,39 @@ class FileController(ABC):
         ----------
         file_path : str
             The path to the file to be managed.
+        lazy : bool, optional
+            If True, the file is only parsed when its data is first accessed
+            (default is `FileController.default_lazy`).
 
         Raises
         ------
         TypeError
-            If file_path is not a string.
+            If file_path is not a string or lazy is not a boolean.
         IsADirectoryError
             If file_path points to a directory.
         PermissionError
             If the file lacks read or write permissions.
         """
         self.file_path = file_path
-        self.data = {}
+        self.__pending = False
+        self.__load_lock = threading.RLock()
+        self.__sections = None
+        self.__data = {}
+        self.__dirty = True
+        self.__fingerprint = None
+        super().__init__()
 
         if not isinstance(file_path, str):
             raise TypeError("File_path needs to be a string")
 
-        if Path(file_path).exists():
-            if Path(file_path).is_file():
+        if lazy is None:
+            lazy = FileController.default_lazy
+
+        elif not isinstance(lazy, bool):
+            raise TypeError("lazy must be a boolean.")
+
+        if os.path.exists(file_path):
+            if os.path.isfile(file_path):
 
                 if not os.access(file_path, os.R_OK):
                     raise PermissionError(f"Cannot read file: {file_path}")
@@ -65,679 +133,610 @@ class FileController(ABC):
                 if not os.access(file_path, os.W_OK):
                     raise PermissionError(f"Cannot write to file: {file_path}")
 
-                self.reload()
+                if lazy:
+                    self.__pending = True
+                else:
+                    self.reload()
 
             else:
                 raise IsADirectoryError(f"{file_path} is not a file")
 
-    @abstractmethod
-    def reload(self):
+    @property
+    def data(self) -> dict:
         """
-        Abstract method for loading data from the file into `self.data`.
-        Must be implemented by subclasses.
+        Dictionary holding the data loaded from the file.
         """
+        return self._whole_data()
+
+    @data.setter
+    def data(self, data: dict) -> None:
+        self.__set_data(data)
 
-    @abstractmethod
-    def save(self):
+    def _whole_data(self) -> dict:
         """
-        Abstract method for saving `self.data` to the file.
-        Must be implemented by subclasses.
+        Gets `data`, parsing the file or decoding its sections first if needed.
         """
+        if self.__pending:
+            self.load()
 
-    def contains(self, key: str) -> bool:
+        if self.__sections is not None:
+            self._decode_sections()
+
+        return self.__data
+
+    def __set_data(self, data: dict) -> None:
         """
-        Checks if a key exists in the data dictionary.
+        Replaces `data`, which is then dirty.
+        """
+        self.__replace_data(data)
+        self.__pending = False
 
-        Parameters
-        ----------
-        key : str
-            The key to search for in the data dictionary.
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Whether `data` may differ from the content of the file.
 
-        Returns
-        -------
-        bool
-            True if the key exists in the dictionary, False otherwise.
+        `set()`, the defaults stored by the getters and assigning `data` always make the
+        data dirty. Direct changes to the dictionaries of `data` are detected by comparing
+        its fingerprint with the one taken at the last load or save, unless `track_changes`
+        is False, in which case the data is reported dirty. Data that was not loaded yet is
+        not dirty.
         """
-        return key in self.data
+        return self.__is_dirty()
 
-    def set(self, key: str, value: any) -> None:
+    def __is_dirty(self) -> bool:
         """
-        Sets, modifies, or deletes values in the configuration.
+        Checks whether `data` may differ from the content of the file.
+        """
+        if self.__pending:
+            return False
 
-        Parameters
-        ----------
-        key : str
-            The configuration key, separated by dots.
-        value : Any
-            The value to set. If None, the key will be deleted.
+        if self.__dirty:
+            return True
+
+        if self.__fingerprint is None:
+            return True
+
+        if self.__sections is not None:
+            return self.__sections.changed(self.__data)
+
+        return fingerprint(self.__data) != self.__fingerprint
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Whether the file was parsed, False until the first access in lazy mode.
+        """
+        return not self.__pending
+
+
+    def load(self) -> None:
+        """
+        Parses the file if it was opened lazily and was not parsed yet.
+
+        The first access to the data of a lazily opened file calls this method. It is
+        thread-safe: when several threads access the data for the first time at once,
+        the file is parsed by one of them while the others wait for it.
 
         Raises
         ------
-        TypeError
-            If `key` is not a string or is an empty string.
+        FileNotFoundError
+            If the file no longer exists.
+        ValueError
+            If the file content is not valid for the format of the file.
         """
-        if isinstance(key, str) and len(key) > 0:
-            self.data = self.__update_dict(key.split("."), self.data, value)
-        else:
-            raise TypeError("Key must be a non-empty string.")
+        if not self.__pending:
+            return
 
-    def string(
-        self,
-        key: str,
-        default_value: Union[str, None] = None
-    ) -> Union[str , None]:
+        with self.__load_lock:
+            if self.__pending:
+                self.reload(force=True)
+
+    def load_parsed(self, data: dict, stat: os.stat_result) -> None:
         """
-        Gets a string value from the data.
+        Sets the data of the file parsed elsewhere, such as by another process, as if
+        `reload()` had parsed it.
+
+        The file is considered unchanged since `stat` was taken, so it must be taken before
+        the file is read: a file changed in between is then parsed again by `reload()`.
 
         Parameters
         ----------
-        key : str
-            The key to the configuration key.
-        default_value : str, optional
-            The default value to return if the key is not found.
-
-        Returns
-        -------
-        str
-            The string value associated with the given key key, or `None` if
-            the key is not found.
+        data : dict
+            The data parsed from the file.
+        stat : os.stat_result
+            The stat metadata of the file, taken before it was read.
 
         Raises
         ------
         TypeError
-            If `key` is not a string or `default_value` is not a string.
+            If stat is not an os.stat_result.
+        OSError
+            If a pending background write failed.
+        KeyError, ValueError
+            If a typed view returned by `bind()` cannot be converted from the data, in
+            which case the data and the views are left as they were.
+        Exception
+            The first error raised by a subscriber of `subscribe()`, once the data is
+            installed and every subscriber was called.
         """
-        if not self.__validate_key_and_default(key, default_value, str):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a string.")
+        if not isinstance(stat, os.stat_result):
+            raise TypeError("stat must be an os.stat_result.")
 
-        value = self.__handle_get(key.split("."), self.data, default_value)
+        with self.__load_lock:
+            if self.write_behind is not None:
+                self.flush()
 
-        if value is not None:
-            return str(value)
+            old_data = self._install(data, None)
+            self._record_file((stat.st_mtime_ns, stat.st_size, stat.st_ino), None)
 
-        return None
+        self._notify(old_data, data)
 
-    def float(
-        self,
-        key: str,
-        default_value: Union[float, int, None] = None
-    ) -> Union[float, None]:
+    def _install(self, data: dict, sections: Union[Sections, None]) -> Union[dict, None]:
         """
-        Gets a float value from the data.
+        Sets the data parsed from the file, marking it as matching the file, and updates
+        the typed views. If a view cannot be converted, nothing is changed.
 
         Parameters
         ----------
-        key : str
-            The configuration key.
-        default_value : float or int, optional
-            The default value to return if the key is not found.
+        data : dict
+            The parsed data.
+        sections : Sections or None
+            The index of the sections of the data not decoded yet, or None.
 
         Returns
         -------
-        float
-            The float value associated with the given key key, or `None` if the key is not found.
+        dict or None
+            The previous data, if there are subscribers and the file was already loaded.
 
         Raises
         ------
-        TypeError
-            If `key` is not a string or `default_value` is not a number.
+        KeyError
+            If a field without default value of a typed view is missing.
+        ValueError
+            If a field without default value of a typed view cannot be converted.
         """
-        if not self.__validate_key_and_default(key, default_value, (float, int)):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a number.")
+        # The views and the subscribers need the whole data
+        if sections is not None and self._needs_whole_data():
+            try:
+                sections.decode_all(data)
 
-        string = self.string(key, str(default_value)
-                             if default_value is not None else None)
+            finally:
+                sections.close()
 
-        if string is None:
-            return None
+            sections = None
+
+        # Every view is converted before anything is changed, so that a reload which would
+        # leave one of them half updated is rejected
+        view_changes = self._convert_views(data)
 
-        if re.search(r"^-?\d+(\.\d+)?$", string):
-            return float(string)
+        # The data is kept whole while there are subscribers, see subscribe()
+        old_data = None
 
-        if default_value is not None:
-            self.set(key, default_value)
-            return float(default_value)
+        if self._is_subscribed() and not self.__pending and self.__sections is None:
+            old_data = self.__data
 
-        return None
+        self.__replace_data(data)
+        self.__sections = sections
+        self.__mark_clean()
+        self._apply_views(view_changes)
 
-    def int(
-        self,
-        key: str,
-        default_value: Union[int, None] = None
-    ) -> Union[int, None]:
+        # Only now can threads of a lazy first access skip the lock
+        self.__pending = False
+
+        return old_data
+
+    def _take_save_data(self, force: bool) -> Union[dict, None]:
         """
-        Gets an integer value from the data.
+        Gets the data to save and marks it clean, or None if the file is up to date.
 
         Parameters
         ----------
-        key : str
-            The configuration key.
-        default_value : int, optional
-            The default value to return if the key is not found.
+        force : bool
+            If True, the data is returned even if it is not dirty.
 
         Returns
         -------
-        int
-            The integer value associated with the given key key, or `None` if the key is not found.
-
-        Raises
-        ------
-        TypeError
-            If `key` is not a string or `default_value` is not an integer.
+        dict or None
+            The data, or a snapshot of it in write-behind or thread-safe mode, or None.
         """
-        if not self.__validate_key_and_default(key, default_value, int):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be an integer.")
+        if self.__pending:
+            # The file already holds the data, which was never loaded
+            if not force:
+                return None
 
-        string = self.string(key, str(default_value)
-                             if default_value is not None else None)
+            self.load()
+
+        if self.__sections is not None:
+            # The sections that were not decoded still match the file
+            if not force and not self.is_dirty and self._file_unchanged():
+                return None
 
-        if string is None:
+            self._decode_sections()
+
+        current = fingerprint(self.__data) if self.track_changes else None
+
+        if (not force and not self.__dirty and current is not None and
+                current == self.__fingerprint and self._file_unchanged()):
             return None
 
-        if re.search(r"^-?\d+$", string):
-            return int(string)
+        data = self.__data
+
+        # The data may change before the background thread, or this one once it released
+        # the lock, writes it
+        if self.write_behind is not None or self.thread_safe:
+            data = snapshot(data)
 
-        if default_value is not None:
-            self.set(key, default_value)
-            return int(default_value)
+        self.__dirty = False
+        self.__fingerprint = current
+        return data
 
-        return None
+    def __replace_data(self, data: dict) -> None:
+        """
+        Replaces `data`, dropping the key index, array cache and sections, and marks it dirty.
+        """
+        if self.__sections is not None:
+            self.__sections.close()
+            self.__sections = None
+
+        self.__data = data
+        self._forget_lookups()
+        self.__dirty = True
+
+    def _mark_dirty(self) -> None:
+        """
+        Marks `data` as differing from the content of the file, so that the next `save()`
+        writes it, such as after a failed background write.
+        """
+        self.__dirty = True
 
-    def boolean(
-        self,
-        key: str,
-        default_value: Union[bool, None] = None
-    ) -> Union[bool, None]:
+    def _has_changes(self, direct: bool) -> bool:
         """
-        Gets a boolean value from the data.
+        Checks whether the data may differ from the content of the file.
 
         Parameters
         ----------
-        key : str
-            The key to the configuration key.
-        default_value : bool, optional
-            The default value to return if the key is not found.
+        direct : bool
+            True to also check the direct changes to the dictionaries of `data`, False
+            to only check the changes made by `set()`, a getter default or an assignment
+            of `data`.
 
         Returns
         -------
         bool
-            The boolean value associated with the given key key, or `None` if the key is not found.
-
-        Raises
-        ------
-        TypeError
-            If `key` is not a string or `default_value` is not a boolean.
+            True if the data may differ from the file.
         """
-        if not self.__validate_key_and_default(key, default_value, bool):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a boolean.")
-
-        string = self.string(key, str(default_value)
-                             if default_value is not None else None)
+        return self.__is_dirty() if direct else self.__dirty
 
-        if string is None:
-            return None
-
-        return string.lower() == "true"
+    def __mark_clean(self) -> None:
+        """
+        Marks `data` as matching the content of the file, taking its fingerprint if
+        `track_changes` is True.
+        """
+        self.__dirty = False
+        self.__fingerprint = fingerprint(self.__data) if self.track_changes else None
 
-    def str_list(
-        self,
-        key: str,
-        default_value: Union[list[str], None] = None
-    ) -> Union[list[str], None]:
+    def __require(self, *keys: str) -> None:
         """
-        Gets a list of strings from the data.
+        Decodes the sections needed to access the values at some keys.
 
         Parameters
         ----------
-        key : str
-            The key to the configuration key.
-        default_value : list of str, optional
-            The default value to return if the key is not found.
+        *keys : str
+            The configuration keys, separated by dots.
+        """
+        self._require_write()
 
-        Returns
-        -------
-        list of str
-            The list of string values associated with the given key key,
-              or `None` if the key is not found.
+        with self.__load_lock:
+            if self.__sections is not None:
+                for key in keys:
+                    self.__sections.require(self.__data, key_path.compile_key(key),
+                                            self.track_changes)
 
-        Raises
-        ------
-        TypeError
-            If `key` is not a string or `default_value` is not a list of strings.
+    def _decode_sections(self) -> None:
+        """
+        Decodes every section which was not decoded yet, after which `data` is whole.
         """
-        if not self.__validate_key_and_default(key, default_value, list[str]):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a list of strings.")
+        self._require_write()
+
+        with self.__load_lock:
+            sections = self.__sections
 
-        lista = self.__handle_get(key.split("."), self.data, default_value)
+            if sections is None:
+                return
 
-        if isinstance(lista, list):
-            return [str(x) for x in lista]
+            changed = self.track_changes and sections.changed(self.__data)
+            sections.decode_all(self.__data)
+            sections.close()
+            self.__sections = None
 
-        if default_value is not None:
-            self.set(key, default_value)
-            return default_value
+            # The values changed directly since they were decoded make the data dirty
+            if changed:
+                self.__dirty = True
 
-        return None
+            if self.track_changes:
+                self.__fingerprint = fingerprint(self.__data)
 
-    def float_list(
-        self,
-        key: str,
-        default_value: Union[list[Union[float, int]], None] = None
-    ) -> Union[list[float], None]:
+    def contains(self, key: str) -> bool:
         """
-        Gets a list of floats from the data.
+        Checks if a key exists in the data dictionary.
 
         Parameters
         ----------
         key : str
-            The key to the configuration key.
-        default_value : list of float, optional
-            The default value to return if the key is not found.
+            The key to search for in the data dictionary.
 
         Returns
         -------
-        list of float
-            The list of float values associated with the given key key,
-              or `None` if the key is not found.
-
-        Raises
-        ------
-        TypeError
-            If `key` is not a string or `default_value` is not a list of numbers.
+        bool
+            True if the key exists in the dictionary, False otherwise.
         """
-        if not self.__validate_key_and_default(key, default_value, list[Union[float, int]]):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a list of numbers.")
-
-        entry = self.__handle_get(key.split("."), self.data, default_value)
+        if self.__pending:
+            self.load()
 
-        if isinstance(entry, list):
-            float_list = []
-
-            # Converting values to floats
-            for item in entry:
-                if isinstance(item, (float, int)):
-                    float_list.append(float(item))
-
-                else:
-                    string = str(item)
+        return key in self.__data
 
-                    if re.search(r"^-?\d+(\.\d+)?$", string):
-                        float_list.append(float(string))
-
-                    else:
-                        float_list.append(0.0)
-
-            return float_list
-
-        if default_value is not None:
-            self.set(key, default_value)
-            return default_value
-
-        return None
-
-    def int_list(
-        self,
-        key: str,
-        default_value: Union[list[Union[int, float]], None] = None
-    ) -> Union[list[int], None]:
+    def set(self, key: str, value: any) -> None:
         """
-        Retrieves a list of integers from the data.
-
-        This method processes the provided key to get a list of integers from the configuration.
-        If the values are not integers, they will be converted when possible.
-        If the value is not found, the `default_value` will be returned or set.
+        Sets, modifies, or deletes values in the configuration.
 
         Parameters
         ----------
         key : str
-            The key to the configuration key, separated by dots.
-        default_value : list, optional
-            The default value to return if the key is not found (default is None).
-
-        Returns
-        -------
-        list of int
-            A list of integers retrieved from the data.
+            The configuration key, separated by dots.
+        value : Any
+            The value to set. If None, the key will be deleted.
 
         Raises
         ------
         TypeError
-            If `key` is not a string or `default_value` is not a list.
+            If `key` is not a string or is an empty string.
         """
-        if not self.__validate_key_and_default(key, default_value, list[Union[int, float]]):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a list of numbers.")
+        if isinstance(key, str) and len(key) > 0:
+            self._store(key, value)
+        else:
+            raise TypeError("Key must be a non-empty string.")
 
-        entry = self.__handle_get(key.split("."), self.data, default_value)
+    def set_many(self, mapping: dict) -> None:
+        """
+        Sets, modifies, or deletes many values in the configuration, in order.
 
-        if isinstance(entry, list):
-            int_list = []
+        This is equivalent to calling `set()` for each item, but the parents shared by
+        consecutive keys are only walked once. Every key is validated before any change.
 
-            # Converting values to integers
-            for item in entry:
-                if isinstance(item, (int, float)):
-                    int_list.append(int(item))
-                else:
-                    string = str(item)
+        Parameters
+        ----------
+        mapping : dict
+            The configuration keys, separated by dots, and their values. A value of None
+            deletes the key.
 
-                    if re.search(r"^-?\d+(.\d+)?$", string):
-                        int_list.append(int(string))
+        Raises
+        ------
+        TypeError
+            If `mapping` is not a dictionary or one of its keys is not a non-empty string.
+        """
+        if not isinstance(mapping, dict):
+            raise TypeError("mapping must be a dictionary.")
 
-                    else:
-                        int_list.append(0)
+        for key in mapping:
+            if not isinstance(key, str) or len(key) == 0:
+                raise TypeError("Keys must be non-empty strings.")
 
-            return int_list
+        if self.__pending:
+            self.load()
 
-        if default_value is not None:
-            self.set(key, default_value)
-            return default_value
+        if self.__sections is not None:
+            self.__require(*mapping)
 
-        return None
+        if key_path.set_many(self.__data, mapping.items(), self.__get_index()):
+            self.__dirty = True
+            self._forget_arrays()
 
-    def bool_list(
-        self,
-        key: str,
-        default_value: Union[list[bool], None] = None
-    ) -> Union[list[bool], None]:
+    @contextmanager
+    def transaction(self, save: bool = True) -> Iterator[dict]:
         """
-        Retrieves a list of booleans from the data.
+        Buffers changes to the configuration and applies them together.
 
-        This method processes the provided key to get a list of booleans from the configuration.
-        Values are converted to booleans based on their types (integers, floats, etc.).
+        The context manager yields a dictionary which maps configuration keys, separated
+        by dots, to their new values, None deleting the key. When the block exits normally,
+        the changes are applied like `set_many()` and the file is saved once. If the block
+        raises, nothing is applied. If applying or saving fails, the changes already
+        applied are undone in memory, restoring the dictionaries they changed in place with
+        their keys in their original order, without copying the rest of the data.
 
         Parameters
         ----------
-        key : str
-            The key to the configuration key, separated by dots.
-        default_value : list, optional
-            The default value to return if the key is not found (default is None).
+        save : bool, optional
+            If True, the file is saved after the changes are applied (default is True).
 
-        Returns
-        -------
-        list of bool
-            A list of boolean values retrieved from the data.
+        Yields
+        ------
+        dict
+            The dictionary the changes are buffered in.
 
         Raises
         ------
         TypeError
-            If `key` is not a string or `default_value` is not a list.
+            If `save` is not a boolean, or one of the buffered keys is not a non-empty string.
         """
-        if not self.__validate_key_and_default(key, default_value, list):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a list.")
+        if not isinstance(save, bool):
+            raise TypeError("save must be a boolean.")
 
-        entry = self.__handle_get(key.split("."), self.data, default_value)
+        changes = {}
+        yield changes
 
-        if isinstance(entry, list):
-            bool_list = []
+        for key in changes:
+            if not isinstance(key, str) or len(key) == 0:
+                raise TypeError("Keys must be non-empty strings.")
 
-            # Converting values to booleans
-            for item in entry:
-                if isinstance(item, bool):
-                    bool_list.append(bool(item))
+        self.__apply(changes, save)
 
-                else:
-                    bool_list.append(str(item).lower() == "true")
-
-            return bool_list
-
-        if default_value is not None:
-
-            self.set(key, default_value)
-            return default_value
-
-        return None
-
-    def dictionary(
-        self,
-        key: str,
-        default_value: Union[dict, None] = None
-    ) -> Union[dict, None]:
+    def __apply(self, changes: dict, save: bool) -> None:
         """
-        Retrieves a dictionary from the data.
-
-        This method processes the provided key to get a dictionary from the configuration. 
-        If the dictionary is not found, the `default_value` will be returned or set.
+        Applies the changes of a transaction and saves the file, undoing them on failure.
 
         Parameters
         ----------
-        key : str
-            The key to the configuration key, separated by dots.
-        default_value : dict, optional
-            The default value to return if the key is not found (default is None).
-
-        Returns
-        -------
-        dict
-            A dictionary retrieved from the data.
-
-        Raises
-        ------
-        TypeError
-            If `key` is not a string or `default_value` is not a dictionary.
+        changes : dict
+            The configuration keys, separated by dots, and their new values.
+        save : bool
+            If True, the file is saved after the changes are applied.
         """
-        if not self.__validate_key_and_default(key, default_value, dict):
-            raise TypeError(
-                "Key must be a non-empty string, and default_value must be a dictionary.")
+        if self.__pending:
+            self.load()
 
-        result = self.__handle_get(key.split("."), self.data, default_value)
+        if self.__sections is not None:
+            self.__require(*changes)
 
-        if isinstance(result, dict):
-            return result
+        # The state of the data before the changes, which a failed save may have changed
+        dirty = self.__dirty
+        saved_print = self.__fingerprint
+        undo = {}
 
-        if default_value is not None:
+        try:
+            if key_path.set_many(self.__data, changes.items(), self.__get_index(), undo):
+                self.__dirty = True
+                self._forget_arrays()
 
-            self.set(key, default_value)
-            return default_value
+            if save:
+                self.save()
 
-        return None
+        except BaseException:
+            key_path.rollback(undo)
+            self._forget_lookups()
+            self.__dirty = dirty
+            self.__fingerprint = saved_print
+            raise
 
-    def __validate_key_and_default(
-        self,
-        key: str,
-        default_value: any,
-        expected_type: Union[type, tuple[type, type]]
-    ) -> bool:
+    def _lookup(self, key: str) -> any:
         """
-        Validates the key and default value.
+        Gets the value at a key, loading the file and decoding its section if needed.
 
         Parameters
         ----------
         key : str
-            The key to validate.
-        default_value : any
-            The default value to validate.
-        expected_type : type or tuple of types
-            The expected type or types of the default value.
+            The configuration key, separated by dots.
 
         Returns
         -------
-        bool
-            True if the key and default value are valid, False otherwise.
+        Any
+            The value, or `MISSING` if the key is not found.
         """
-        return (isinstance(key, str) and len(key) > 0 and
-                (isinstance(default_value, expected_type) or default_value is None))
+        if self.__pending:
+            self.load()
+
+        if self.__sections is not None:
+            self.__require(key)
 
-    def __generete_new_tree(
-        self,
-        parent: list,
-        value: any
-    ) -> dict:
+        return key_path.get_path(self.__data, key, self.__get_index())
+
+    def _lookup_many(self, keys: Iterable[str]) -> list:
         """
-        Creates a new configuration tree structure.
+        Gets the values at many keys in a single walk of the data, loading the file and
+        decoding their sections if needed.
 
         Parameters
         ----------
-        tree : list
-            List representing the tree structure of keys.
-        value : Any
-            The value to assign to the last key in the tree.
+        keys : Iterable[str]
+            The configuration keys, separated by dots.
 
         Returns
         -------
-        dict
-            A new dictionary with the nested structure.
+        list
+            The values, `MISSING` for the keys that are not found.
         """
-        new_dict = {}
-
-        if len(parent) == 1:
-            new_dict[parent[0]] = value
-
-        else:
-            new = {parent[-1]: value}
+        if self.__pending:
+            self.load()
 
-            for x in range(len(parent) - 2, -1, -1):
-                new = {parent[x]: new}
+        if self.__sections is not None:
+            self.__require(*keys)
 
-            new_dict[parent[0]] = new
+        return key_path.get_many(self.__data, keys, self.__get_index())
 
-        return new_dict
-
-    def __update_dict(
-        self,
-        tree: list,
-        dictionary: dict,
-        value: any
-    ) -> dict:
+    def __get_index(self) -> Union[key_path.KeyIndex, None]:
         """
-        Processes setting values in the configuration tree.
-
-        Parameters
-        ----------
-        tree : list
-            The list representing the tree structure of keys.
-        dictionary : dict
-            The current dictionary where the value should be set.
-        value : Any
-            The value to be set. If None, the key will be deleted.
+        Gets the flat key index, building it if needed.
 
         Returns
         -------
-        dict
-            The updated dictionary.
+        KeyIndex or None
+            The flat key index, or `None` if the index is disabled.
         """
-        if tree[0] in dictionary:
-
-            dictionary[tree[0]] = self.__update_existing_key(
-                tree, dictionary, value)
-
-        elif value is not None:
+        if not self.key_index:
+            return None
 
-            dictionary[tree[0]] = self.__create_new_key(tree, value)
+        if self.__sections is not None:
+            self._decode_sections()
 
-        return dictionary
+        return self._flat_index(self.__data)
 
-    def __update_existing_key(
-        self,
-        tree: list,
-        dictionary: dict,
-        value: any
-    ) -> any:
+    def _store(self, key: str, value: any) -> None:
         """
-        Updates the value for an existing key in the configuration tree.
-
-        This method recursively traverses the configuration tree and updates the 
-        specified key with the provided value. If the value is `None`, the key 
-        is deleted from the dictionary. If the key points to a non-dictionary 
-        value, a new tree is generated.
+        Sets or deletes the value at a dotted key, marking the data dirty if it changed.
 
         Parameters
         ----------
-        tree : list
-            A list representing the hierarchy of keys in the configuration tree.
-        dictionary : dict
-            The dictionary where the key-value pair is being updated.
-        value : any
-            The new value to set. If `None`, the key will be deleted.
-
-        Returns
-        -------
-        any
-            The updated value for the specified key, or the new sub-tree if applicable.
+        key : str
+            The configuration key, separated by dots.
+        value : Any
+            The value to be set. If None, the key will be deleted.
         """
-        if len(tree) == 1:
-            return value if value is not None else dictionary.pop(tree[0])
-
-        if not isinstance(dictionary[tree[0]], dict):
-            return self.__generete_new_tree(tree[1:], value)
+        self._require_write()
 
-        dictionary[tree[0]] = self.__update_dict(
-            tree[1:], dictionary[tree[0]], value)
+        if self.__pending:
+            self.load()
 
-        if len(dictionary[tree[0]]) == 0:
-            del dictionary[tree[0]]
+        if self.__sections is not None:
+            self.__require(key)
 
-        return dictionary[tree[0]]
+        if key_path.set_path(self.__data, key, value, self.__get_index()):
+            self.__dirty = True
+            self._forget_arrays(key)
 
-    def __create_new_key(
-        self,
-        tree: list,
-        value: any
-    ) -> any:
-        """
-        Creates a new key in the configuration tree with the provided value.
 
-        This method generates a new tree structure for the given key path and 
-        sets the specified value at the leaf node of the tree.
-
-        Parameters
-        ----------
-        tree : list
-            A list representing the hierarchy of keys to create in the configuration tree.
-        value : any
-            The value to set at the new key.
-
-        Returns
-        -------
-        any
-            The generated sub-tree with the new key-value pair.
-        """
-        if len(tree) == 1:
-            return value
+def prefetch(
+    files: Iterable[FileController],
+    max_workers: Union[int, None] = None
+) -> None:
+    """
+    Loads many lazily opened files in parallel.
 
-        return self.__generete_new_tree(tree[1:], value)
+    The files are read by a pool of threads, so reading them from disk overlaps. Files
+    that were already loaded are skipped.
 
-    def __handle_get(
-        self,
-        tree: list[str],
-        dictionary: dict,
-        default_value: Union[any, None]
-    ) -> Union[any, None]:
-        """
-        Internal method to process getting values from the configuration.
+    Parameters
+    ----------
+    files : Iterable[FileController]
+        The files to load.
+    max_workers : int, optional
+        The maximum number of threads (default is the `ThreadPoolExecutor` default).
+
+    Raises
+    ------
+    TypeError
+        If one of the files is not a FileController.
+    OSError
+        If one of the files cannot be read, after every other file was loaded.
+    ValueError
+        If the content of one of the files is not valid, after every other file was loaded.
+    """
+    pending = []
 
-        Parameters
-        ----------
-        tree : list
-            The list representing the tree structure of keys.
-        dictionary : dict
-            The current dictionary where the value should be fetched from.
-        default_value : Any
-            The default value to return if the key is not found.
+    for file in files:
+        if not isinstance(file, FileController):
+            raise TypeError("files must only contain FileControllers.")
 
-        Returns
-        -------
-        Any
-            The value associated with the given key path.
-        """
-        if tree[0] in dictionary:
-            if len(tree) == 1:
-                return dictionary[tree[0]]
+        if not file.is_loaded:
+            pending.append(file)
 
-            if not isinstance(dictionary[tree[0]], dict):
-                print(f"ERROR: {tree[0]} is not a configuration tree.")
-                return None
+    if not pending:
+        return
 
-            return self.__handle_get(tree[1:], dictionary[tree[0]], default_value)
+    # Only imported here, as it is slow to import and rarely needed
+    from concurrent.futures import ThreadPoolExecutor  # pylint: disable=import-outside-toplevel
 
-        if default_value is not None:
-            self.__update_dict(tree, dictionary, default_value)
-            return default_value
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(file.load) for file in pending]
 
-        return None
+    for future in futures:
+        future.result()
@@ -0,0 +1,113 @@
+"""
+file_lock.py
+
+This module provides the advisory locks shared by the processes saving and reloading a file.
+
+Functions:
+    lock_path: Gets the path of the lock file of a file.
+    locked: Holds the shared or exclusive advisory lock of a file.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, Union
+import os
+import time
+
+try:
+    import fcntl
+
+except ImportError:
+    # Not available on Windows, where no lock is taken
+    fcntl = None
+
+# The first and the longest delay between two attempts to take a busy lock, in seconds
+_FIRST_DELAY = 0.001
+_MAX_DELAY = 0.05
+
+
+def lock_path(file_path: str) -> str:
+    """
+    Gets the path of the lock file of a file, next to the file it points to.
+
+    As files are saved by renaming a new file over them, the lock is taken on a separate
+    file, which is never removed, rather than on the file itself.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file.
+
+    Returns
+    -------
+    str
+        The path of the lock file.
+    """
+    directory, name = os.path.split(os.path.realpath(file_path))
+    return os.path.join(directory, f".{name}.lock")
+
+
+@contextmanager
+def locked(
+    file_path: str,
+    exclusive: bool,
+    timeout: Union[float, None] = None
+) -> Iterator[None]:
+    """
+    Holds the advisory lock of a file for the duration of a `with` block.
+
+    The lock is shared by the readers, or held by a single writer, across every process
+    and thread locking the same file. It is only advisory: processes which do not take it
+    are not blocked. On platforms without `fcntl`, such as Windows, no lock is taken.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file.
+    exclusive : bool
+        True to hold the lock alone, to write the file, False to share it, to read the file.
+    timeout : float, optional
+        The maximum number of seconds to wait for the lock (default is None, no limit).
+
+    Raises
+    ------
+    TimeoutError
+        If the lock was not taken within `timeout` seconds.
+    OSError
+        If the lock file cannot be opened.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    # Read access is enough to lock the file, so users who cannot write it can share it
+    descriptor = os.open(lock_path(file_path), os.O_RDONLY | os.O_CREAT, 0o666)
+
+    try:
+        mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+        if timeout is None:
+            fcntl.flock(descriptor, mode)
+
+        else:
+            deadline = time.monotonic() + timeout
+            delay = _FIRST_DELAY
+
+            while True:
+                try:
+                    fcntl.flock(descriptor, mode | fcntl.LOCK_NB)
+                    break
+
+                except BlockingIOError:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        raise TimeoutError(f"Timed out locking {file_path}") from None
+
+                    time.sleep(min(delay, remaining))
+                    delay = min(delay * 2, _MAX_DELAY)
+
+        yield
+
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(descriptor)
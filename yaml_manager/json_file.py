@@ -7,11 +7,11 @@ Classes:
     JSONFile: Extends FileController to handle JSON file operations.
 """
 
-from pathlib import Path
-import os
+from typing import TextIO, Union
 import json
 
 from yaml_manager.file_controller import FileController
+from yaml_manager.json_index import JSONIndex
 
 
 class JSONFile(FileController):
@@ -27,44 +27,105 @@ class JSONFile(FileController):
         The path to the JSON file.
     data : dict
         A dictionary containing the data loaded from the JSON file.
+    lazy_sections : int
+        The depth of the keys whose values are decoded on first access, 0 if the whole
+        file is decoded when it is loaded.
     """
 
     __version__ = "1.2.4"
 
-    def reload(self) -> None:
+    def __init__(
+        self,
+        file_path: str,
+        lazy: Union[bool, None] = None,
+        lazy_sections: int = 0
+    ) -> None:
         """
-        Loads the data from the JSON file into `self.data`.
+        Initializes the JSONFile instance.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the JSON file to be managed.
+        lazy : bool, optional
+            If True, the file is only parsed when its data is first accessed
+            (default is `FileController.default_lazy`).
+        lazy_sections : int, optional
+            0 (default) to decode the whole file when it is loaded, 1 to map the file into
+            memory and only decode the value of a top-level key when it is first accessed,
+            2 to do so for the keys of the top-level objects too.
 
-        This method reads the JSON file specified by `file_path`
-        and loads the content into the `data` attribute.
+        Raises
+        ------
+        TypeError
+            If file_path is not a string, lazy is not a boolean, or lazy_sections is not
+            0, 1 or 2.
+        """
+        if isinstance(lazy_sections, bool) or lazy_sections not in (0, 1, 2):
+            raise TypeError("lazy_sections must be 0, 1 or 2.")
+
+        self.lazy_sections = lazy_sections
+
+        super().__init__(file_path, lazy)
+
+    def _index_sections(self, content: Union[bytes, None]) -> Union[JSONIndex, None]:
+        """
+        Indexes the keys of the JSON file if `lazy_sections` is not 0.
+
+        Parameters
+        ----------
+        content : bytes or None
+            The content of the file, or None to map the file into memory.
+
+        Returns
+        -------
+        JSONIndex or None
+            The index of the file, or None if the file is decoded entirely.
 
         Raises
         ------
         json.JSONDecodeError
-            If the file content is not valid JSON.
-        FileNotFoundError
-            If the file does not exist.
+            If the structure of the file is not valid JSON.
         """
-        with open(self.file_path, 'r', encoding="utf-8") as file:
-            self.data = json.load(file)
+        if self.lazy_sections == 0:
+            return None
+
+        if content is None:
+            return JSONIndex.open(self.file_path, self.lazy_sections)
+
+        return JSONIndex(content, self.lazy_sections)
 
-    def save(self) -> None:
+    def _load_data(self, file: TextIO) -> dict:
         """
-        Saves the data from `self.data` back to the JSON file.
+        Parses the content of the JSON file.
 
-        This method writes the content of `self.data` to the JSON file specified by `file_path`.
-        If the directory for the file does not exist, it creates the necessary directories.
+        Parameters
+        ----------
+        file : TextIO
+            The JSON file opened for reading.
+
+        Returns
+        -------
+        dict
+            The parsed data.
 
         Raises
         ------
-        OSError
-            If there is an error in creating directories or writing to the file.
+        json.JSONDecodeError
+            If the file content is not valid JSON.
         """
-        i = self.file_path.rfind("/")
-
-        if i > -1 and not Path(self.file_path[:i]).exists():
-            os.makedirs(self.file_path[:i], 0o666)
+        return json.load(file)
 
-        with open(self.file_path, 'w', encoding="utf-8") as file:
-            file.write(json.dumps(self.data, ensure_ascii=False,
-                       allow_nan=False, indent="\t"))
+    def _dump_data(self, data: dict, file: TextIO) -> None:
+        """
+        Serializes data into the JSON file.
+
+        Parameters
+        ----------
+        data : dict
+            The data to serialize.
+        file : TextIO
+            The JSON file opened for writing.
+        """
+        file.write(json.dumps(data, ensure_ascii=False,
+                   allow_nan=False, indent="\t"))
@@ -0,0 +1,345 @@
+"""
+json_index.py
+
+This module provides the index of the sections of a JSON file, used to decode them on
+first access.
+
+Classes:
+    JSONIndex: Indexes the byte spans of the top-level, and optionally second-level, keys of
+        a JSON file, and decodes their values on demand.
+"""
+
+from typing import Union
+import json
+import mmap
+import os
+import re
+
+from yaml_manager.sections import UNDECODED, Sections
+
+# The pattern of a string
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# The pattern of the characters between strings and brackets
+_OTHER_PATTERN = rb'[^"\[\]{}]*'
+
+
+def _nested_pattern(levels: int) -> bytes:
+    """
+    Builds the pattern of an array or object holding at most `levels` levels of brackets.
+    """
+    pattern = None
+
+    for _ in range(levels):
+        inner = _STRING_PATTERN if pattern is None else _STRING_PATTERN + b"|" + pattern
+        pattern = (rb'[\[{]' + _OTHER_PATTERN + rb'(?:(?:' + inner + rb')' + _OTHER_PATTERN +
+                   rb')*[\]}]')
+
+    return pattern
+
+
+# Skips everything up to the next bracket outside of a string
+_SKIP = re.compile(_OTHER_PATTERN + rb'(?:' + _STRING_PATTERN + _OTHER_PATTERN + rb')*',
+                   re.DOTALL)
+
+# Matches a string
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+
+# Matches an array or object, unless it is nested deeper, in one call
+_NESTED = re.compile(_nested_pattern(8), re.DOTALL)
+
+# Matches a number, true, false or null, or the NaN and infinities accepted by json.loads
+_SCALAR = re.compile(rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|'
+                     rb'NaN|-?Infinity')
+
+# Matches the whitespace between the tokens
+_SPACE = re.compile(rb'[ \t\n\r]*')
+
+
+class JSONIndex(Sections):
+    """
+    Indexes the byte spans of the top-level, and optionally second-level, keys of a JSON
+    file, and decodes their values on demand.
+
+    The file is scanned once, skipping strings and nested values with regular expressions,
+    and each value is decoded with `json.loads` when it is first accessed. A file whose
+    content is not an object has no sections, and is decoded entirely.
+    """
+
+    def __init__(
+        self,
+        buffer: Union[bytes, mmap.mmap],
+        depth: int,
+        file: any = None
+    ) -> None:
+        """
+        Indexes the content of a JSON file.
+
+        Parameters
+        ----------
+        buffer : bytes or mmap.mmap
+            The content of the file.
+        depth : int
+            1 to index the top-level keys, 2 to also index the keys of the top-level objects.
+        file : BinaryIO, optional
+            The file mapped by `buffer`, closed by `close()` and checked before decoding.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the structure of the file is not valid JSON.
+        """
+        self.__buffer = buffer
+        self.__file = file
+        self.__stat = None if file is None else JSONIndex.__stat_of(file)
+
+        paths = {}
+        pos = _SPACE.match(buffer, 0).end()
+
+        if buffer[pos:pos + 1] == b"{":
+            data, pos = self.__index_object(pos, (), depth, paths)
+            pos = _SPACE.match(buffer, pos).end()
+
+            if pos != len(buffer):
+                raise self.__error("Extra data", pos)
+
+        else:
+            data = json.loads(buffer[:])
+
+        super().__init__(data, paths, depth)
+
+    @classmethod
+    def open(cls, file_path: str, depth: int) -> "JSONIndex":
+        """
+        Maps a JSON file into memory and indexes it.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the JSON file.
+        depth : int
+            1 to index the top-level keys, 2 to also index the keys of the top-level objects.
+
+        Returns
+        -------
+        JSONIndex
+            The index of the file.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be read.
+        json.JSONDecodeError
+            If the structure of the file is not valid JSON.
+        """
+        # pylint: disable=consider-using-with
+        file = open(file_path, "rb")
+
+        try:
+            if os.fstat(file.fileno()).st_size == 0:
+                return cls(b"", depth, file)
+
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), depth, file)
+
+        except BaseException:
+            file.close()
+            raise
+
+    @staticmethod
+    def __stat_of(file: any) -> tuple[int, int]:
+        """
+        Gets the mtime_ns and size of an open file.
+        """
+        stat = os.fstat(file.fileno())
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def __error(self, message: str, pos: int) -> json.JSONDecodeError:
+        """
+        Creates the error raised for invalid content at a position.
+        """
+        document = self.__buffer[:pos].decode("utf-8", "replace")
+        return json.JSONDecodeError(message, document, len(document))
+
+    def __index_object(
+        self,
+        pos: int,
+        path: tuple[str, ...],
+        depth: int,
+        paths: dict
+    ) -> tuple[dict, int]:
+        """
+        Indexes the keys of the object starting at a position.
+
+        Parameters
+        ----------
+        pos : int
+            The position of the opening brace.
+        path : tuple[str, ...]
+            The path of the object.
+        depth : int
+            The number of levels of keys still to index.
+        paths : dict
+            The paths of the sections mapped to their spans, updated with the keys.
+
+        Returns
+        -------
+        tuple
+            The skeleton of the object and the position after its closing brace.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the structure of the object is not valid JSON.
+        """
+        buffer = self.__buffer
+        node = {}
+        pos = _SPACE.match(buffer, pos + 1).end()
+
+        if buffer[pos:pos + 1] == b"}":
+            return node, pos + 1
+
+        while True:
+            match = _STRING.match(buffer, pos)
+
+            if match is None:
+                raise self.__error("Expecting property name enclosed in double quotes", pos)
+
+            key = match.group()
+
+            # Keys without escape sequences are decoded directly
+            key = key[1:-1].decode("utf-8") if b"\\" not in key else json.loads(key)
+            pos = _SPACE.match(buffer, match.end()).end()
+
+            if buffer[pos:pos + 1] != b":":
+                raise self.__error("Expecting ':' delimiter", pos)
+
+            pos = _SPACE.match(buffer, pos + 1).end()
+
+            if depth > 1 and buffer[pos:pos + 1] == b"{":
+                # A duplicate key replaces the value of the previous one, as in json.loads
+                paths.pop(path + (key,), None)
+                node[key], pos = self.__index_object(pos, path + (key,), depth - 1, paths)
+
+            else:
+                end = self.__value_end(pos)
+                paths[path + (key,)] = (pos, end)
+                node[key] = UNDECODED
+                pos = end
+
+            pos = _SPACE.match(buffer, pos).end()
+            char = buffer[pos:pos + 1]
+
+            if char == b"}":
+                return node, pos + 1
+
+            if char != b",":
+                raise self.__error("Expecting ',' delimiter", pos)
+
+            pos = _SPACE.match(buffer, pos + 1).end()
+
+    def __value_end(self, pos: int) -> int:
+        """
+        Finds the end of the value starting at a position, without decoding it.
+
+        Parameters
+        ----------
+        pos : int
+            The position of the first character of the value.
+
+        Returns
+        -------
+        int
+            The position after the value.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If a string or a bracket is not closed, or the value is not a string, an
+            array, an object or a valid literal or number.
+        """
+        buffer = self.__buffer
+        char = buffer[pos:pos + 1]
+
+        if char == b'"':
+            match = _STRING.match(buffer, pos)
+
+            if match is None:
+                raise self.__error("Unterminated string starting at", pos)
+
+            return match.end()
+
+        if char not in (b"{", b"["):
+            match = _SCALAR.match(buffer, pos)
+
+            if match is None:
+                raise self.__error("Expecting value", pos)
+
+            return match.end()
+
+        match = _NESTED.match(buffer, pos)
+
+        if match is not None:
+            return match.end()
+
+        # Values nested deeper are walked one bracket at a time
+        start = pos
+        depth = 0
+
+        while True:
+            pos = _SKIP.match(buffer, pos).end()
+            char = buffer[pos:pos + 1]
+
+            if char in (b"{", b"["):
+                depth += 1
+
+            elif char in (b"}", b"]"):
+                depth -= 1
+
+            elif char == b'"':
+                raise self.__error("Unterminated string starting at", pos)
+
+            else:
+                raise self.__error("Unterminated value starting at", start)
+
+            pos += 1
+
+            if depth == 0:
+                return pos
+
+    def decode(self, path: tuple[str, ...]) -> any:
+        """
+        Decodes the value of a section.
+
+        Parameters
+        ----------
+        path : tuple[str, ...]
+            The path of the section.
+
+        Returns
+        -------
+        Any
+            The decoded value.
+
+        Raises
+        ------
+        OSError
+            If the mapped file was modified in place since it was indexed.
+        json.JSONDecodeError
+            If the value is not valid JSON.
+        """
+        if self.__file is not None and JSONIndex.__stat_of(self.__file) != self.__stat:
+            raise OSError(f"{self.__file.name} was modified since it was indexed, "
+                          "reload it to read its sections.")
+
+        start, end = self.paths[path]
+        return json.loads(self.__buffer[start:end])
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+        if self.__file is not None:
+            self.__file.close()
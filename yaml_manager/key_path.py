@@ -0,0 +1,616 @@
+"""
+key_path.py
+
+This module provides the compiled key path cache shared by every FileController.
+
+Functions:
+    compile_key: Splits a dotted configuration key into a cached tuple of keys.
+    key_cache_info: Gets the statistics of the cache.
+    set_key_cache_size: Replaces the cache by an empty one of the given size.
+    clear_key_cache: Empties the cache.
+    get_path: Gets the value at a dotted key of a configuration tree.
+    get_many: Gets the values at many dotted keys of a configuration tree.
+    set_path: Sets or deletes the value at a dotted key of a configuration tree.
+    set_many: Sets or deletes the values of many dotted keys of a configuration tree.
+    rollback: Undoes the changes recorded by set_many.
+
+Classes:
+    KeyIndex: A flat index of every dotted key of a configuration tree.
+"""
+
+from typing import Iterable, Union
+from functools import lru_cache
+
+# Returned by get_path when a key is not found
+MISSING = object()
+
+# Default number of compiled key paths kept in the shared cache
+KEY_CACHE_SIZE = 4096
+
+
+def _split_key(key: str) -> tuple[str, ...]:
+    """
+    Splits a dotted configuration key into its immutable key path.
+
+    Parameters
+    ----------
+    key : str
+        The configuration key, separated by dots.
+
+    Returns
+    -------
+    tuple of str
+        The keys of each level of the configuration tree.
+    """
+    return tuple(key.split("."))
+
+
+# Bounded LRU of compiled key paths, shared by all the FileController instances
+compile_key = lru_cache(maxsize=KEY_CACHE_SIZE)(_split_key)
+
+
+def key_cache_info() -> tuple:
+    """
+    Gets the statistics of the shared compiled key path cache.
+
+    Returns
+    -------
+    functools._CacheInfo
+        A named tuple with the `hits`, `misses`, `maxsize` and `currsize` of the cache.
+    """
+    return compile_key.cache_info()
+
+
+def set_key_cache_size(maxsize: int) -> None:
+    """
+    Replaces the shared compiled key path cache by an empty one of the given size.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of key paths kept in the cache.
+
+    Raises
+    ------
+    TypeError
+        If `maxsize` is not a positive integer.
+    """
+    if not isinstance(maxsize, int) or isinstance(maxsize, bool) or maxsize < 1:
+        raise TypeError("maxsize must be a positive integer.")
+
+    global compile_key  # pylint: disable=global-statement
+    compile_key = lru_cache(maxsize=maxsize)(_split_key)
+
+
+def clear_key_cache() -> None:
+    """
+    Removes every key path from the shared compiled key path cache and resets its statistics.
+    """
+    compile_key.cache_clear()
+    _plan.cache_clear()
+
+
+
+def new_tree(
+    tree: tuple[str, ...],
+    start: int,
+    value: any
+) -> any:
+    """
+    Creates the nested structure for the keys of `tree` from `start` onwards.
+
+    Parameters
+    ----------
+    tree : tuple of str
+        The compiled key path.
+    start : int
+        The index of the first key of the new structure.
+    value : Any
+        The value to assign to the last key in the tree.
+
+    Returns
+    -------
+    Any
+        The new nested dictionary, or `value` itself if `start` is past the last key.
+    """
+    for i in range(len(tree) - 1, start - 1, -1):
+        value = {tree[i]: value}
+
+    return value
+
+
+def get_path(
+    data: dict,
+    key: str,
+    index: Union["KeyIndex", None] = None
+) -> any:
+    """
+    Gets the value at a dotted key of a configuration tree.
+
+    Parameters
+    ----------
+    data : dict
+        The root of the configuration tree.
+    key : str
+        The configuration key, separated by dots.
+    index : KeyIndex, optional
+        The flat index of `data`, probed before walking the tree.
+
+    Returns
+    -------
+    Any
+        The value at the key, `MISSING` if the key is not found, or `None` if one of its
+        parents is not a dictionary.
+    """
+    if index is not None:
+        entry = index.get(key)
+
+        if entry is not None:
+            return entry[0]
+
+    tree = compile_key(key)
+    node = data
+    last = len(tree) - 1
+
+    for i in range(last + 1):
+        if tree[i] not in node:
+            return MISSING
+
+        if i == last:
+            return node[tree[i]]
+
+        node = node[tree[i]]
+
+        if not isinstance(node, dict):
+            print(f"ERROR: {tree[i]} is not a configuration tree.")
+            return None
+
+    return None
+
+
+def get_many(
+    data: dict,
+    keys: list[str],
+    index: Union["KeyIndex", None] = None
+) -> list:
+    """
+    Gets the values at many dotted keys of a configuration tree, like successive `get_path`
+    calls.
+
+    The keys are grouped by parent in a plan cached for the same list of keys. Each parent
+    is walked once, reusing the dictionaries reached by the parent before it, and each key
+    is then a single lookup in its parent.
+
+    Parameters
+    ----------
+    data : dict
+        The root of the configuration tree.
+    keys : list of str
+        The configuration keys, separated by dots.
+    index : KeyIndex, optional
+        The flat index of `data`, probed before walking the tree.
+
+    Returns
+    -------
+    list
+        The values at the keys, in the order of `keys`, with `MISSING` for the keys that
+        are not found and `None` for the keys with a parent that is not a dictionary.
+    """
+    if index is not None:
+        entries = list(map(index.get, keys))
+
+        if None not in entries:
+            return [entry[0] for entry in entries]
+
+    values = [MISSING] * len(keys)
+    stack = [data]
+    previous = ()
+
+    for parent, children in _plan(tuple(keys)):
+        depth = 0
+        limit = min(len(previous), len(parent), len(stack) - 1)
+
+        while depth < limit and parent[depth] == previous[depth]:
+            depth += 1
+
+        del stack[depth + 1:]
+        node = stack[-1]
+        previous = parent
+
+        for name in parent[depth:]:
+            if name not in node:
+                node = None
+                break
+
+            node = node[name]
+
+            if not isinstance(node, dict):
+                for position, _ in children:
+                    print(f"ERROR: {name} is not a configuration tree.")
+                    values[position] = None
+
+                node = None
+                break
+
+            stack.append(node)
+
+        if node is not None:
+            for position, name in children:
+                values[position] = node.get(name, MISSING)
+
+    return values
+
+
+@lru_cache(maxsize=256)
+def _plan(keys: tuple[str, ...]) -> tuple:
+    """
+    Groups dotted keys by parent for `get_many`.
+
+    Parameters
+    ----------
+    keys : tuple of str
+        The configuration keys, separated by dots.
+
+    Returns
+    -------
+    tuple
+        The compiled key path of each parent, in sorted order, paired with a tuple of the
+        position in `keys` and last key of each of its children.
+    """
+    groups = {}
+
+    for position, key in enumerate(keys):
+        tree = compile_key(key)
+        groups.setdefault(tree[:-1], []).append((position, tree[-1]))
+
+    return tuple((parent, tuple(groups[parent])) for parent in sorted(groups))
+
+
+def set_path(
+    data: dict,
+    key: str,
+    value: any,
+    index: Union["KeyIndex", None] = None
+) -> bool:
+    """
+    Sets or deletes the value at a dotted key of a configuration tree.
+
+    Intermediate keys that are missing or hold a non-dictionary value are replaced
+    by new dictionaries. Deleting a key also removes the parents it leaves empty.
+
+    Parameters
+    ----------
+    data : dict
+        The root of the configuration tree.
+    key : str
+        The configuration key, separated by dots.
+    value : Any
+        The value to be set. If None, the key will be deleted.
+    index : KeyIndex, optional
+        The flat index of `data`, kept up to date.
+
+    Returns
+    -------
+    bool
+        True if the tree was changed, False if the key to delete did not exist.
+    """
+    return _set_from([data], compile_key(key), value, index, None)
+
+
+def set_many(
+    data: dict,
+    items: Iterable[tuple[str, any]],
+    index: Union["KeyIndex", None] = None,
+    undo: Union[list, None] = None
+) -> bool:
+    """
+    Sets or deletes the values of many dotted keys, in order, like successive `set_path` calls.
+
+    The dictionaries reached by the keys shared with the previous key are reused, so a
+    batch of keys under the same prefix walks that prefix only once.
+
+    Parameters
+    ----------
+    data : dict
+        The root of the configuration tree.
+    items : iterable of (str, Any)
+        The configuration keys, separated by dots, and their values. None deletes the key.
+    index : KeyIndex, optional
+        The flat index of `data`, kept up to date.
+    undo : dict, optional
+        A dictionary receiving the items of each dictionary of the tree before its first
+        change, needed by `rollback` to undo the changes.
+
+    Returns
+    -------
+    bool
+        True if the tree was changed.
+    """
+    changed = False
+    stack = [data]
+    previous = ()
+
+    for key, value in items:
+        tree = compile_key(key)
+        depth = 0
+        limit = min(len(previous), len(tree) - 1, len(stack) - 1)
+
+        while depth < limit and tree[depth] == previous[depth]:
+            depth += 1
+
+        del stack[depth + 1:]
+
+        if _set_from(stack, tree, value, index, undo):
+            changed = True
+
+        previous = tree
+
+    return changed
+
+
+def rollback(undo: dict) -> None:
+    """
+    Undoes the changes recorded by `set_many`, restoring each changed dictionary in place
+    with its items in their original order.
+
+    The flat index of the tree is not updated and must be rebuilt.
+
+    Parameters
+    ----------
+    undo : dict
+        The items of the changed dictionaries recorded by `set_many`.
+    """
+    for node, items in undo.values():
+        node.clear()
+        node.update(items)
+
+
+def _record(node: dict, undo: Union[dict, None]) -> None:
+    """
+    Records the items of a dictionary before its first change, if changes are recorded.
+
+    Only the dictionaries changed are copied, and only once, not the values they hold.
+    """
+    if undo is not None and id(node) not in undo:
+        undo[id(node)] = (node, list(node.items()))
+
+
+def _set_from(
+    stack: list,
+    tree: tuple[str, ...],
+    value: any,
+    index: Union["KeyIndex", None],
+    undo: Union[list, None]
+) -> bool:
+    """
+    Sets or deletes the value at a compiled key path, starting from the last dictionary
+    of `stack`.
+
+    Parameters
+    ----------
+    stack : list of dict
+        The dictionaries already reached for the first keys of `tree`, starting with
+        the root. It is updated with the dictionaries reached for `tree`.
+    tree : tuple of str
+        The compiled key path.
+    value : Any
+        The value to be set. If None, the key will be deleted.
+    index : KeyIndex or None
+        The flat index of the tree, kept up to date.
+    undo : dict or None
+        A dictionary receiving the items of the changed dictionaries, to undo the change.
+
+    Returns
+    -------
+    bool
+        True if the tree was changed, False if the key to delete did not exist.
+    """
+    if value is None:
+        return _delete_from(stack, tree, index, undo)
+
+    node = stack[-1]
+    last = len(tree) - 1
+
+    for i in range(len(stack) - 1, last):
+        child = node.get(tree[i], MISSING)
+
+        if not isinstance(child, dict):
+            _record(node, undo)
+            node[tree[i]] = new_tree(tree, i + 1, value)
+            last = i
+            old_value = child
+            break
+
+        stack.append(child)
+        node = child
+
+    else:
+        _record(node, undo)
+        old_value = node.get(tree[last], MISSING)
+        node[tree[last]] = value
+
+    if index is not None:
+        index.replace(tree, last, node, None if old_value is MISSING else old_value)
+
+    return True
+
+
+def _delete_from(
+    stack: list,
+    tree: tuple[str, ...],
+    index: Union["KeyIndex", None],
+    undo: Union[list, None]
+) -> bool:
+    """
+    Deletes the value at a compiled key path, starting from the last dictionary of
+    `stack`, and removes the parents it leaves empty.
+
+    Parameters
+    ----------
+    stack : list of dict
+        The dictionaries already reached for the first keys of `tree`, starting with
+        the root. It is updated with the dictionaries left after the deletion.
+    tree : tuple of str
+        The compiled key path.
+    index : KeyIndex or None
+        The flat index of the tree, kept up to date.
+    undo : dict or None
+        A dictionary receiving the items of the changed dictionaries, to undo the change.
+
+    Returns
+    -------
+    bool
+        True if the key was deleted, False if it did not exist.
+    """
+    node = stack[-1]
+    last = len(tree) - 1
+
+    for i in range(len(stack) - 1, last):
+        child = node.get(tree[i])
+
+        if not isinstance(child, dict):
+            return False
+
+        stack.append(child)
+        node = child
+
+    if tree[last] not in node:
+        return False
+
+    _record(node, undo)
+    old_value = node.pop(tree[last])
+
+    if index is not None:
+        index.remove(".".join(tree), old_value)
+
+    # Pruning the dictionaries left empty
+    for i in range(last - 1, -1, -1):
+        if len(node) > 0:
+            break
+
+        del stack[i + 1:]
+        node = stack[i]
+
+        _record(node, undo)
+        del node[tree[i]]
+
+        if index is not None:
+            index.pop(".".join(tree[:i + 1]), None)
+
+    return True
+
+
+class KeyIndex(dict):
+    """
+    Flat index of every dotted key of a configuration tree.
+
+    Maps each full dotted key to a `(value, parent)` tuple, where `parent` is the
+    dictionary holding the value. Keys that are not strings, or that contain dots,
+    cannot be reached by a dotted key and are left out.
+    """
+
+    def __init__(self, data: dict) -> None:
+        """
+        Builds the index of a configuration tree.
+
+        Parameters
+        ----------
+        data : dict
+            The root of the configuration tree.
+        """
+        super().__init__()
+
+        if isinstance(data, dict):
+            self.add_children("", data)
+
+    def add_children(
+        self,
+        prefix: str,
+        dictionary: dict
+    ) -> None:
+        """
+        Adds every key below a dictionary to the index.
+
+        Parameters
+        ----------
+        prefix : str
+            The dotted key of the dictionary, empty for the root.
+        dictionary : dict
+            The dictionary whose keys are indexed.
+        """
+        stack = [(prefix, dictionary)]
+
+        while stack:
+            prefix, parent = stack.pop()
+
+            for key, value in parent.items():
+                if not isinstance(key, str) or "." in key:
+                    continue
+
+                full_key = prefix + "." + key if prefix else key
+                self[full_key] = (value, parent)
+
+                if isinstance(value, dict):
+                    stack.append((full_key, value))
+
+    def remove(
+        self,
+        key: str,
+        value: any
+    ) -> None:
+        """
+        Removes a dotted key and everything below it from the index.
+
+        Parameters
+        ----------
+        key : str
+            The dotted key to remove.
+        value : Any
+            The value the key held.
+        """
+        self.pop(key, None)
+        stack = [(key, value)]
+
+        while stack:
+            prefix, parent = stack.pop()
+
+            if not isinstance(parent, dict):
+                continue
+
+            for child_key, child in parent.items():
+                if isinstance(child_key, str):
+                    full_key = prefix + "." + child_key
+                    self.pop(full_key, None)
+                    stack.append((full_key, child))
+
+    def replace(
+        self,
+        tree: tuple[str, ...],
+        depth: int,
+        parent: dict,
+        old_value: any
+    ) -> None:
+        """
+        Updates the index after the key of `tree` at `depth` was replaced.
+
+        Parameters
+        ----------
+        tree : tuple of str
+            The compiled key path.
+        depth : int
+            The index in `tree` of the replaced key.
+        parent : dict
+            The dictionary holding the replaced key.
+        old_value : Any
+            The value the key held before, or None.
+        """
+        key = ".".join(tree[:depth + 1])
+
+        if old_value is not None:
+            self.remove(key, old_value)
+
+        value = parent[tree[depth]]
+        self[key] = (value, parent)
+
+        if isinstance(value, dict):
+            self.add_children(key, value)
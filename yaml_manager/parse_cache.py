@@ -0,0 +1,132 @@
+"""
+parse_cache.py
+
+This module provides a persistent cache of parsed file data, so a file that did not change
+is not parsed again by the next process.
+
+Each source file has one entry in the cache directory, named after a hash of its absolute
+path. The entry holds the key it was stored with, the absolute path, mtime_ns and size
+of the source file and the settings of its loader, followed by the data, serialized with
+`marshal`, or with `pickle` when the data holds other types than the built-in ones.
+
+Functions:
+    load_entry: Gets the data cached for a file, if its key matches.
+    store_entry: Caches the data of a file, replacing its entry atomically.
+"""
+
+import hashlib
+import marshal
+import os
+import pickle
+import tempfile
+import warnings
+
+from yaml_manager.key_path import MISSING
+
+# The first byte of an entry, telling how it was serialized
+_MARSHAL = b"M"
+_PICKLE = b"P"
+
+
+def _entry_path(directory: str, file_path: str) -> str:
+    """
+    Gets the path of the cache entry of a file.
+    """
+    name = hashlib.blake2b(os.path.abspath(file_path).encode("utf-8"),
+                           digest_size=16).hexdigest()
+    return os.path.join(directory, name + ".cache")
+
+
+def load_entry(directory: str, file_path: str, key: tuple) -> any:
+    """
+    Gets the data cached for a file, if its key matches.
+
+    Parameters
+    ----------
+    directory : str
+        The cache directory.
+    file_path : str
+        The path to the source file.
+    key : tuple
+        The mtime_ns and size of the source file and the settings of its loader.
+
+    Returns
+    -------
+    Any
+        The cached data, or `MISSING` if there is no entry, or it is stale or corrupt.
+    """
+    try:
+        with open(_entry_path(directory, file_path), "rb") as file:
+            content = file.read()
+
+        if content[:1] == _MARSHAL:
+            entry = marshal.loads(content[1:])
+        elif content[:1] == _PICKLE:
+            entry = pickle.loads(content[1:])
+        else:
+            return MISSING
+
+    # A corrupt entry may raise about anything while being read
+    except Exception:  # pylint: disable=broad-exception-caught
+        return MISSING
+
+    if (not isinstance(entry, tuple) or len(entry) != 2 or
+            entry[0] != (os.path.abspath(file_path),) + key):
+        return MISSING
+
+    return entry[1]
+
+
+def store_entry(
+    directory: str,
+    file_path: str,
+    key: tuple,
+    data: dict
+) -> None:
+    """
+    Caches the data of a file, replacing its entry atomically.
+
+    The entry is written to a temporary file of the cache directory, which is then
+    renamed over the previous entry, so readers never see a partial entry. Errors are
+    reported as `RuntimeWarning` and otherwise ignored, the cache being only an optimization.
+
+    Parameters
+    ----------
+    directory : str
+        The cache directory, created if needed.
+    file_path : str
+        The path to the source file.
+    key : tuple
+        The mtime_ns and size of the source file and the settings of its loader.
+    data : dict
+        The parsed data.
+    """
+    entry = ((os.path.abspath(file_path),) + key, data)
+
+    try:
+        content = _MARSHAL + marshal.dumps(entry)
+
+    except ValueError:
+        try:
+            content = _PICKLE + pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            warnings.warn(f"Cannot cache the data of {file_path}: {error}", RuntimeWarning)
+            return
+
+    temp_path = None
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+
+        os.replace(temp_path, _entry_path(directory, file_path))
+
+    except OSError as error:
+        warnings.warn(f"Cannot write the parse cache of {file_path}: {error}", RuntimeWarning)
+
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,650 @@
+"""
+persistence.py
+
+This module provides the loading and saving of the file of a FileController.
+
+Classes:
+    Persistence: Adds parsing, saving, write-behind and file locking.
+"""
+
+from abc import ABCMeta, abstractmethod
+from contextlib import nullcontext
+from typing import ContextManager, Union, TextIO
+import io
+import os
+import threading
+
+from yaml_manager import file_lock, key_path
+from yaml_manager.background_writer import WRITER
+from yaml_manager.sections import Sections
+
+# The durability levels of the saves
+_DURABILITY = ("none", "file", "full")
+
+
+class Persistence(metaclass=ABCMeta):
+    """
+    Adds the parsing and saving of the file to a FileController, with the parse cache,
+    write-behind saves, durable writes and the advisory lock of the file.
+
+    The stat metadata of the file is recorded at each load or save, so that the file is
+    only parsed again when it changed, and only written when it or the data changed.
+    """
+
+    # Whether reload() hashes the file content, overridable per instance
+    content_hash = False
+
+    # Directory caching the parsed data across processes, None to disable, overridable
+    # per instance
+    parse_cache = None
+
+    # How saves reach the disk: "none" leaves it to the system, "file" syncs the new file
+    # before it replaces the old one and "full" also syncs the directory, overridable per
+    # instance
+    durability = "none"
+
+    # Whether saves and reloads take an advisory lock shared across processes, overridable
+    # per instance
+    file_lock = False
+
+    # Seconds saves and reloads wait for the lock, None to wait forever, overridable per
+    # instance
+    lock_timeout = None
+
+    # Seconds saves are coalesced for by new instances, None to write them immediately
+    default_write_behind = None
+
+    # The path to the file, set by the class using the mixin
+    file_path: str
+
+    def __init__(self) -> None:
+        """
+        Initializes the persistence of a file that was not loaded or saved yet.
+        """
+        self.__signature = None
+        self.__digest = None
+        self.__write_behind = None
+        self.__save_lock = threading.RLock()
+        self.__snapshots = 0
+        self.__written = 0
+        self.write_behind = self.default_write_behind
+        super().__init__()
+
+    @abstractmethod
+    def _load_data(self, file: TextIO) -> dict:
+        """
+        Abstract method for parsing the content of the file.
+        Must be implemented by subclasses.
+
+        Parameters
+        ----------
+        file : TextIO
+            The file opened for reading.
+
+        Returns
+        -------
+        dict
+            The parsed data.
+        """
+
+    @abstractmethod
+    def _dump_data(self, data: dict, file: TextIO) -> None:
+        """
+        Abstract method for serializing data into the file.
+        Must be implemented by subclasses.
+
+        Parameters
+        ----------
+        data : dict
+            The data to serialize.
+        file : TextIO
+            The file opened for writing.
+        """
+
+    def _cache_settings(self) -> tuple:
+        """
+        Gets the settings that change how the file is parsed, part of the key of its
+        `parse_cache` entry. Subclasses with parsing options extend them.
+
+        Returns
+        -------
+        tuple
+            The settings, made of strings, numbers and booleans.
+        """
+        return (self.__class__.__module__, self.__class__.__qualname__)
+
+    def _index_sections(  # pylint: disable=unused-argument
+        self,
+        content: Union[bytes, None]
+    ) -> Union[Sections, None]:
+        """
+        Indexes the sections of the file, so that each one is only decoded when it is
+        first accessed. Subclasses supporting it override this method.
+
+        Parameters
+        ----------
+        content : bytes or None
+            The content of the file, or None if it was not read yet.
+
+        Returns
+        -------
+        Sections or None
+            The index of the sections, or None (the default) to parse the whole file
+            with `_load_data`.
+        """
+        return None
+
+    def reload(self, force: bool = False, keep_changes: bool = False) -> bool:
+        """
+        Loads the data from the file into `self.data`.
+
+        The stat metadata (mtime_ns, size and inode) of the file is recorded at each load,
+        and the file is only parsed again when it changed or when the data was changed by
+        `set()`, a getter default or an assignment of `data`. If `content_hash` is True, a
+        file whose metadata changed but whose content hash did not is not parsed again either.
+        Direct changes to the dictionaries of `data` are not checked, use `force` to discard them.
+        With `keep_changes`, the file is only parsed when its metadata changed, and never
+        while the data has unsaved changes, which would be discarded.
+
+        If `parse_cache` is a directory, the parsed data is stored there, and a file whose
+        mtime_ns and size did not change since it was cached, by this or another process,
+        is read from the cache instead of being parsed. Stale or corrupt entries are ignored.
+        The cache may hold pickled data, so its directory must only be writable by trusted users.
+
+        If `file_lock` is True, the file is read under a lock shared with the other readers,
+        which waits for the saves of every process taking the lock.
+
+        In thread-safe mode, the file is read and parsed without the lock of the instance,
+        whose write access is only held to install the new data.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the file is parsed even if it did not change (default is False).
+        keep_changes : bool, optional
+            If True, the file is not parsed while the data has unsaved changes, including
+            direct changes to the dictionaries of `data` (default is False).
+
+        Returns
+        -------
+        bool
+            True if the file was parsed, False if it did not change or its unsaved changes
+            were kept.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+        ValueError
+            If the file content is not valid for the format of the file.
+        TimeoutError
+            If the lock of the file was not taken within `lock_timeout` seconds.
+        OSError
+            If a pending background write failed.
+        KeyError, ValueError
+            If a typed view returned by `bind()` cannot be converted from the new data,
+            in which case the data and the views are left as they were.
+        Exception
+            The first error raised by a subscriber of `subscribe()`, once the new data is
+            installed and every subscriber was called.
+        """
+        if self.__write_behind is not None:
+            self.flush()
+
+        if keep_changes and self._has_changes(direct=True):
+            return False
+
+        # The saves of this instance are not read while they lock the file
+        with self.__save_lock, self.__locked_file(exclusive=False):
+            stat = os.stat(self.file_path)
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+            if not force and not self._has_changes(direct=False) and signature == self.__signature:
+                return False
+
+            content = None
+            digest = None
+
+            if self.content_hash:
+                with open(self.file_path, 'rb') as file:
+                    content = file.read()
+
+                # Only imported here, as it is slow to import and rarely needed
+                import hashlib  # pylint: disable=import-outside-toplevel
+
+                digest = hashlib.blake2b(content).digest()
+
+                if not force and not self._has_changes(direct=False) and digest == self.__digest:
+                    self.__signature = signature
+                    return False
+
+            data, sections = self.__parse(stat, content)
+
+        installed, old_data = self.__commit(data, sections, signature, digest, keep_changes)
+
+        if not installed:
+            return False
+
+        self._notify(old_data, data)
+        return True
+
+    def __commit(  # pylint: disable=too-many-arguments
+        self,
+        data: dict,
+        sections: Union[Sections, None],
+        signature: tuple[int, int, int],
+        digest: Union[bytes, None],
+        keep_changes: bool
+    ) -> tuple[bool, Union[dict, None]]:
+        """
+        Installs the data parsed by `reload()` and records the file it was parsed from,
+        unless it must keep the unsaved changes made while the file was parsed.
+
+        Parameters
+        ----------
+        data : dict
+            The parsed data.
+        sections : Sections or None
+            The index of the sections of the data not decoded yet, or None.
+        signature : tuple[int, int, int]
+            The mtime_ns, size and inode of the file.
+        digest : bytes or None
+            The hash of the content of the file, if `content_hash` is True.
+        keep_changes : bool
+            If True, the data is not installed while the current data has unsaved changes.
+
+        Returns
+        -------
+        tuple
+            Whether the data was installed, and the previous data to notify the subscribers
+            with, or None.
+        """
+        if keep_changes and self._has_changes(direct=True):
+            if sections is not None:
+                sections.close()
+
+            return False, None
+
+        old_data = self._install(data, sections)
+        self.__signature = signature
+        self.__digest = digest
+        return True, old_data
+
+    def __parse(
+        self,
+        stat: os.stat_result,
+        content: Union[bytes, None]
+    ) -> tuple[dict, Union[Sections, None]]:
+        """
+        Gets the data of the file from the parse cache, its sections or its full content.
+
+        Parameters
+        ----------
+        stat : os.stat_result
+            The stat metadata of the file.
+        content : bytes or None
+            The content of the file, if it was already read.
+
+        Returns
+        -------
+        tuple
+            The data, and the index of its sections not decoded yet, or None.
+        """
+        if self.parse_cache is not None:
+            # Only imported here, as it is slow to import and rarely needed
+            from yaml_manager import parse_cache  # pylint: disable=import-outside-toplevel
+
+            cache_key = (stat.st_mtime_ns, stat.st_size, self._cache_settings())
+            data = parse_cache.load_entry(self.parse_cache, self.file_path, cache_key)
+
+            if data is not key_path.MISSING:
+                return data, None
+
+        sections = self._index_sections(content)  # pylint: disable=assignment-from-none
+
+        if sections is not None:
+            if sections.paths:
+                return sections.data, sections
+
+            sections.close()
+            return sections.data, None
+
+        if content is not None:
+            data = self._load_data(io.StringIO(content.decode("utf-8")))
+
+        else:
+            with open(self.file_path, 'r', encoding="utf-8") as file:
+                data = self._load_data(file)
+
+        if self.parse_cache is not None:
+            parse_cache.store_entry(self.parse_cache, self.file_path, cache_key, data)
+
+        return data, None
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Saves the data from `self.data` back to the file.
+
+        Nothing is written when the data is not dirty and the file was not changed since
+        the last load or save. If the directory for the file does not exist, it creates
+        the necessary directories. The data is written to a new file renamed over the file,
+        synced according to `durability`, under an exclusive lock if `file_lock` is True.
+
+        In write-behind mode, a snapshot of the data is taken and written later by a
+        background thread, together with the saves made within `write_behind` seconds.
+        In thread-safe mode, the snapshot is taken with write access to the lock of the
+        instance, and serialized and written without it.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the file is written even if the data is not dirty (default is False).
+
+        Returns
+        -------
+        bool
+            True if the file was written or scheduled to be, False if it was already up to date.
+
+        Raises
+        ------
+        TypeError
+            If `durability` is not `"none"`, `"file"` or `"full"`.
+        TimeoutError
+            If the lock of the file was not taken within `lock_timeout` seconds.
+        OSError
+            If there is an error in creating directories or writing to the file, including
+            a failed background write since the last `save()` or `flush()`.
+        """
+        self.__raise_write_error()
+        data, number = self.__take_snapshot(force)
+
+        if data is None:
+            return False
+
+        with self.__save_lock:
+            # A concurrent save already wrote a newer snapshot
+            if number < self.__written:
+                return True
+
+            try:
+                if self.__write_behind is not None:
+                    WRITER.schedule(self, data, self.__write_behind)
+
+                else:
+                    self._write_file(data)
+
+            except BaseException:
+                self._mark_dirty()
+                raise
+
+            self.__written = number
+
+        return True
+
+    def __take_snapshot(self, force: bool) -> tuple[Union[dict, None], int]:
+        """
+        Gets the data to save and marks it clean, numbering the snapshots so that a save
+        never writes one older than the one the file holds.
+
+        Parameters
+        ----------
+        force : bool
+            If True, the data is returned even if it is not dirty.
+
+        Returns
+        -------
+        tuple
+            The data, or None if the file is up to date, and the number of the snapshot.
+        """
+        data = self._take_save_data(force)
+
+        if data is None:
+            return None, 0
+
+        self.__snapshots += 1
+        return data, self.__snapshots
+
+    def flush(self, timeout: Union[float, None] = None) -> None:
+        """
+        Writes the data saved in write-behind mode that is still pending, and waits for it.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait (default is None, no limit).
+
+        Raises
+        ------
+        TimeoutError
+            If the write did not finish within `timeout` seconds.
+        OSError
+            If a background write failed since the last `save()` or `flush()`.
+        """
+        if not WRITER.flush(self, timeout):
+            raise TimeoutError(f"Timed out writing {self.file_path}")
+
+        self.__raise_write_error()
+
+    @property
+    def write_behind(self) -> Union[float, None]:
+        """
+        The number of seconds saves are coalesced for in write-behind mode, or `None`
+        if `save()` writes the file immediately.
+
+        Disabling the mode writes the pending data first.
+        """
+        return self.__write_behind
+
+    @write_behind.setter
+    def write_behind(self, delay: Union[float, None]) -> None:
+        if delay is not None and (isinstance(delay, bool) or
+                                  not isinstance(delay, (int, float)) or delay < 0):
+            raise TypeError("write_behind must be a non-negative number or None.")
+
+        if delay is None and self.__write_behind is not None:
+            self.flush()
+
+        self.__write_behind = delay
+
+    def _write_file(self, data: dict) -> None:
+        """
+        Writes data to a new file renamed over the file, creating the directory of the file
+        if needed.
+
+        Readers never see a partially written file, and a failed write leaves the file as it
+        was. The new file takes the permissions of the old one, and a symbolic link is kept,
+        replacing the file it points to. The file is synced according to `durability`, and
+        written under the exclusive lock of the file if `file_lock` is True.
+
+        Parameters
+        ----------
+        data : dict
+            The data to write.
+
+        Raises
+        ------
+        TypeError
+            If `durability` is not `"none"`, `"file"` or `"full"`.
+        TimeoutError
+            If the lock of the file was not taken within `lock_timeout` seconds.
+        OSError
+            If there is an error in creating directories or writing to the file.
+        """
+        if self.durability not in _DURABILITY:
+            raise TypeError("durability must be 'none', 'file' or 'full'.")
+
+        target = os.path.realpath(self.file_path)
+        directory = os.path.dirname(target)
+        os.makedirs(directory, exist_ok=True)
+
+        # Created with the default permissions, unlike the files of tempfile
+        temp_path = os.path.join(directory, f".{os.path.basename(target)}."
+                                 f"{os.urandom(6).hex()}.tmp")
+
+        with self.__locked_file(exclusive=True):
+            try:
+                with open(temp_path, 'x', encoding="utf-8") as file:
+                    self._dump_data(data, file)
+
+                    if self.durability != "none":
+                        file.flush()
+                        os.fsync(file.fileno())
+
+                if os.path.exists(target):
+                    os.chmod(temp_path, os.stat(target).st_mode & 0o7777)
+
+                os.replace(temp_path, target)
+
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+                raise
+
+            if self.durability == "full":
+                # The rename itself is only durable once the directory is synced
+                descriptor = os.open(directory, os.O_RDONLY)
+
+                try:
+                    os.fsync(descriptor)
+
+                finally:
+                    os.close(descriptor)
+
+            # The file now holds data, there is no need to parse it again
+            stat = os.stat(target)
+
+        self.__signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self.__digest = None
+
+    def __locked_file(self, exclusive: bool) -> ContextManager[None]:
+        """
+        Gets a context manager holding the advisory lock of the file, if `file_lock` is True.
+
+        Parameters
+        ----------
+        exclusive : bool
+            True to hold the lock alone, to write the file, False to share it.
+
+        Returns
+        -------
+        ContextManager[None]
+            The context manager.
+        """
+        if not self.file_lock:
+            return nullcontext()
+
+        return file_lock.locked(self.file_path, exclusive, self.lock_timeout)
+
+    def _file_unchanged(self) -> bool:
+        """
+        Checks whether the file was not changed since the last load or save.
+        """
+        if self.__signature is None:
+            return False
+
+        try:
+            stat = os.stat(self.file_path)
+
+        except FileNotFoundError:
+            return False
+
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino) == self.__signature
+
+    def __raise_write_error(self) -> None:
+        """
+        Raises the error of the last failed background write, if any.
+        """
+        error = WRITER.pop_error(self)
+
+        if error is not None:
+            raise error
+
+    def _record_file(self, signature: tuple[int, int, int], digest: Union[bytes, None]) -> None:
+        """
+        Records the file the data was loaded from, as it was when it was read.
+
+        Parameters
+        ----------
+        signature : tuple[int, int, int]
+            The mtime_ns, size and inode of the file.
+        digest : bytes or None
+            The hash of the content of the file, if `content_hash` is True.
+        """
+        self.__signature = signature
+        self.__digest = digest
+
+    @abstractmethod
+    def _install(self, data: dict, sections: Union[Sections, None]) -> Union[dict, None]:
+        """
+        Sets the data parsed from the file, marking it as matching the file, and updates
+        the typed views. If a view cannot be converted, nothing is changed.
+
+        Parameters
+        ----------
+        data : dict
+            The parsed data.
+        sections : Sections or None
+            The index of the sections of the data not decoded yet, or None.
+
+        Returns
+        -------
+        dict or None
+            The previous data, if there are subscribers and the file was already loaded.
+
+        Raises
+        ------
+        KeyError
+            If a field without default value of a typed view is missing.
+        ValueError
+            If a field without default value of a typed view cannot be converted.
+        """
+
+    @abstractmethod
+    def _notify(self, old_data: Union[dict, None], data: dict) -> None:
+        """
+        Calls the subscribers whose prefix is affected by the changes of a reload.
+
+        Parameters
+        ----------
+        old_data : dict or None
+            The previous data, or None if the changes are not known.
+        data : dict
+            The new data.
+        """
+
+    @abstractmethod
+    def _take_save_data(self, force: bool) -> Union[dict, None]:
+        """
+        Gets the data to save and marks it clean, or None if the file is up to date.
+
+        Parameters
+        ----------
+        force : bool
+            If True, the data is returned even if it is not dirty.
+
+        Returns
+        -------
+        dict or None
+            The data, or a snapshot of it in write-behind or thread-safe mode, or None.
+        """
+
+    @abstractmethod
+    def _has_changes(self, direct: bool) -> bool:
+        """
+        Checks whether the data may differ from the content of the file.
+
+        Parameters
+        ----------
+        direct : bool
+            True to also check the direct changes to the dictionaries of `data`, False
+            to only check the changes made by `set()`, a getter default or an assignment
+            of `data`.
+        """
+
+    @abstractmethod
+    def _mark_dirty(self) -> None:
+        """
+        Marks `data` as differing from the content of the file, so that the next `save()`
+        writes it, such as after a failed write.
+        """
@@ -0,0 +1,272 @@
+"""
+rw_lock.py
+
+This module provides the reader-writer lock used by the thread-safe mode of FileController.
+
+Classes:
+    ReadWriteLock: A lock shared by many readers or held by a single writer.
+    LockUpgradeError: Raised when a thread holding read access asks for write access.
+
+Functions:
+    read_locked: Wraps a function so that it runs with read access to a lock.
+    write_locked: Wraps a function so that it runs with write access to a lock.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import functools
+import threading
+
+
+class LockUpgradeError(RuntimeError):
+    """
+    Raised when a thread holding read access to a ReadWriteLock asks for write access,
+    which would wait forever if another reader did the same.
+    """
+
+
+class ReadWriteLock:
+    """
+    A lock shared by many readers or held by a single writer.
+
+    Writers are preferred: once a writer waits, new readers wait for it, so a steady
+    stream of readers cannot starve the writers. Both kinds of access are reentrant, and
+    the writer may also take read access. Taking write access while holding read access
+    raises `LockUpgradeError` instead of waiting forever.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the ReadWriteLock, free.
+        """
+        self.__mutex = threading.Lock()
+        self.__condition = threading.Condition(self.__mutex)
+        self.__readers = {}
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """
+        Waits for read access, until no writer holds or waits for the lock.
+        """
+        me = threading.get_ident()
+
+        with self.__mutex:
+            count = self.__readers.get(me)
+
+            # A thread already holding access must not wait for the writers it blocks
+            if count is None and self.__writer != me:
+                count = 0
+
+                while self.__writer is not None or self.__waiting_writers:
+                    self.__condition.wait()
+
+            self.__readers[me] = (count or 0) + 1
+
+    def release_read(self) -> None:
+        """
+        Releases the read access of the current thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the current thread does not hold read access.
+        """
+        me = threading.get_ident()
+
+        with self.__mutex:
+            count = self.__readers.get(me)
+
+            if count is None:
+                raise RuntimeError("Cannot release read access that is not held.")
+
+            if count > 1:
+                self.__readers[me] = count - 1
+                return
+
+            del self.__readers[me]
+
+            if not self.__readers and self.__waiting_writers:
+                self.__condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Waits for write access, until no other thread holds the lock.
+
+        Raises
+        ------
+        LockUpgradeError
+            If the current thread holds read access without write access.
+        """
+        me = threading.get_ident()
+
+        with self.__mutex:
+            if self.__writer == me:
+                self.__writes += 1
+                return
+
+            if me in self.__readers:
+                raise LockUpgradeError(
+                    "Cannot take write access while holding read access.")
+
+            self.__waiting_writers += 1
+
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+
+            finally:
+                self.__waiting_writers -= 1
+
+                # The readers waiting for this writer must not wait for it forever
+                if self.__writer is not None or self.__readers:
+                    self.__condition.notify_all()
+
+            self.__writer = me
+            self.__writes = 1
+
+    def release_write(self) -> None:
+        """
+        Releases the write access of the current thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the current thread does not hold write access.
+        """
+        with self.__mutex:
+            if self.__writer != threading.get_ident():
+                raise RuntimeError("Cannot release write access that is not held.")
+
+            self.__writes -= 1
+
+            if self.__writes == 0:
+                self.__writer = None
+                self.__condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Holds read access for the duration of a `with` block.
+        """
+        self.acquire_read()
+
+        try:
+            yield
+
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Holds write access for the duration of a `with` block.
+        """
+        self.acquire_write()
+
+        try:
+            yield
+
+        finally:
+            self.release_write()
+
+    def is_writer(self) -> bool:
+        """
+        Checks whether the current thread holds write access.
+
+        Returns
+        -------
+        bool
+            True if the current thread holds write access.
+        """
+        return self.__writer == threading.get_ident()
+
+    def require_write(self) -> None:
+        """
+        Checks that the current thread holds write access before it changes the data
+        the lock protects.
+
+        Raises
+        ------
+        LockUpgradeError
+            If the current thread does not hold write access.
+        """
+        if self.__writer != threading.get_ident():
+            raise LockUpgradeError("Write access is needed to change the data.")
+
+
+def read_locked(lock: ReadWriteLock, function: Callable) -> Callable:
+    """
+    Wraps a function so that it runs with read access to a lock.
+
+    When the function needs to change the data, which `require_write()` or `acquire_write()`
+    reports by raising `LockUpgradeError`, the read access is released and the function is
+    run again from the start with write access. The function must therefore not change
+    anything before that point.
+
+    Parameters
+    ----------
+    lock : ReadWriteLock
+        The lock.
+    function : Callable
+        The function.
+
+    Returns
+    -------
+    Callable
+        The function taking the lock.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        lock.acquire_read()
+
+        try:
+            return function(*args, **kwargs)
+
+        except LockUpgradeError:
+            # The writer never needs to upgrade, nor can a thread holding read access outside
+            if lock.is_writer():
+                raise
+
+        finally:
+            lock.release_read()
+
+        lock.acquire_write()
+
+        try:
+            return function(*args, **kwargs)
+
+        finally:
+            lock.release_write()
+
+    return wrapper
+
+
+def write_locked(lock: ReadWriteLock, function: Callable) -> Callable:
+    """
+    Wraps a function so that it runs with write access to a lock.
+
+    Parameters
+    ----------
+    lock : ReadWriteLock
+        The lock.
+    function : Callable
+        The function.
+
+    Returns
+    -------
+    Callable
+        The function taking the lock.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        lock.acquire_write()
+
+        try:
+            return function(*args, **kwargs)
+
+        finally:
+            lock.release_write()
+
+    return wrapper
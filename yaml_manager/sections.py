@@ -0,0 +1,177 @@
+"""
+sections.py
+
+This module provides the decoding of the sections of a file on first access.
+
+A file loaded by sections is held as a skeleton of its top-level (and optionally
+second-level) dictionaries, whose values are `UNDECODED` until they are first accessed.
+
+Classes:
+    Sections: The index of the sections of a file, which decodes them on demand.
+"""
+
+from abc import ABC, abstractmethod
+
+from yaml_manager import key_path
+from yaml_manager.tree import fingerprint
+
+# The value of a section of the skeleton that was not decoded yet
+UNDECODED = object()
+
+
+def _lookup(data: dict, path: tuple[str, ...]) -> any:
+    """
+    Gets the value at a path of the data, or `MISSING` if it cannot be reached.
+    """
+    node = data
+
+    for part in path:
+        if not isinstance(node, dict) or part not in node:
+            return key_path.MISSING
+
+        node = node[part]
+
+    return node
+
+
+class Sections(ABC):
+    """
+    The index of the sections of a file, which decodes them on demand.
+
+    Attributes
+    ----------
+    data : dict
+        The skeleton of the file, whose sections are `UNDECODED` until decoded.
+    paths : dict
+        The paths of the sections, in the order of the file, mapped to their location.
+    depth : int
+        The length of the longest path of a section.
+    """
+
+    def __init__(self, data: dict, paths: dict, depth: int) -> None:
+        """
+        Initializes the index of the sections.
+
+        Parameters
+        ----------
+        data : dict
+            The skeleton of the file.
+        paths : dict
+            The paths of the sections mapped to their location.
+        depth : int
+            The length of the longest path of a section.
+        """
+        self.data = data
+        self.paths = paths
+        self.depth = depth
+
+        # The fingerprints of the parts of the data returned since they were decoded
+        self.__prints = {}
+
+    @abstractmethod
+    def decode(self, path: tuple[str, ...]) -> any:
+        """
+        Decodes the value of a section.
+
+        Parameters
+        ----------
+        path : tuple[str, ...]
+            The path of the section.
+
+        Returns
+        -------
+        Any
+            The decoded value.
+        """
+
+    def close(self) -> None:
+        """
+        Releases the resources used to decode the sections.
+        """
+
+    def require(
+        self,
+        data: dict,
+        tree: tuple[str, ...],
+        track: bool
+    ) -> None:
+        """
+        Decodes the sections needed to access the value at a key path.
+
+        These are the section on the path, or every section below the value if it
+        holds sections.
+
+        Parameters
+        ----------
+        data : dict
+            The data, whose sections are replaced by their values.
+        tree : tuple[str, ...]
+            The compiled key path.
+        track : bool
+            Whether the fingerprints of the decoded values are kept, for `changed`.
+        """
+        node = data
+
+        for i, part in enumerate(tree):
+            if not isinstance(node, dict) or part not in node:
+                return
+
+            value = node[part]
+
+            if value is UNDECODED:
+                node[part] = value = self.decode(tree[:i + 1])
+
+                if track:
+                    self.__prints[tree[:i + 1]] = fingerprint(value)
+
+                return
+
+            node = value
+
+        path = tuple(tree)
+
+        # A dictionary of the skeleton, holding sections
+        if len(path) < self.depth and path not in self.paths and isinstance(node, dict):
+            for key, value in node.items():
+                if value is UNDECODED:
+                    node[key] = self.decode(path + (key,))
+
+            if track and path not in self.__prints:
+                self.__prints[path] = fingerprint(node)
+
+    def changed(self, data: dict) -> bool:
+        """
+        Checks whether a decoded value was changed since it was decoded.
+
+        Parameters
+        ----------
+        data : dict
+            The data.
+
+        Returns
+        -------
+        bool
+            True if one of the values decoded, with `track`, changed.
+        """
+        for path, value_print in self.__prints.items():
+            value = _lookup(data, path)
+
+            if value is key_path.MISSING or fingerprint(value) != value_print:
+                return True
+
+        return False
+
+    def decode_all(self, data: dict) -> None:
+        """
+        Decodes every section which was not decoded yet.
+
+        Parameters
+        ----------
+        data : dict
+            The data, whose sections are replaced by their values.
+        """
+        for path in self.paths:
+            parent = _lookup(data, path[:-1])
+
+            if isinstance(parent, dict) and parent.get(path[-1]) is UNDECODED:
+                parent[path[-1]] = self.decode(path)
@@ -0,0 +1,482 @@
+"""
+stream_convert.py
+
+This module provides the conversion of JSON files into YAML files, and back, from the
+events of a parser straight to the output of an emitter, without building the data.
+
+The output is the same as the one of `YAMLFile.save` and `JSONFile.save` for the data of
+the source file. Content whose conversion would need the whole data, such as anchors,
+duplicate keys or tags without a JSON equivalent, is reported as unsupported, so that the
+caller can convert it through a dictionary instead.
+
+Functions:
+    json_to_yaml: Converts the content of a JSON file into YAML, one token at a time.
+    yaml_to_json: Converts the content of a YAML file into JSON, one event at a time.
+"""
+
+from typing import Callable, Iterator, TextIO
+import json
+import re
+from json.decoder import scanstring
+from yaml.events import (DocumentEndEvent, DocumentStartEvent, MappingEndEvent,
+                         MappingStartEvent, ScalarEvent, SequenceEndEvent, SequenceStartEvent,
+                         StreamEndEvent, StreamStartEvent)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+# Matches the next token of a JSON file, other than a string
+_TOKEN = re.compile(r'[ \t\n\r]*(?:([{}\[\],:"])|(-?(?:0|[1-9][0-9]*)(\.[0-9]+)?'
+                    r'([eE][-+]?[0-9]+)?)|(true|false|null|NaN|Infinity|-Infinity))')
+
+# Matches the whitespace at the end of a JSON file
+_SPACE = re.compile(r'[ \t\n\r]*\Z')
+
+# The values of the JSON literals
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf")
+}
+
+# The tags of the YAML scalars that have a JSON equivalent
+_SCALAR_TAGS = frozenset("tag:yaml.org,2002:" + name for name in ("str", "int", "float",
+                                                                  "bool", "null"))
+
+# The tags of the YAML collections that have a JSON equivalent
+_MAP_TAG = "tag:yaml.org,2002:map"
+_SEQ_TAG = "tag:yaml.org,2002:seq"
+
+# Encodes the values like `JSONFile.save`
+_ENCODER = json.JSONEncoder(ensure_ascii=False, allow_nan=False)
+
+
+class _Unsupported(Exception):
+    """
+    Raised when the content cannot be converted without building its data.
+    """
+
+
+def _json_token(match: re.Match) -> tuple[str, any]:
+    """
+    Gets the token of a match of `_TOKEN`, other than a string.
+    """
+    punctuation, number, fraction, exponent, literal = match.groups()
+
+    if punctuation is not None:
+        return punctuation, None
+
+    if number is None:
+        return "value", _LITERALS[literal]
+
+    # json.load decodes the numbers without fraction nor exponent as integers
+    return "value", int(number) if fraction is None and exponent is None else float(number)
+
+
+def _json_tokens(file: TextIO, chunk_size: int) -> Iterator[tuple[str, any]]:
+    """
+    Reads the tokens of a JSON file, a chunk of the file at a time.
+
+    Parameters
+    ----------
+    file : TextIO
+        The JSON file opened for reading.
+    chunk_size : int
+        The number of characters read at a time, doubled when a token spans the whole
+        buffer, so a long token is read in linear time.
+
+    Yields
+    ------
+    tuple
+        The punctuation character and None, `'"'` and the decoded string, `"value"` and
+        the decoded number or literal, and finally `""` and None at the end of the file.
+
+    Raises
+    ------
+    _Unsupported
+        If the content is not valid JSON, to report the error of `json.load`.
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+
+    while True:
+        match = _TOKEN.match(buffer, pos)
+
+        # A token reaching the end of the buffer may continue in the next chunk, and a
+        # number followed by less than 3 characters may go on with a fraction or exponent
+        if match is not None and (eof or match.end() + (
+                0 if match.group(2) is None else 3) < len(buffer)):
+            if match.group(1) != '"':
+                pos = match.end()
+                yield _json_token(match)
+                continue
+
+            try:
+                value, end = scanstring(buffer, match.end())
+
+            except json.JSONDecodeError as error:
+                # Only a string, or an escape sequence, cut by the end of the buffer may
+                # be valid
+                if eof or (not error.msg.startswith("Unterminated") and
+                           error.pos + 6 < len(buffer)):
+                    raise _Unsupported() from error
+
+            else:
+                pos = end
+                yield '"', value
+                continue
+
+        elif eof:
+            if _SPACE.match(buffer, pos) is None:
+                raise _Unsupported()
+
+            yield "", None
+            return
+
+        if pos == 0 and buffer:
+            chunk_size *= 2
+
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _scalar_emitter(dumper: any) -> Callable[[any], None]:
+    """
+    Creates the function emitting the scalar values like the serializer of PyYAML.
+
+    The events of short strings, such as the keys repeated by each record of a file, are
+    cached, as their representation and resolution cost more than their emission.
+    """
+    representers = dumper.yaml_representers
+    events = {}
+
+    def emit_scalar(value: any) -> None:
+        event = events.get(value) if value.__class__ is str else None
+
+        if event is None:
+            node = representers[value.__class__](dumper, value)
+            implicit = (node.tag == dumper.resolve(ScalarNode, node.value, (True, False)),
+                        node.tag == dumper.resolve(ScalarNode, node.value, (False, True)))
+            event = ScalarEvent(None, node.tag, implicit, node.value, style=node.style)
+
+            if value.__class__ is str and len(value) <= 64 and len(events) < 4096:
+                events[value] = event
+
+        dumper.emit(event)
+
+    return emit_scalar
+
+
+def _emit_key(
+    emit_scalar: Callable[[any], None],
+    tokens: Iterator[tuple[str, any]],
+    keys: dict,
+    kind: str,
+    value: any
+) -> tuple[str, any]:
+    """
+    Emits a key of an object, and reads the first token of its value.
+    """
+    # A duplicate key would be kept once, at its first place, by `json.load`
+    if kind != '"' or value in keys:
+        raise _Unsupported()
+
+    keys[value] = None
+    emit_scalar(value)
+
+    if next(tokens)[0] != ":":
+        raise _Unsupported()
+
+    return next(tokens)
+
+
+def _emit_value(
+    dumper: any,
+    emit_scalar: Callable[[any], None],
+    kind: str,
+    value: any,
+    stack: list
+) -> bool:
+    """
+    Emits a value, or the start of an object or array, whose keys are pushed on the stack
+    (None for an array), and gets whether a collection was started.
+    """
+    if kind == "{":
+        dumper.emit(MappingStartEvent(None, None, True, flow_style=False))
+        stack.append({})
+        return True
+
+    if kind == "[":
+        dumper.emit(SequenceStartEvent(None, None, True, flow_style=False))
+        stack.append(None)
+        return True
+
+    if kind not in ('"', "value"):
+        raise _Unsupported()
+
+    emit_scalar(value)
+    return False
+
+
+def json_to_yaml(
+    source: TextIO,
+    target: TextIO,
+    dumper: type,
+    chunk_size: int = 1 << 16
+) -> bool:
+    """
+    Converts the content of a JSON file into YAML, one token at a time.
+
+    The tokens of the source are translated into the events of a PyYAML emitter, so
+    memory holds a chunk of the source, the keys of the objects being converted and the
+    lookahead of the emitter, whatever the size of the file.
+
+    Parameters
+    ----------
+    source : TextIO
+        The JSON file opened for reading.
+    target : TextIO
+        The YAML file opened for writing.
+    dumper : type
+        The PyYAML dumper class.
+    chunk_size : int, optional
+        The number of characters read from the source at a time (default is 65536).
+
+    Returns
+    -------
+    bool
+        True if the content was converted, False if it is not an object, holds duplicate
+        keys or is not valid JSON, in which case the target holds partial output.
+    """
+    tokens = _json_tokens(source, chunk_size)
+    emitter = dumper(target, default_flow_style=False, indent=2, allow_unicode=True,
+                     sort_keys=False)
+
+    try:
+        kind, value = next(tokens)
+
+        if kind != "{":
+            raise _Unsupported()
+
+        emitter.emit(StreamStartEvent())
+        emitter.emit(DocumentStartEvent(explicit=False))
+
+        # The keys of each open object, None for an array
+        stack = []
+        emit_scalar = _scalar_emitter(emitter)
+        first = _emit_value(emitter, emit_scalar, kind, value, stack)
+
+        while stack:
+            kind, value = next(tokens)
+            keys = stack[-1]
+
+            if kind == ("]" if keys is None else "}"):
+                stack.pop()
+                emitter.emit(SequenceEndEvent() if keys is None else MappingEndEvent())
+                first = False
+                continue
+
+            if not first:
+                if kind != ",":
+                    raise _Unsupported()
+
+                kind, value = next(tokens)
+
+            if keys is not None:
+                kind, value = _emit_key(emit_scalar, tokens, keys, kind, value)
+
+            first = _emit_value(emitter, emit_scalar, kind, value, stack)
+
+        if next(tokens)[0] != "":
+            raise _Unsupported()
+
+        emitter.emit(DocumentEndEvent(explicit=False))
+        emitter.emit(StreamEndEvent())
+
+    except _Unsupported:
+        return False
+
+    finally:
+        emitter.dispose()
+
+    return True
+
+
+def _scalar(loader: any, event: ScalarEvent) -> any:
+    """
+    Constructs the value of a scalar event, if it has a JSON equivalent.
+    """
+    if not isinstance(event, ScalarEvent) or event.anchor is not None:
+        raise _Unsupported()
+
+    tag = event.tag
+
+    if tag is None or tag == "!":
+        tag = loader.resolve(ScalarNode, event.value, event.implicit)
+
+    if tag not in _SCALAR_TAGS:
+        raise _Unsupported()
+
+    node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+    return loader.yaml_constructors[tag](loader, node)
+
+
+def _json_key(key: any) -> str:
+    """
+    Converts a key into a string, like `json.dumps`.
+    """
+    if isinstance(key, str):
+        return key
+
+    if isinstance(key, float):
+        return _ENCODER.encode(key)
+
+    if key is True:
+        return "true"
+
+    if key is False:
+        return "false"
+
+    if key is None:
+        return "null"
+
+    return int.__repr__(key)
+
+
+def _collection(loader: any, event: any) -> bool:
+    """
+    Checks the start of a collection, and gets whether it is a mapping.
+    """
+    if isinstance(event, MappingStartEvent):
+        node_class, tag = MappingNode, _MAP_TAG
+
+    elif isinstance(event, SequenceStartEvent):
+        node_class, tag = SequenceNode, _SEQ_TAG
+
+    else:
+        raise _Unsupported()
+
+    if event.anchor is not None:
+        raise _Unsupported()
+
+    if event.tag is None or event.tag == "!":
+        if loader.resolve(node_class, None, event.implicit) != tag:
+            raise _Unsupported()
+
+    elif event.tag != tag:
+        raise _Unsupported()
+
+    return node_class is MappingNode
+
+
+def _write_value(parser: any, event: any, write: Callable[[str], any], stack: list) -> bool:
+    """
+    Writes a value, or the start of a mapping or sequence, whose keys are pushed on the
+    stack (None for a sequence), and gets whether a collection was started.
+    """
+    if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+        mapping = _collection(parser, event)
+
+        if parser.check_event(MappingEndEvent, SequenceEndEvent):
+            parser.get_event()
+            write("{}" if mapping else "[]")
+            return False
+
+        write("{" if mapping else "[")
+        stack.append({} if mapping else None)
+        return True
+
+    write(_ENCODER.encode(_scalar(parser, event)))
+    return False
+
+
+def yaml_to_json(source: TextIO, target: TextIO, loader: type) -> bool:
+    """
+    Converts the content of a YAML file into JSON, one event at a time.
+
+    The events of a PyYAML parser are written as JSON text as they are read, so memory
+    holds the buffer of the parser and the keys of the mappings being converted, whatever
+    the size of the file.
+
+    Parameters
+    ----------
+    source : TextIO
+        The YAML file opened for reading.
+    target : TextIO
+        The JSON file opened for writing.
+    loader : type
+        The PyYAML loader class, whose resolver and constructors give the scalar values.
+
+    Returns
+    -------
+    bool
+        True if the content was converted, False if it is not a single mapping, or holds
+        anchors, aliases, merge keys, duplicate keys, complex keys or tags without a JSON
+        equivalent, in which case the target holds partial output.
+
+    Raises
+    ------
+    yaml.YAMLError
+        If the content is not valid YAML.
+    ValueError
+        If a value is out of range for JSON, as `JSONFile.save` would raise.
+    """
+    parser = loader(source)
+    write = target.write
+
+    try:
+        parser.get_event()
+
+        if parser.check_event(StreamEndEvent):
+            raise _Unsupported()
+
+        parser.get_event()
+        event = parser.get_event()
+
+        if not isinstance(event, MappingStartEvent):
+            raise _Unsupported()
+
+        # The keys of each open mapping, None for a sequence
+        stack = []
+        first = _write_value(parser, event, write, stack)
+
+        while stack:
+            if parser.check_event(MappingEndEvent, SequenceEndEvent):
+                parser.get_event()
+                keys = stack.pop()
+                write("\n" + "\t" * len(stack) + ("]" if keys is None else "}"))
+                first = False
+                continue
+
+            keys = stack[-1]
+            write(("\n" if first else ",\n") + "\t" * len(stack))
+
+            if keys is not None:
+                key = _scalar(parser, parser.get_event())
+
+                # Equal keys, like 1 and true, would be merged in a dictionary
+                if key in keys:
+                    raise _Unsupported()
+
+                keys[key] = None
+                write(_ENCODER.encode(_json_key(key)) + ": ")
+
+            first = _write_value(parser, parser.get_event(), write, stack)
+
+        if not isinstance(parser.get_event(), DocumentEndEvent):
+            raise _Unsupported()
+
+        if not parser.check_event(StreamEndEvent):
+            raise _Unsupported()
+
+    except _Unsupported:
+        return False
+
+    finally:
+        parser.dispose()
+
+    return True
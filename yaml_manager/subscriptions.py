@@ -0,0 +1,295 @@
+"""
+subscriptions.py
+
+This module provides the typed views and the change notifications of FileController.
+
+Classes:
+    Subscriptions: Adds typed views, change subscribers and file watching.
+"""
+
+from abc import ABCMeta, abstractmethod
+from typing import Callable, Union
+
+from yaml_manager.tree import TreeDiff, diff
+
+
+class Subscriptions(metaclass=ABCMeta):
+    """
+    Adds the typed views of `bind()`, the subscribers of `subscribe()` and the watching
+    of `watch()` to a FileController, all updated when the file is parsed again.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the views and the subscribers, empty.
+        """
+        self.__views = []
+        self.__subscribers = []
+        super().__init__()
+
+    def watch(
+        self,
+        callback: Union[Callable[["FileController", any, any], None], None] = None
+    ) -> None:
+        """
+        Reloads the file when it changes on disk, from the thread of the shared `Watcher`.
+
+        The changes are seen through inotify on Linux, and by polling the file every second
+        elsewhere. A burst of changes results in a single reload, once the file did not
+        change for 0.1 seconds. The file is only parsed when its stat metadata differs from
+        the one recorded at the last load or save, so the saves of this instance are not
+        reloaded, and never while the data has unsaved changes, which are kept: the next
+        `save()` then overwrites the changes made on disk.
+
+        Parameters
+        ----------
+        callback : Callable, optional
+            The function called with the file, its old data and its new data each time it
+            is parsed again (default is None).
+
+        Raises
+        ------
+        TypeError
+            If callback is not callable.
+        OSError
+            If the directory of the file cannot be watched, such as when it does not exist.
+        """
+        # Only imported here, as it is slow to import and rarely needed
+        from yaml_manager.watcher import WATCHER  # pylint: disable=import-outside-toplevel
+
+        WATCHER.watch(self, callback)
+
+    def unwatch(self) -> None:
+        """
+        Stops reloading the file when it changes on disk, dropping the callbacks of `watch()`.
+        """
+        # Only imported here, as it is slow to import and rarely needed
+        from yaml_manager.watcher import WATCHER  # pylint: disable=import-outside-toplevel
+
+        WATCHER.unwatch(self)
+
+    def bind(self, schema: type) -> any:
+        """
+        Gets a typed view of the data described by a dataclass or a TypedDict.
+
+        The schema is compiled once, and its values are converted when it is bound and
+        again, for the fields whose value changed, each time `reload()` parses the file.
+        Reading the view is then plain attribute (or item, for a TypedDict) access. Only
+        the changes to the file made by other writers are seen by the view: the changes made
+        with `set()` or to `data` are not, even after `save()`, since the file saved then
+        matches the data and is not parsed again by `reload()` without `force`.
+
+        Each field is read from the key with its name, or from the dotted key in the `"key"`
+        metadata of a dataclass field, and converted with the rules of the typed getter of
+        its type: `str`, `float`, `int`, `bool`, `list[str]`, `list[float]`, `list[int]`,
+        `list[bool]`, `dict`, `Optional` of one of them, or a nested schema. Missing or
+        invalid values take the default of the field.
+
+        Parameters
+        ----------
+        schema : type
+            A dataclass or a TypedDict.
+
+        Returns
+        -------
+        Any
+            The instance of the schema holding the converted values.
+
+        Raises
+        ------
+        TypeError
+            If `schema` is not a dataclass or a TypedDict, or a field type is not supported.
+        KeyError
+            If a field without default value is missing.
+        ValueError
+            If a field without default value cannot be converted.
+        """
+        # Only imported here, as it is slow to import and rarely needed
+        from yaml_manager import typed_view  # pylint: disable=import-outside-toplevel
+
+        decoder = typed_view.compile_schema(schema)
+        view, raw_values = decoder.decode(self._whole_data())
+        self.__views.append((decoder, view, raw_values))
+        return view
+
+    def unbind(self, view: any) -> None:
+        """
+        Stops updating a typed view returned by `bind()` when the file is reloaded.
+
+        Parameters
+        ----------
+        view : Any
+            The typed view.
+        """
+        self.__views = [entry for entry in self.__views if entry[1] is not view]
+
+    def subscribe(
+        self,
+        prefix: str,
+        callback: Callable[["FileController", TreeDiff], None]
+    ) -> None:
+        """
+        Calls a function when a reload changes the value at a dotted key.
+
+        When the file is parsed again, `reload()` compares the new data with the previous
+        one, skipping the identical subtrees, and calls each subscriber whose key is
+        affected with the file and the `TreeDiff` of the keys at, below or above its key.
+        The comparison is only made while there are subscribers. Subscribers run on the
+        thread reloading the file, such as the one of the `Watcher` of `watch()`, after
+        the new data is installed. If subscribers fail, the others are still called, and
+        `reload()` then raises the first error.
+
+        Parameters
+        ----------
+        prefix : str
+            The dotted key, or the empty string for every change.
+        callback : Callable
+            The function called with the file and the changes affecting the key.
+
+        Raises
+        ------
+        TypeError
+            If prefix is not a string or callback is not callable.
+        """
+        if not isinstance(prefix, str):
+            raise TypeError("prefix must be a string.")
+
+        if not callable(callback):
+            raise TypeError("callback must be callable.")
+
+        # The sections not decoded yet could no longer be read once the file changed
+        self._decode_sections()
+
+        # Replaced rather than changed, so a reload in progress keeps its own list
+        self.__subscribers = self.__subscribers + [(prefix, callback)]
+
+    def unsubscribe(
+        self,
+        callback: Callable[["FileController", TreeDiff], None],
+        prefix: Union[str, None] = None
+    ) -> None:
+        """
+        Stops calling a function registered by `subscribe()`.
+
+        Parameters
+        ----------
+        callback : Callable
+            The function.
+        prefix : str, optional
+            The dotted key it was subscribed to (default is None, every key).
+        """
+        self.__subscribers = [(key, function) for key, function in self.__subscribers
+                              if function != callback or prefix not in (None, key)]
+
+    def _needs_whole_data(self) -> bool:
+        """
+        Checks whether typed views or subscribers need every section of the data decoded.
+        """
+        return bool(self.__views or self.__subscribers)
+
+    def _is_subscribed(self) -> bool:
+        """
+        Checks whether there are subscribers, which need the changes of each reload.
+        """
+        return bool(self.__subscribers)
+
+    def _convert_views(self, data: dict) -> list[tuple]:
+        """
+        Converts the typed views from new data, without changing them yet.
+
+        Parameters
+        ----------
+        data : dict
+            The new data.
+
+        Returns
+        -------
+        list[tuple]
+            The converted values, to set with `_apply_views`.
+
+        Raises
+        ------
+        KeyError
+            If a field without default value of a typed view is missing.
+        ValueError
+            If a field without default value of a typed view cannot be converted.
+        """
+        return [change for decoder, view, raw_values in self.__views
+                for change in decoder.changes(view, raw_values, data)]
+
+    @staticmethod
+    def _apply_views(changes: list[tuple]) -> None:
+        """
+        Sets the converted values of the typed views returned by `_convert_views`.
+
+        Parameters
+        ----------
+        changes : list[tuple]
+            The converted values.
+        """
+        if changes:
+            # Only imported here, as it is slow to import and rarely needed
+            from yaml_manager import typed_view  # pylint: disable=import-outside-toplevel
+
+            typed_view.apply_changes(changes)
+
+    def _notify(self, old_data: Union[dict, None], data: dict) -> None:
+        """
+        Calls the subscribers whose prefix is affected by the changes of a reload.
+
+        Parameters
+        ----------
+        old_data : dict or None
+            The previous data, or None if the changes are not known.
+        data : dict
+            The new data.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a subscriber, once every subscriber was called.
+        """
+        if old_data is None or not self.__subscribers:
+            return
+
+        changes = diff(old_data, data)
+
+        if not changes:
+            return
+
+        first_error = None
+
+        for prefix, callback in self.__subscribers:
+            affected = changes.under(prefix)
+
+            if not affected:
+                continue
+
+            try:
+                callback(self, affected)
+
+            # A failing subscriber must not stop the other ones
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if first_error is None:
+                    first_error = error
+
+        if first_error is not None:
+            raise first_error
+
+    @abstractmethod
+    def _whole_data(self) -> dict:
+        """
+        Gets `data`, parsing the file or decoding its sections first if needed.
+
+        Returns
+        -------
+        dict
+            The data.
+        """
+
+    @abstractmethod
+    def _decode_sections(self) -> None:
+        """
+        Decodes every section of the data which was not decoded yet, if the file was
+        loaded with lazy sections.
+        """
@@ -0,0 +1,102 @@
+"""
+thread_safety.py
+
+This module provides the thread-safe mode of FileController.
+
+Classes:
+    ThreadSafety: Adds an optional reader-writer lock around the methods of a FileController.
+"""
+
+from abc import ABCMeta
+from types import MethodType
+from typing import Union
+
+from yaml_manager.rw_lock import ReadWriteLock, read_locked, write_locked
+
+
+class ThreadSafety(metaclass=ABCMeta):
+    """
+    Adds an optional reader-writer lock around the methods of a FileController.
+
+    The methods named by `_read_locked_methods` and `_write_locked_methods` are wrapped in
+    the instance only when the mode is enabled, so that an instance used by a single thread
+    pays nothing for it.
+    """
+
+    # Whether new instances guard their data with a reader-writer lock
+    default_thread_safe = False
+
+    # The names of the methods run with read access to the lock, and of those run with
+    # write access, set by the class using the mode
+    _read_locked_methods = ()
+    _write_locked_methods = ()
+
+    def __init__(self) -> None:
+        """
+        Initializes the mode, enabled if `default_thread_safe` is True.
+        """
+        self.__lock = None
+        self.thread_safe = self.default_thread_safe
+        super().__init__()
+
+    @property
+    def thread_safe(self) -> bool:
+        """
+        Whether the data is guarded by a reader-writer lock, for sharing between threads.
+
+        The getters, `contains()`, `get_many()`, `is_dirty` and reading `data` run
+        concurrently, while `set()`, `set_many()`, transactions and assigning `data` run
+        alone. A getter that stores a default value, or a first access that parses the file
+        or decodes sections, waits for write access. `save()` only holds write access to
+        take a snapshot of the data, which it serializes and writes without the lock, so
+        other threads keep reading and changing the data meanwhile, and concurrent saves
+        never replace the file with a snapshot older than the one it holds. `reload()`
+        parses the file without the lock, and only holds write access to install the new
+        data. Direct changes to the dictionaries of `data` are not guarded.
+
+        The mode must be chosen before the instance is shared between threads.
+        """
+        return self.__lock is not None
+
+    @thread_safe.setter
+    def thread_safe(self, enabled: bool) -> None:
+        if not isinstance(enabled, bool):
+            raise TypeError("thread_safe must be a boolean.")
+
+        if enabled == (self.__lock is not None):
+            return
+
+        self.__lock = ReadWriteLock() if enabled else None
+
+        for names, wrap in ((self._read_locked_methods, read_locked),
+                            (self._write_locked_methods, write_locked)):
+            for name in names:
+                if enabled:
+                    method = MethodType(getattr(type(self), name), self)
+                    setattr(self, name, wrap(self.__lock, method))
+                else:
+                    delattr(self, name)
+
+    @property
+    def lock(self) -> Union[ReadWriteLock, None]:
+        """
+        The reader-writer lock of the thread-safe mode, or None if the mode is disabled.
+
+        Holding `lock.write()` makes several calls atomic, and holding `lock.read()` gives
+        them a consistent view of the data. Getters which would store a default value raise
+        `LockUpgradeError` while the thread holds read access without write access.
+        """
+        return self.__lock
+
+    def _require_write(self) -> None:
+        """
+        Checks that the current thread may change the data in thread-safe mode, making
+        the methods run with read access run again with write access otherwise.
+
+        Raises
+        ------
+        LockUpgradeError
+            If the mode is enabled and the current thread does not hold write access.
+        """
+        if self.__lock is not None:
+            self.__lock.require_write()
@@ -0,0 +1,245 @@
+"""
+tree.py
+
+This module provides helpers to inspect configuration trees.
+
+Classes:
+    TreeDiff: The dotted keys added, removed and changed between two configuration trees.
+
+Functions:
+    fingerprint: Computes a cheap structural fingerprint of a configuration tree.
+    snapshot: Copies the containers of a configuration tree.
+    merge: Merges a configuration tree into another one.
+    diff: Compares two configuration trees.
+"""
+
+from typing import NamedTuple
+
+# Returned by dict.get when a key is only in the new tree
+_MISSING = object()
+
+# The immutable types of the values produced by the parsers, fingerprinted by value
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+class TreeDiff(NamedTuple):
+    """
+    The dotted keys added, removed and changed between two configuration trees.
+
+    A dictionary added or removed is reported by its own key, not by the keys below it.
+    Values of different types, lists included, are changed as a whole, and a change of a
+    root which is not a dictionary is reported by the empty key.
+
+    Attributes
+    ----------
+    added : tuple[str, ...]
+        The keys only found in the new tree.
+    removed : tuple[str, ...]
+        The keys only found in the old tree.
+    changed : tuple[str, ...]
+        The keys whose value differs between the trees.
+    """
+    added: tuple[str, ...]
+    removed: tuple[str, ...]
+    changed: tuple[str, ...]
+
+    def __bool__(self) -> bool:
+        """
+        Checks whether any key was added, removed or changed.
+        """
+        return bool(self.added or self.removed or self.changed)
+
+    def under(self, prefix: str) -> "TreeDiff":
+        """
+        Keeps the keys affecting the value at a dotted key: the key itself, the keys below
+        it and the keys above it, whose change replaces it.
+
+        Parameters
+        ----------
+        prefix : str
+            The dotted key, or the empty string for the whole tree.
+
+        Returns
+        -------
+        TreeDiff
+            The keys affecting the value at the key.
+        """
+        if not prefix:
+            return self
+
+        below = prefix + "."
+
+        def affects(key: str) -> bool:
+            return key == prefix or key.startswith(below) or below.startswith(key + ".")
+
+        return TreeDiff(tuple(filter(affects, self.added)),
+                        tuple(filter(affects, self.removed)),
+                        tuple(filter(affects, self.changed)))
+
+
+def fingerprint(data: any) -> tuple:
+    """
+    Computes a cheap structural fingerprint of a configuration tree.
+
+    Every dictionary key, the type and length of every container and the type and value
+    of every other node are collected in a flat tuple, so a change made anywhere in the
+    tree gives a fingerprint which is not equal to the previous one. The values are kept
+    rather than hashed, as distinct values may share a hash, like `-1` and `-2`.
+    Unhashable values other than dictionaries and lists are identified by their `id`.
+
+    Parameters
+    ----------
+    data : Any
+        The root of the configuration tree.
+
+    Returns
+    -------
+    tuple
+        The fingerprint of the tree, to compare with `==`.
+    """
+    parts = []
+    stack = [data]
+
+    while stack:
+        node = stack.pop()
+        parts.append(node.__class__)
+
+        if isinstance(node, dict):
+            parts.append(len(node))
+
+            for key, value in node.items():
+                parts.append(key)
+                stack.append(value)
+
+        elif isinstance(node, list):
+            parts.append(len(node))
+            stack.extend(node)
+
+        elif node.__class__ in _SCALARS:
+            parts.append(node)
+
+        else:
+            try:
+                hash(node)
+                parts.append(node)
+
+            except TypeError:
+                parts.append(id(node))
+
+    return tuple(parts)
+
+
+def snapshot(data: any) -> any:
+    """
+    Copies the dictionaries and lists of a configuration tree.
+
+    Other values are shared with the original tree, which is enough for the immutable
+    scalars produced by the JSON and YAML parsers and much faster than `copy.deepcopy`.
+
+    Parameters
+    ----------
+    data : Any
+        The root of the configuration tree.
+
+    Returns
+    -------
+    Any
+        A copy of the tree that later changes to `data` do not affect.
+    """
+    if isinstance(data, dict):
+        return {key: snapshot(value) for key, value in data.items()}
+
+    if isinstance(data, list):
+        return [snapshot(value) for value in data]
+
+    return data
+
+
+def merge(target: dict, source: dict) -> dict:
+    """
+    Merges a configuration tree into another one.
+
+    The dictionaries found at the same key in both trees are merged recursively, and the
+    other values of `source` replace the ones of `target`. The containers of `source`
+    are put into `target` as they are, without being copied.
+
+    Parameters
+    ----------
+    target : dict
+        The tree updated in place.
+    source : dict
+        The tree whose values take precedence.
+
+    Returns
+    -------
+    dict
+        The target tree.
+    """
+    for key, value in source.items():
+        current = target.get(key)
+
+        if isinstance(current, dict) and isinstance(value, dict):
+            merge(current, value)
+        else:
+            target[key] = value
+
+    return target
+
+
+def diff(old: any, new: any) -> TreeDiff:
+    """
+    Compares two configuration trees, reporting the dotted keys added, removed and changed.
+
+    The dictionaries found at the same key are compared key by key, but only when they
+    are not the same object and not equal, which the interpreter checks much faster than
+    they are walked, so identical subtrees cost a single comparison. As a consequence,
+    values which are equal but of different types, like `1` and `True`, are only told
+    apart when they are not in equal dictionaries.
+
+    Parameters
+    ----------
+    old : Any
+        The root of the old configuration tree.
+    new : Any
+        The root of the new configuration tree.
+
+    Returns
+    -------
+    TreeDiff
+        The keys added, removed and changed.
+    """
+    added = []
+    removed = []
+    changed = []
+
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        if old is not new and (old.__class__ is not new.__class__ or old != new):
+            changed.append("")
+
+        return TreeDiff((), (), tuple(changed))
+
+    stack = [("", old, new)] if old is not new and old != new else []
+
+    while stack:
+        prefix, old_node, new_node = stack.pop()
+
+        for key, value in new_node.items():
+            full_key = f"{prefix}{key}"
+            previous = old_node.get(key, _MISSING)
+
+            if previous is _MISSING:
+                added.append(full_key)
+
+            elif previous is value:
+                continue
+
+            elif isinstance(previous, dict) and isinstance(value, dict):
+                if previous != value:
+                    stack.append((full_key + ".", previous, value))
+
+            elif previous.__class__ is not value.__class__ or previous != value:
+                changed.append(full_key)
+
+        removed.extend(f"{prefix}{key}" for key in old_node if key not in new_node)
+
+    return TreeDiff(tuple(added), tuple(removed), tuple(changed))
@@ -0,0 +1,694 @@
+"""
+typed_getters.py
+
+This module provides the typed getters of FileController.
+
+Classes:
+    TypedGetters: Adds the typed getters, their array cache and the flat key index.
+"""
+
+from abc import ABCMeta, abstractmethod
+from array import array
+from operator import is_
+from typing import Iterable, Union
+
+from yaml_manager import conversion, key_path
+
+
+class TypedGetters(metaclass=ABCMeta):
+    """
+    Adds the typed getters, their array cache and the flat key index to a FileController.
+
+    The values are looked up and stored through `_lookup`, `_lookup_many` and `_store`,
+    which load the file and decode its sections as needed.
+    """
+
+    # Whether new instances keep a flat index of every dotted key
+    default_key_index = False
+
+    def __init__(self) -> None:
+        """
+        Initializes the array cache and the key index, empty.
+        """
+        self.__key_index = self.default_key_index
+        self.__index = None
+        self.__arrays = {}
+        self.__stores = 0
+        super().__init__()
+
+    @property
+    def key_index(self) -> bool:
+        """
+        Whether lookups go through a flat index of every dotted key.
+
+        The index maps each full dotted key to its value and parent dictionary, so a lookup
+        costs one hash probe whatever the depth of the key. It is built on the first lookup
+        after `data` is loaded or replaced, and kept up to date by `set()` and the getters.
+        Direct changes to the nested dictionaries of `data` are not seen by the index.
+        """
+        return self.__key_index
+
+    @key_index.setter
+    def key_index(self, enabled: bool) -> None:
+        if not isinstance(enabled, bool):
+            raise TypeError("key_index must be a boolean.")
+
+        self.__key_index = enabled
+        self.__index = None
+
+    def string(
+        self,
+        key: str,
+        default_value: Union[str, None] = None
+    ) -> Union[str , None]:
+        """
+        Gets a string value from the data.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key.
+        default_value : str, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        str
+            The string value associated with the given key key, or `None` if
+            the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a string.
+        """
+        return self.__get_typed(key, default_value, conversion.STRING)
+
+    def float(
+        self,
+        key: str,
+        default_value: Union[float, int, None] = None
+    ) -> Union[float, None]:
+        """
+        Gets a float value from the data.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key.
+        default_value : float or int, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        float
+            The float value associated with the given key key, or `None` if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a number.
+        """
+        return self.__get_typed(key, default_value, conversion.FLOAT)
+
+    def int(
+        self,
+        key: str,
+        default_value: Union[int, None] = None
+    ) -> Union[int, None]:
+        """
+        Gets an integer value from the data.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key.
+        default_value : int, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        int
+            The integer value associated with the given key key, or `None` if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not an integer.
+        """
+        return self.__get_typed(key, default_value, conversion.INT)
+
+    def boolean(
+        self,
+        key: str,
+        default_value: Union[bool, None] = None
+    ) -> Union[bool, None]:
+        """
+        Gets a boolean value from the data.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key.
+        default_value : bool, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        bool
+            The boolean value associated with the given key key, or `None` if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a boolean.
+        """
+        return self.__get_typed(key, default_value, conversion.BOOLEAN)
+
+    def str_list(
+        self,
+        key: str,
+        default_value: Union[list[str], None] = None
+    ) -> Union[list[str], None]:
+        """
+        Gets a list of strings from the data.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key.
+        default_value : list of str, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        list of str
+            The list of string values associated with the given key key,
+              or `None` if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a list of strings.
+        """
+        return self.__get_typed(key, default_value, conversion.STR_LIST)
+
+    def float_list(
+        self,
+        key: str,
+        default_value: Union[list[Union[float, int]], None] = None
+    ) -> Union[list[float], None]:
+        """
+        Gets a list of floats from the data.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key.
+        default_value : list of float, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        list of float
+            The list of float values associated with the given key key,
+              or `None` if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a list of numbers.
+        """
+        return self.__get_typed(key, default_value, conversion.FLOAT_LIST)
+
+    def int_list(
+        self,
+        key: str,
+        default_value: Union[list[Union[int, float]], None] = None
+    ) -> Union[list[int], None]:
+        """
+        Retrieves a list of integers from the data.
+
+        This method processes the provided key to get a list of integers from the configuration.
+        If the values are not integers, they will be converted when possible.
+        If the value is not found, the `default_value` will be returned or set.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key, separated by dots.
+        default_value : list, optional
+            The default value to return if the key is not found (default is None).
+
+        Returns
+        -------
+        list of int
+            A list of integers retrieved from the data.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a list.
+        """
+        return self.__get_typed(key, default_value, conversion.INT_LIST)
+
+    def bool_list(
+        self,
+        key: str,
+        default_value: Union[list[bool], None] = None
+    ) -> Union[list[bool], None]:
+        """
+        Retrieves a list of booleans from the data.
+
+        This method processes the provided key to get a list of booleans from the configuration.
+        Values are converted to booleans based on their types (integers, floats, etc.).
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key, separated by dots.
+        default_value : list, optional
+            The default value to return if the key is not found (default is None).
+
+        Returns
+        -------
+        list of bool
+            A list of boolean values retrieved from the data.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a list.
+        """
+        return self.__get_typed(key, default_value, conversion.BOOL_LIST)
+
+    def float_array(
+        self,
+        key: str,
+        default_value: Union[list[Union[float, int]], None] = None
+    ) -> any:
+        """
+        Gets a list of floats from the data as a compact array.
+
+        The list is converted with the rules of `float_list()` into a NumPy `float64` array
+        if NumPy is installed, or an `array.array` of type `"d"` otherwise. The result is
+        cached until the key or one of its items is changed. NumPy arrays are shared and
+        read-only, while `array.array` results are copies.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key.
+        default_value : list of float, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        numpy.ndarray or array.array
+            The array of floats associated with the given key, or `None` if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a list of numbers.
+        """
+        return self.__get_array(key, default_value, conversion.FLOAT_ARRAY)
+
+    def int_array(
+        self,
+        key: str,
+        default_value: Union[list[Union[int, float]], None] = None
+    ) -> any:
+        """
+        Gets a list of integers from the data as a compact array.
+
+        The list is converted with the rules of `int_list()` into a NumPy `int64` array if
+        NumPy is installed, or an `array.array` of type `"q"` otherwise. The result is
+        cached until the key or one of its items is changed. NumPy arrays are shared and
+        read-only, while `array.array` results are copies.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key.
+        default_value : list of int, optional
+            The default value to return if the key is not found.
+
+        Returns
+        -------
+        numpy.ndarray or array.array
+            The array of integers associated with the given key, or `None` if the key is
+            not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a list of numbers.
+        OverflowError
+            If an integer does not fit in 64 bits.
+        """
+        return self.__get_array(key, default_value, conversion.INT_ARRAY)
+
+    def dictionary(
+        self,
+        key: str,
+        default_value: Union[dict, None] = None
+    ) -> Union[dict, None]:
+        """
+        Retrieves a dictionary from the data.
+
+        This method processes the provided key to get a dictionary from the configuration. 
+        If the dictionary is not found, the `default_value` will be returned or set.
+
+        Parameters
+        ----------
+        key : str
+            The key to the configuration key, separated by dots.
+        default_value : dict, optional
+            The default value to return if the key is not found (default is None).
+
+        Returns
+        -------
+        dict
+            A dictionary retrieved from the data.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not a dictionary.
+        """
+        return self.__get_typed(key, default_value, conversion.DICTIONARY)
+
+    def get_many(
+        self,
+        spec: dict,
+        as_tuple: bool = False
+    ) -> Union[dict, tuple]:
+        """
+        Gets many typed values from the data at once.
+
+        The keys are checked once and looked up in a single walk of the data, in which each
+        parent is walked once, and then converted with the rules of the matching typed getter,
+        including storing the default values. The supported types are `str`, `float`,
+        `int`, `bool`, `list[str]`, `list[float]`, `list[int]`, `list[bool]` and `dict`.
+
+        Parameters
+        ----------
+        spec : dict
+            The configuration keys, separated by dots, mapped to either a type or a
+            `(type, default_value)` tuple.
+        as_tuple : bool, optional
+            If True, the values are returned as a tuple in the order of `spec`
+            (default is False).
+
+        Returns
+        -------
+        dict or tuple
+            The values by key, or a tuple of the values.
+
+        Raises
+        ------
+        TypeError
+            If `spec` is not a dictionary, a type is not supported, or a key or default
+            value is invalid.
+        """
+        if not isinstance(spec, dict):
+            raise TypeError("spec must be a dictionary.")
+
+        requests = []
+
+        for key, entry in spec.items():
+            if isinstance(entry, tuple):
+                value_type, default_value = entry
+            else:
+                value_type, default_value = entry, None
+
+            rules = conversion.CONVERSIONS.get(value_type)
+
+            if rules is None:
+                raise TypeError(f"Unsupported type for {key}: {value_type}")
+
+            if not (isinstance(key, str) and len(key) > 0 and
+                    (default_value is None or rules.accepts(default_value))):
+                raise TypeError(
+                    f"Key must be a non-empty string, and default_value must be "
+                    f"{rules.description}.")
+
+            requests.append((key, default_value, rules))
+
+        keys = list(spec)
+        values = self._lookup_many(keys)
+        stores = self.__stores
+        results = []
+
+        for (key, default_value, rules), value in zip(requests, values):
+            # A stored default may have changed the values looked up for the next keys
+            if self.__stores != stores:
+                value = self._lookup(key)
+
+            result = conversion.INVALID if value is key_path.MISSING else rules.convert(value)
+
+            # Only the keys that are not found or not valid need their default value
+            if result is conversion.INVALID:
+                result = self.__convert(key, default_value, rules, value)
+
+            results.append(result)
+
+        if as_tuple:
+            return tuple(results)
+
+        return dict(zip(keys, results))
+
+    def __get_array(
+        self,
+        key: str,
+        default_value: any,
+        rules: conversion.Conversion
+    ) -> any:
+        """
+        Gets a numeric array from the data, reusing the cached conversion of the key.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key, separated by dots.
+        default_value : Any
+            The default value to return if the key is not found.
+        rules : Conversion
+            The array conversion rules.
+
+        Returns
+        -------
+        Any
+            The array, or None if the key is not found.
+        """
+        value = key_path.MISSING
+
+        if isinstance(key, str) and len(key) > 0:
+            value = self._lookup(key)
+            cached = self.__arrays.get(key)
+
+            # The items are compared by identity, so that an item replaced in place, even
+            # by an equal value of another type, converts the list again
+            if (cached is not None and cached[0] is rules and cached[1] is value and
+                    len(cached[2]) == len(value) and all(map(is_, cached[2], value))):
+                result = cached[3]
+                return result[:] if isinstance(result, array) else result
+
+        result = self.__get_typed(key, default_value, rules, value)
+
+        if result is None:
+            return None
+
+        value = self._lookup(key)
+        self.__arrays[key] = (rules, value, tuple(value), result)
+
+        if isinstance(result, array):
+            return result[:]
+
+        result.flags.writeable = False
+        return result
+
+    def __get_typed(
+        self,
+        key: str,
+        default_value: any,
+        rules: conversion.Conversion,
+        value: any = key_path.MISSING
+    ) -> any:
+        """
+        Checks a key and default value, then gets the value from the data and converts it
+        with the rules of a typed getter.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key, separated by dots.
+        default_value : Any
+            The default value to return if the key is not found.
+        rules : Conversion
+            The conversion rules of the getter.
+        value : Any, optional
+            The value at the key, when it was already looked up (default is to look it up).
+
+        Returns
+        -------
+        Any
+            The converted value, or None if the key is not found.
+
+        Raises
+        ------
+        TypeError
+            If `key` is not a string or `default_value` is not of the expected type.
+        """
+        if not (isinstance(key, str) and len(key) > 0 and
+                (default_value is None or rules.accepts(default_value))):
+            raise TypeError(
+                f"Key must be a non-empty string, and default_value must be {rules.description}.")
+
+        if value is key_path.MISSING:
+            value = self._lookup(key)
+
+        return self.__convert(key, default_value, rules, value)
+
+    def __convert(
+        self,
+        key: str,
+        default_value: any,
+        rules: conversion.Conversion,
+        value: any
+    ) -> any:
+        """
+        Converts a value looked up at a valid key with the rules of a typed getter.
+
+        If the key is not found and `default_value` is not None, the default value is
+        stored at the key. If the value cannot be converted, the default value replaces it.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key, separated by dots.
+        default_value : Any
+            The default value to return if the key is not found, already checked.
+        rules : Conversion
+            The conversion rules of the getter.
+        value : Any
+            The value at the key, `MISSING` if the key is not found.
+
+        Returns
+        -------
+        Any
+            The converted value, or None if the key is not found.
+        """
+        if value is key_path.MISSING:
+            if default_value is None:
+                return None
+
+            value = rules.store(default_value)
+            self._store(key, value)
+            self.__stores += 1
+
+        result = rules.convert(value)
+
+        if result is conversion.INVALID:
+            if default_value is None:
+                return None
+
+            self._store(key, default_value)
+            self.__stores += 1
+            return rules.fallback(default_value)
+
+        return result
+
+    def _flat_index(self, data: dict) -> Union[key_path.KeyIndex, None]:
+        """
+        Gets the flat key index of the data, building it if needed.
+
+        Parameters
+        ----------
+        data : dict
+            The whole data, whose sections were all decoded.
+
+        Returns
+        -------
+        KeyIndex or None
+            The flat key index, or `None` if the index is disabled.
+        """
+        if not self.__key_index:
+            return None
+
+        if self.__index is None:
+            self.__index = key_path.KeyIndex(data)
+
+        return self.__index
+
+    def _forget_arrays(self, key: Union[str, None] = None) -> None:
+        """
+        Drops the cached arrays at, below and above a key whose value changed.
+
+        Parameters
+        ----------
+        key : str, optional
+            The configuration key, separated by dots (default is None, every key).
+        """
+        if key is None:
+            self.__arrays = {}
+
+        elif self.__arrays:
+            prefix = key + "."
+            self.__arrays = {cached_key: cached for cached_key, cached in self.__arrays.items()
+                             if cached_key != key and not cached_key.startswith(prefix)
+                             and not key.startswith(cached_key + ".")}
+
+    def _forget_lookups(self) -> None:
+        """
+        Drops the key index and the cached arrays, once the data was replaced.
+        """
+        self.__index = None
+        self.__arrays = {}
+
+    @abstractmethod
+    def _lookup(self, key: str) -> any:
+        """
+        Gets the value at a key, loading the file and decoding its section if needed.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key, separated by dots.
+
+        Returns
+        -------
+        Any
+            The value, or `MISSING` if the key is not found.
+        """
+
+    @abstractmethod
+    def _lookup_many(self, keys: Iterable[str]) -> list:
+        """
+        Gets the values at many keys in a single walk of the data, loading the file and
+        decoding their sections if needed.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            The configuration keys, separated by dots.
+
+        Returns
+        -------
+        list
+            The values, `MISSING` for the keys that are not found.
+        """
+
+    @abstractmethod
+    def _store(self, key: str, value: any) -> None:
+        """
+        Sets or deletes the value at a key, like `set()` once the key was validated.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key, separated by dots.
+        value : Any
+            The value to be set. If None, the key will be deleted.
+        """
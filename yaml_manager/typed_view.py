@@ -0,0 +1,370 @@
+"""
+typed_view.py
+
+This module provides typed views of configuration data, described by a dataclass or a TypedDict.
+
+Classes:
+    SchemaDecoder: Converts configuration data into instances of a schema.
+
+Functions:
+    compile_schema: Gets the SchemaDecoder of a schema, compiling it only once.
+    apply_changes: Sets the converted values computed by SchemaDecoder.changes.
+"""
+
+from typing import NamedTuple, Union, get_args, get_origin, get_type_hints
+from functools import lru_cache
+import dataclasses
+
+from yaml_manager import conversion, key_path
+
+# The type of None, which marks the Optional fields
+_NoneType = type(None)
+
+
+class _Field(NamedTuple):
+    """
+    A compiled field of a schema.
+    """
+    name: str
+    tree: tuple[str, ...]
+    convert: any
+    default: any
+    factory: any
+    nullable: bool
+    decoder: Union["SchemaDecoder", None]
+
+
+def _is_typed_dict(schema: any) -> bool:
+    """
+    Checks whether a schema is a TypedDict.
+    """
+    return (isinstance(schema, type) and issubclass(schema, dict) and
+            hasattr(schema, "__total__") and hasattr(schema, "__annotations__"))
+
+
+def _lookup(data: any, tree: tuple[str, ...]) -> any:
+    """
+    Gets the value at a compiled key path, or `MISSING` if it cannot be reached.
+    """
+    node = data
+
+    for key in tree:
+        if not isinstance(node, dict) or key not in node:
+            return key_path.MISSING
+
+        node = node[key]
+
+    return node
+
+
+class SchemaDecoder:
+    """
+    Converts configuration data into instances of a schema.
+
+    The schema is a dataclass, whose instances have one attribute per field, or a
+    TypedDict, whose instances are dictionaries. Each field is read from the key with
+    its name, or from the dotted key in the `"key"` metadata of a dataclass field, and
+    converted with the rules of the typed getter of its type: `str`, `float`, `int`,
+    `bool`, `list[str]`, `list[float]`, `list[int]`, `list[bool]`, `dict`, `Optional`
+    of one of them, or a nested schema. Missing or invalid values take the default of
+    the field.
+    """
+
+    def __init__(self, schema: type) -> None:
+        """
+        Compiles the fields of a schema.
+
+        Parameters
+        ----------
+        schema : type
+            A dataclass or a TypedDict.
+
+        Raises
+        ------
+        TypeError
+            If `schema` is not a dataclass or a TypedDict, or a field type is not supported.
+        """
+        if not (dataclasses.is_dataclass(schema) and isinstance(schema, type) or
+                _is_typed_dict(schema)):
+            raise TypeError("schema must be a dataclass or a TypedDict.")
+
+        self.schema = schema
+        self.fields = []
+
+        hints = get_type_hints(schema)
+
+        if dataclasses.is_dataclass(schema):
+            for field in dataclasses.fields(schema):
+                default = (key_path.MISSING if field.default is dataclasses.MISSING
+                           else field.default)
+                factory = (None if field.default_factory is dataclasses.MISSING
+                           else field.default_factory)
+
+                key = field.metadata.get("key", field.name)
+                self.fields.append(self.__compile_field(field.name, key, hints[field.name],
+                                                        default, factory))
+
+        else:
+            for name, hint in hints.items():
+                self.fields.append(self.__compile_field(name, name, hint, key_path.MISSING,
+                                                        None))
+
+    @staticmethod
+    def __compile_field(
+        name: str,
+        key: str,
+        hint: any,
+        default: any,
+        factory: any
+    ) -> _Field:
+        """
+        Compiles a field of the schema.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field.
+        key : str
+            The configuration key of the field, separated by dots.
+        hint : Any
+            The type of the field.
+        default : Any
+            The default value, or `MISSING`.
+        factory : Callable or None
+            The factory of the default value.
+
+        Returns
+        -------
+        _Field
+            The compiled field.
+
+        Raises
+        ------
+        TypeError
+            If the type of the field is not supported.
+        """
+        nullable = False
+
+        if get_origin(hint) is Union and _NoneType in get_args(hint):
+            others = [arg for arg in get_args(hint) if arg is not _NoneType]
+
+            if len(others) == 1:
+                nullable = True
+                hint = others[0]
+
+        if get_origin(hint) is list and len(get_args(hint)) == 1:
+            hint = list[get_args(hint)[0]]
+
+        elif get_origin(hint) is dict:
+            hint = dict
+
+        if dataclasses.is_dataclass(hint) or _is_typed_dict(hint):
+            return _Field(name, key_path.compile_key(key), None, default, factory, nullable,
+                          compile_schema(hint))
+
+        rules = conversion.CONVERSIONS.get(hint)
+
+        if rules is None:
+            raise TypeError(f"Unsupported type for {name}: {hint}")
+
+        return _Field(name, key_path.compile_key(key), rules.convert, default, factory,
+                      nullable, None)
+
+    def decode(self, data: dict) -> tuple[any, dict]:
+        """
+        Converts configuration data into an instance of the schema.
+
+        Parameters
+        ----------
+        data : dict
+            The configuration data.
+
+        Returns
+        -------
+        tuple
+            The instance of the schema, and the raw values it was converted from, used
+            by `changes`.
+
+        Raises
+        ------
+        KeyError
+            If a field without default value is missing.
+        ValueError
+            If a field without default value cannot be converted.
+        """
+        values = {}
+        raw_values = {}
+
+        for field in self.fields:
+            raw = _lookup(data, field.tree)
+
+            if field.decoder is not None and (isinstance(raw, dict) or raw is key_path.MISSING
+                                              and not self.__has_default(field)):
+                values[field.name], raw_values[field.name] = field.decoder.decode(
+                    raw if isinstance(raw, dict) else {})
+
+            else:
+                values[field.name] = self.__convert(field, raw)
+                raw_values[field.name] = raw
+
+        if _is_typed_dict(self.schema):
+            return values, raw_values
+
+        return self.schema(**values), raw_values
+
+    def changes(
+        self,
+        view: any,
+        raw_values: dict,
+        data: dict
+    ) -> list[tuple]:
+        """
+        Converts the fields of an instance of the schema whose raw value changed in new
+        configuration data, without changing the instance, so that a field which cannot
+        be converted leaves it as it was.
+
+        Parameters
+        ----------
+        view : Any
+            The instance of the schema returned by `decode`.
+        raw_values : dict
+            The raw values returned by `decode`.
+        data : dict
+            The new configuration data.
+
+        Returns
+        -------
+        list[tuple]
+            The converted values, to set with `apply_changes`.
+
+        Raises
+        ------
+        KeyError
+            If a field without default value is missing.
+        ValueError
+            If a field without default value cannot be converted.
+        """
+        changes = []
+
+        for field in self.fields:
+            raw = _lookup(data, field.tree)
+            old_raw = raw_values[field.name]
+
+            if field.decoder is not None and isinstance(old_raw, dict) and (
+                    isinstance(raw, dict) or raw is key_path.MISSING
+                    and not self.__has_default(field)):
+                changes.extend(field.decoder.changes(self.__get(view, field.name), old_raw,
+                                                     raw if isinstance(raw, dict) else {}))
+                continue
+
+            if raw is old_raw or (field.decoder is None and raw.__class__ is old_raw.__class__ and
+                                  raw == old_raw):
+                continue
+
+            if field.decoder is not None and isinstance(raw, dict):
+                value, raw = field.decoder.decode(raw)
+            else:
+                value = self.__convert(field, raw)
+
+            changes.append((view, raw_values, field.name, value, raw))
+
+        return changes
+
+    @staticmethod
+    def __has_default(field: _Field) -> bool:
+        """
+        Checks whether a field has a default value.
+        """
+        return field.factory is not None or field.default is not key_path.MISSING
+
+    @staticmethod
+    def __get(view: any, name: str) -> any:
+        """
+        Gets a field of an instance of the schema.
+        """
+        return view[name] if isinstance(view, dict) else getattr(view, name)
+
+    @staticmethod
+    def __convert(field: _Field, raw: any) -> any:
+        """
+        Converts the raw value of a field, using its default if the value is missing or invalid.
+
+        Parameters
+        ----------
+        field : _Field
+            The compiled field.
+        raw : Any
+            The raw value, or `MISSING`.
+
+        Returns
+        -------
+        Any
+            The converted value.
+
+        Raises
+        ------
+        KeyError
+            If the value is missing and the field has no default value.
+        ValueError
+            If the value cannot be converted and the field has no default value.
+        """
+        if raw is None and field.nullable:
+            return None
+
+        if raw is not key_path.MISSING:
+            value = conversion.INVALID if field.convert is None else field.convert(raw)
+
+            if value is not conversion.INVALID and value is not None:
+                return value
+
+        if field.factory is not None:
+            return field.factory()
+
+        if field.default is key_path.MISSING:
+            if raw is key_path.MISSING:
+                raise KeyError(f"Missing configuration key: {'.'.join(field.tree)}")
+
+            raise ValueError(f"Invalid value for {'.'.join(field.tree)}: {raw!r}")
+
+        return field.default
+
+
+@lru_cache(maxsize=None)
+def compile_schema(schema: type) -> SchemaDecoder:
+    """
+    Gets the SchemaDecoder of a schema, compiling it only once.
+
+    Parameters
+    ----------
+    schema : type
+        A dataclass or a TypedDict.
+
+    Returns
+    -------
+    SchemaDecoder
+        The decoder of the schema.
+
+    Raises
+    ------
+    TypeError
+        If `schema` is not a dataclass or a TypedDict, or a field type is not supported.
+    """
+    return SchemaDecoder(schema)
+
+
+def apply_changes(changes: list[tuple]) -> None:
+    """
+    Sets the converted values computed by `SchemaDecoder.changes`, and their raw values.
+
+    Parameters
+    ----------
+    changes : list[tuple]
+        The converted values.
+    """
+    for view, raw_values, name, value, raw in changes:
+        if isinstance(view, dict):
+            view[name] = value
+        else:
+            object.__setattr__(view, name, value)
+
+        raw_values[name] = raw
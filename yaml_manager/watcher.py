@@ -0,0 +1,564 @@
+"""
+watcher.py
+
+This module provides the Watcher reloading FileControllers when their files change.
+
+Classes:
+    Watcher: Reloads the watched files when they change on disk, from a single thread.
+
+Attributes:
+    WATCHER: The Watcher shared by `FileController.watch()`.
+"""
+
+from typing import Callable, Union
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import warnings
+
+# The inotify flags and events, from <sys/inotify.h>
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+
+# The events of a directory which may change one of its files, including the rename of a
+# new file over it
+_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO |
+         _IN_CREATE | _IN_DELETE)
+
+# The header of an inotify event: wd, mask, cookie and length of the name that follows
+_EVENT = struct.Struct("iIII")
+
+
+def _load_inotify() -> Union[ctypes.CDLL, None]:
+    """
+    Gets the C library if it provides inotify, which is only the case on Linux.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+    except (OSError, AttributeError):
+        return None
+
+    return libc
+
+
+def _signature(path: str) -> Union[tuple[int, int, int], None]:
+    """
+    Gets the mtime_ns, size and inode of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+
+    except OSError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class _Inotify:
+    """
+    Watches the directories of files with inotify, so that a file replaced by renaming a
+    new file over it is still seen.
+    """
+
+    def __init__(self, libc: ctypes.CDLL) -> None:
+        """
+        Opens an inotify instance, and the pipe waking the thread waiting for its events.
+
+        Raises
+        ------
+        OSError
+            If the instance cannot be opened, such as when the limit of instances is reached.
+        """
+        descriptor = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self.__libc = libc
+        self.__descriptor = descriptor
+        self.__pipe = os.pipe()
+        os.set_blocking(self.__pipe[1], False)
+        self.__lock = threading.Lock()
+        self.__watches = {}
+        self.__names = {}
+
+    def add(self, file: any, path: str) -> None:
+        """
+        Starts watching a file, adding a watch on its directory if it has none yet.
+
+        Raises
+        ------
+        OSError
+            If the directory cannot be watched, such as when it does not exist.
+        """
+        directory, name = os.path.split(path)
+
+        with self.__lock:
+            if directory not in self.__watches:
+                watch = self.__libc.inotify_add_watch(self.__descriptor,
+                                                      os.fsencode(directory), _MASK)
+
+                if watch < 0:
+                    error = ctypes.get_errno()
+                    raise OSError(error, os.strerror(error), directory)
+
+                self.__watches[directory] = watch
+
+            self.__names.setdefault((directory, name), set()).add(file)
+
+    def remove(self, file: any) -> None:
+        """
+        Stops watching a file, removing the watch on its directory if no other file uses it.
+        """
+        with self.__lock:
+            key = next(key for key, files in self.__names.items() if file in files)
+            self.__names[key].discard(file)
+
+            if not self.__names[key]:
+                del self.__names[key]
+
+            if not any(directory == key[0] for directory, _ in self.__names):
+                self.__libc.inotify_rm_watch(self.__descriptor, self.__watches.pop(key[0]))
+
+    def wait(self, timeout: Union[float, None]) -> list:
+        """
+        Waits for inotify events for at most `timeout` seconds, or until `wake()`.
+
+        Returns
+        -------
+        list
+            The files the events may have changed.
+        """
+        readable, _, _ = select.select([self.__descriptor, self.__pipe[0]], [], [], timeout)
+
+        if self.__pipe[0] in readable:
+            os.read(self.__pipe[0], 4096)
+
+        if self.__descriptor not in readable:
+            return []
+
+        try:
+            buffer = os.read(self.__descriptor, 65536)
+
+        except BlockingIOError:
+            return []
+
+        changed = []
+        offset = 0
+
+        with self.__lock:
+            directories = {watch: directory for directory, watch in self.__watches.items()}
+
+            while offset + _EVENT.size <= len(buffer):
+                watch, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + _EVENT.size:offset + _EVENT.size + length]
+                offset += _EVENT.size + length
+
+                # Events were lost, any file may have changed
+                if mask & _IN_Q_OVERFLOW:
+                    changed.extend(file for files in self.__names.values() for file in files)
+                    continue
+
+                key = (directories.get(watch), os.fsdecode(name.rstrip(b"\0")))
+                changed.extend(self.__names.get(key, ()))
+
+        return changed
+
+    def wake(self) -> None:
+        """
+        Wakes the thread waiting for inotify events.
+        """
+        try:
+            os.write(self.__pipe[1], b"\0")
+
+        # The pipe is full, the thread will wake anyway
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        """
+        Closes the inotify instance and the pipe.
+        """
+        for descriptor in (self.__descriptor, *self.__pipe):
+            os.close(descriptor)
+
+
+class _Poller:
+    """
+    Polls the stat metadata of files, where inotify is not available.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """
+        Initializes the poller, which polls the files every `interval` seconds.
+        """
+        self.__interval = interval
+        self.__next_poll = time.monotonic() + interval
+        self.__lock = threading.Lock()
+        self.__files = {}
+        self.__woken = threading.Event()
+
+    def add(self, file: any, path: str) -> None:
+        """
+        Starts polling a file, from its current stat metadata.
+        """
+        signature = _signature(path)
+
+        with self.__lock:
+            self.__files[file] = (path, signature)
+
+    def remove(self, file: any) -> None:
+        """
+        Stops polling a file.
+        """
+        with self.__lock:
+            self.__files.pop(file, None)
+
+    def wait(self, timeout: Union[float, None]) -> list:
+        """
+        Waits for at most `timeout` seconds, or until `wake()`, and polls the files if
+        their poll is due by then.
+
+        Returns
+        -------
+        list
+            The files whose stat metadata changed.
+        """
+        delay = max(0.0, self.__next_poll - time.monotonic())
+
+        if self.__woken.wait(delay if timeout is None else min(delay, timeout)):
+            return []
+
+        if time.monotonic() < self.__next_poll:
+            return []
+
+        self.__next_poll = time.monotonic() + self.__interval
+
+        with self.__lock:
+            files = dict(self.__files)
+
+        signatures = {file: _signature(path) for file, (path, _) in files.items()}
+        changed = []
+
+        with self.__lock:
+            for file, signature in signatures.items():
+                entry = self.__files.get(file)
+
+                if entry is not None and entry[1] != signature:
+                    self.__files[file] = (entry[0], signature)
+                    changed.append(file)
+
+        return changed
+
+    def wake(self) -> None:
+        """
+        Wakes the thread waiting for the next poll, for good, once the watcher is stopped.
+        """
+        self.__woken.set()
+
+    def close(self) -> None:
+        """
+        Does nothing, as polling holds no resource.
+        """
+
+
+def _open_backend(use_inotify: bool, poll_interval: float) -> Union[_Inotify, _Poller]:
+    """
+    Gets the inotify backend if it is available and wanted, or the polling one.
+    """
+    libc = _load_inotify() if use_inotify else None
+
+    if libc is not None:
+        try:
+            return _Inotify(libc)
+
+        # Such as when the limit of inotify instances is reached
+        except OSError:
+            pass
+
+    return _Poller(poll_interval)
+
+
+class Watcher:
+    """
+    Reloads the watched FileControllers when their files change on disk, from a single
+    thread.
+
+    On Linux, the directories of the files are watched with inotify, so a file replaced by
+    renaming a new file over it, as editors and `FileController.save()` do, is still seen.
+    Elsewhere, or if inotify is not available, the files are polled with `os.stat`. The
+    changes of a file are debounced: it is reloaded once no change was seen for `debounce`
+    seconds, so the burst of writes of an editor results in a single reload.
+
+    Files are reloaded with `reload(keep_changes=True)`, which parses them only if their
+    stat metadata differs from the one recorded at their last load or save, so the saves of
+    the process itself do not call the callbacks, and never while their data has unsaved
+    changes, which are kept. When a file was parsed, its callbacks are called with the file,
+    the old data and the new data. The callbacks run on the thread of the watcher, and files
+    shared with other threads should be `thread_safe`. The errors of the reloads and of the
+    callbacks are reported as `RuntimeWarning`.
+    """
+
+    def __init__(
+        self,
+        debounce: float = 0.1,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True
+    ) -> None:
+        """
+        Initializes the Watcher. Its inotify instance or poller is opened, and its thread
+        started, when the first file is watched.
+
+        Parameters
+        ----------
+        debounce : float, optional
+            The number of seconds without change after which a file is reloaded
+            (default is 0.1).
+        poll_interval : float, optional
+            The number of seconds between two polls of the files, when inotify is not used
+            (default is 1.0).
+        use_inotify : bool, optional
+            If False, the files are polled even if inotify is available (default is True).
+
+        Raises
+        ------
+        TypeError
+            If debounce or poll_interval is not a non-negative number, or use_inotify is not
+            a boolean.
+        """
+        for name, value in (("debounce", debounce), ("poll_interval", poll_interval)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise TypeError(f"{name} must be a non-negative number.")
+
+        if not isinstance(use_inotify, bool):
+            raise TypeError("use_inotify must be a boolean.")
+
+        self.__debounce = debounce
+        self.__poll_interval = poll_interval
+        self.__use_inotify = use_inotify
+        self.__backend = None
+        self.__condition = threading.Condition()
+        self.__callbacks = {}
+        self.__pending = {}
+        self.__thread = None
+        self.__stopped = False
+
+    @property
+    def backend(self) -> Union[str, None]:
+        """
+        `"inotify"` if the files are watched with inotify, `"polling"` if they are polled, or
+        None if no file was watched yet.
+        """
+        if self.__backend is None:
+            return None
+
+        return "inotify" if isinstance(self.__backend, _Inotify) else "polling"
+
+    def watch(
+        self,
+        file: any,
+        callback: Union[Callable[[any, any, any], None], None] = None
+    ) -> None:
+        """
+        Reloads a file when it changes on disk, and calls a callback when it was parsed.
+
+        Watching a file which is already watched adds the callback to its callbacks.
+
+        Parameters
+        ----------
+        file : FileController
+            The file.
+        callback : Callable, optional
+            The function called with the file, its old data and its new data each time it
+            is parsed again (default is None).
+
+        Raises
+        ------
+        TypeError
+            If file is not a FileController or callback is not callable.
+        RuntimeError
+            If the watcher was stopped.
+        OSError
+            If the directory of the file cannot be watched, such as when it does not exist.
+        """
+        # The FileController class is not imported, as it imports this module
+        if not callable(getattr(file, "reload", None)) or not hasattr(file, "file_path"):
+            raise TypeError("file must be a FileController.")
+
+        if callback is not None and not callable(callback):
+            raise TypeError("callback must be callable.")
+
+        path = os.path.realpath(file.file_path)
+
+        with self.__condition:
+            if self.__stopped:
+                raise RuntimeError("The watcher was stopped.")
+
+            if self.__backend is None:
+                self.__backend = _open_backend(self.__use_inotify, self.__poll_interval)
+
+            if file not in self.__callbacks:
+                self.__backend.add(file, path)
+                self.__callbacks[file] = []
+                self.__start()
+
+            if callback is not None:
+                self.__callbacks[file].append(callback)
+
+    def unwatch(self, file: any) -> None:
+        """
+        Stops watching a file, dropping its callbacks.
+
+        Parameters
+        ----------
+        file : FileController
+            The file.
+        """
+        with self.__condition:
+            if self.__callbacks.pop(file, None) is None:
+                return
+
+            self.__pending.pop(file, None)
+            self.__backend.remove(file)
+
+    def stop(self) -> None:
+        """
+        Stops the thread of the watcher and waits for it. The watcher cannot be used again.
+        """
+        with self.__condition:
+            if self.__stopped:
+                return
+
+            self.__stopped = True
+            thread = self.__thread
+
+        # No file was watched, so there is nothing to close
+        if self.__backend is None:
+            return
+
+        self.__backend.wake()
+
+        # The thread closes the backend when it exits
+        if thread is None:
+            self.__backend.close()
+
+        elif thread is not threading.current_thread():
+            thread.join()
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc_info: any) -> None:
+        self.stop()
+
+    def __start(self) -> None:
+        """
+        Starts the thread of the watcher, if not done yet.
+        """
+        if self.__thread is not None:
+            return
+
+        self.__thread = threading.Thread(target=self.__run, name="yaml_manager-watcher",
+                                         daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        """
+        Waits for the changes of the files and reloads them once they are debounced.
+        """
+        try:
+            while True:
+                with self.__condition:
+                    if self.__stopped:
+                        return
+
+                    due, timeout = self.__take_due()
+
+                for file in due:
+                    self.__reload(file)
+
+                if due:
+                    continue
+
+                changed = self.__backend.wait(timeout)
+
+                if changed:
+                    with self.__condition:
+                        deadline = time.monotonic() + self.__debounce
+
+                        for file in changed:
+                            if file in self.__callbacks:
+                                self.__pending[file] = deadline
+
+        finally:
+            self.__backend.close()
+
+    def __take_due(self) -> tuple[list, Union[float, None]]:
+        """
+        Takes the files whose changes are debounced, and gets the number of seconds until
+        the next deadline, or None if there is none.
+        """
+        now = time.monotonic()
+        due = [file for file, deadline in self.__pending.items() if deadline <= now]
+
+        for file in due:
+            del self.__pending[file]
+
+        deadline = min(self.__pending.values(), default=None)
+        return due, None if deadline is None else max(0.0, deadline - now)
+
+    def __reload(self, file: any) -> None:
+        """
+        Reloads a file, calling its callbacks if it was parsed.
+        """
+        with self.__condition:
+            callbacks = list(self.__callbacks.get(file, ()))
+
+            if file not in self.__callbacks:
+                return
+
+        try:
+            old_data = file.data if file.is_loaded else None
+            changed = file.reload(keep_changes=True)
+
+        # A file written in place by another process may not be valid until its next change
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            warnings.warn(f"Cannot reload {file.file_path}: {error}", RuntimeWarning)
+            return
+
+        if not changed:
+            return
+
+        new_data = file.data
+
+        for callback in callbacks:
+            try:
+                callback(file, old_data, new_data)
+
+            # A failing callback must not stop the other ones, nor the watcher
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                warnings.warn(f"A callback of {file.file_path} failed: {error}", RuntimeWarning)
+
+
+# The Watcher shared by FileController.watch()
+WATCHER = Watcher()
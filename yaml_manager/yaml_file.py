@@ -7,12 +7,35 @@ Classes:
     YAMLFile: Extends FileController to handle YAML file operations.
 """
 
-from pathlib import Path
-import os
+from typing import Iterable, Iterator, Union, TextIO
+import io
 import yaml
 
+from yaml_manager import yaml_stream
 from yaml_manager.file_controller import FileController
 
+# Whether PyYAML was built with the LibYAML bindings
+LIBYAML_AVAILABLE = getattr(yaml, "__with_libyaml__", False)
+
+# Names accepted as a backend
+YAML_BACKENDS = ("auto", "libyaml", "python")
+
+
+class _Dumper(yaml.Dumper):  # pylint: disable=too-many-ancestors
+    """
+    The pure-Python dumper, writing the scalars holding a NEL character (U+0085) in double
+    quotes, where it is escaped, as the other styles do not read it back.
+    """
+
+    def analyze_scalar(self, scalar: str) -> yaml.emitter.ScalarAnalysis:
+        analysis = super().analyze_scalar(scalar)
+
+        if "\x85" in scalar:
+            analysis.allow_flow_plain = analysis.allow_block_plain = False
+            analysis.allow_single_quoted = analysis.allow_block = False
+
+        return analysis
+
 
 class YAMLFile(FileController):
     """
@@ -21,50 +44,295 @@ class YAMLFile(FileController):
     This class extends `FileController` to handle YAML file operations,
     such as loading data from a YAML file and saving data back to it.
 
+    The parser and emitter are picked by the backend: `"libyaml"` uses the LibYAML C
+    classes (`CFullLoader`, `CSafeLoader`, `CDumper`), `"python"` uses the pure-Python
+    ones and `"auto"` uses LibYAML when PyYAML was built with it. Both emitters share the
+    same representers and write files that load back to the same data, but the LibYAML
+    one quotes, escapes and folds some strings differently, so switching the backend may
+    rewrite the text of a file on its next save.
+
     Attributes
     ----------
     file_path : str
         The path to the YAML file.
     data : dict
         A dictionary containing the data loaded from the YAML file.
+    backend : str
+        The requested backend, one of `"auto"`, `"libyaml"` or `"python"`.
+    safe : bool
+        Whether the file is parsed with the safe loader instead of the full loader.
+    subtrees : tuple[str, ...] or None
+        The key prefixes of the only subtrees loaded, or None if the whole file is loaded.
     """
 
     __version__ = "1.2.4"
 
-    def reload(self) -> None:
+    # Backend used by instances created without an explicit backend
+    default_backend = "auto"
+
+    def __init__(
+        self,
+        file_path: str,
+        backend: Union[str, None] = None,
+        safe: bool = False,
+        lazy: Union[bool, None] = None,
+        subtrees: Union[Iterable[str], None] = None
+    ) -> None:
         """
-        Loads the data from the YAML file into `self.data`.
+        Initializes the YAMLFile instance.
 
-        This method reads the YAML file specified by `file_path`
-        and loads the content into the `data` attribute.
+        Parameters
+        ----------
+        file_path : str
+            The path to the YAML file to be managed.
+        backend : str, optional
+            The backend to use, `"auto"`, `"libyaml"` or `"python"`
+            (default is `YAMLFile.default_backend`).
+        safe : bool, optional
+            If True, the file is parsed with the safe loader (default is False).
+        lazy : bool, optional
+            If True, the file is only parsed when its data is first accessed
+            (default is `FileController.default_lazy`).
+        subtrees : Iterable[str], optional
+            The keys, separated by dots, of the only subtrees to load (default is None, the
+            whole file). The other branches of the file are skipped while parsing, without
+            being built, and the file cannot be saved.
 
         Raises
         ------
-        yaml.YAMLError
-            If the file content is not valid YAML.
-        FileNotFoundError
-            If the file does not exist.
+        TypeError
+            If file_path is not a string, safe or lazy is not a boolean, or subtrees is not
+            an iterable of non-empty strings.
+        ValueError
+            If backend is not a known backend, or is `"libyaml"` while LibYAML is unavailable.
         """
-        with open(self.file_path, 'r', encoding="utf-8") as file:
-            self.data = yaml.load(file.read(), Loader=yaml.FullLoader)
+        if not isinstance(safe, bool):
+            raise TypeError("safe must be a boolean.")
+
+        if subtrees is not None:
+            if isinstance(subtrees, str):
+                raise TypeError("subtrees must be an iterable of non-empty strings.")
+
+            subtrees = tuple(subtrees)
+
+            for key in subtrees:
+                if not isinstance(key, str) or len(key) == 0:
+                    raise TypeError("subtrees must be an iterable of non-empty strings.")
+
+        self.safe = safe
+        self.backend = backend if backend is not None else YAMLFile.default_backend
+        self.__subtrees = subtrees
 
-    def save(self) -> None:
+        super().__init__(file_path, lazy)
+
+    @property
+    def backend(self) -> str:
+        """
+        The requested backend, one of `"auto"`, `"libyaml"` or `"python"`.
         """
-        Saves the data from `self.data` back to the YAML file.
+        return self.__backend
+
+    @backend.setter
+    def backend(self, backend: str) -> None:
+        self.__backend = YAMLFile.__validate_backend(backend)
 
-        This method writes the content of `self.data` to the YAML file specified by `file_path`.
-        If the directory for the file does not exist, it creates the necessary directories.
+    @property
+    def subtrees(self) -> Union[tuple[str, ...], None]:
+        """
+        The key prefixes of the only subtrees loaded, or None if the whole file is loaded.
+        """
+        return self.__subtrees
+
+    @property
+    def active_backend(self) -> str:
+        """
+        The backend actually in use, either `"libyaml"` or `"python"`.
+        """
+        if self.__backend == "auto":
+            return "libyaml" if LIBYAML_AVAILABLE else "python"
+
+        return self.__backend
+
+    @property
+    def loader(self) -> type:
+        """
+        The PyYAML loader class used by `reload`.
+        """
+        if self.active_backend == "libyaml":
+            return yaml.CSafeLoader if self.safe else yaml.CFullLoader
+
+        return yaml.SafeLoader if self.safe else yaml.FullLoader
+
+    @property
+    def dumper(self) -> type:
+        """
+        The PyYAML dumper class used by `save`.
+        """
+        if self.active_backend == "libyaml":
+            return yaml.CDumper
+
+        return _Dumper
+
+    def _cache_settings(self) -> tuple:
+        """
+        Gets the settings that change how the file is parsed, including its loader.
+        """
+        return super()._cache_settings() + (self.loader.__name__, self.__subtrees)
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Saves the data from `self.data` back to the YAML file, see `FileController.save`.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the file is written even if the data is not dirty (default is False).
+
+        Returns
+        -------
+        bool
+            True if the file was written or scheduled to be, False if it was already up to date.
 
         Raises
         ------
+        io.UnsupportedOperation
+            If only some subtrees of the file were loaded.
         OSError
             If there is an error in creating directories or writing to the file.
         """
-        i = self.file_path.rfind("/")
+        if self.__subtrees is not None:
+            raise io.UnsupportedOperation(
+                f"Cannot save {self.file_path}, only some of its subtrees were loaded.")
 
-        if i > -1 and not Path(self.file_path[:i]).exists():
-            os.makedirs(self.file_path[:i], 0o666)
+        return super().save(force)
+
+    def iter_documents(
+        self,
+        processes: Union[int, None] = None,
+        batch_size: int = 1 << 20
+    ) -> Iterator[any]:
+        """
+        Iterates over the documents of a multi-document YAML file, separated by `---`.
 
-        with open(self.file_path, 'w', encoding="utf-8") as file:
-            file.write(yaml.dump(self.data, indent=2,
-                       allow_unicode=True, encoding="utf-8", sort_keys=False))
+        The documents are read from the file and parsed as they are iterated, so only one
+        document is held in memory at a time, and `data` is left unchanged. With
+        `processes`, the file is split on document boundaries into batches parsed by a
+        pool of processes, the documents being yielded in the order of the file.
+
+        Parameters
+        ----------
+        processes : int, optional
+            The number of processes parsing the documents (default is None, the documents
+            are parsed by the calling thread).
+        batch_size : int, optional
+            The approximate number of characters of the documents sent to a process at a
+            time (default is 1 MiB).
+
+        Returns
+        -------
+        Iterator[Any]
+            The iterator of the documents.
+
+        Raises
+        ------
+        TypeError
+            If processes is not a positive integer or None, or batch_size is not a
+            positive integer.
+        """
+        if processes is not None and (isinstance(processes, bool) or
+                                      not isinstance(processes, int) or processes < 1):
+            raise TypeError("processes must be a positive integer or None.")
+
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+            raise TypeError("batch_size must be a positive integer.")
+
+        if processes is None:
+            return yaml_stream.iter_documents(self.file_path, self.loader)
+
+        return yaml_stream.iter_documents_parallel(self.file_path, self.loader, processes,
+                                                   batch_size)
+
+    @classmethod
+    def set_default_backend(cls, backend: str) -> None:
+        """
+        Sets the backend used by instances created without an explicit backend.
+
+        Parameters
+        ----------
+        backend : str
+            The backend to use, `"auto"`, `"libyaml"` or `"python"`.
+
+        Raises
+        ------
+        ValueError
+            If backend is not a known backend, or is `"libyaml"` while LibYAML is unavailable.
+        """
+        YAMLFile.default_backend = YAMLFile.__validate_backend(backend)
+
+    @staticmethod
+    def __validate_backend(backend: str) -> str:
+        """
+        Validates a backend name.
+
+        Parameters
+        ----------
+        backend : str
+            The backend name to validate.
+
+        Returns
+        -------
+        str
+            The validated backend name.
+
+        Raises
+        ------
+        ValueError
+            If backend is not a known backend, or is `"libyaml"` while LibYAML is unavailable.
+        """
+        if backend not in YAML_BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(YAML_BACKENDS)}.")
+
+        if backend == "libyaml" and not LIBYAML_AVAILABLE:
+            raise ValueError("PyYAML was not built with LibYAML support.")
+
+        return backend
+
+    def _load_data(self, file: TextIO) -> dict:
+        """
+        Parses the content of the YAML file with the loader of the active backend.
+
+        If `subtrees` is set, only these subtrees are built, from the event stream.
+
+        Parameters
+        ----------
+        file : TextIO
+            The YAML file opened for reading.
+
+        Returns
+        -------
+        dict
+            The parsed data.
+
+        Raises
+        ------
+        yaml.YAMLError
+            If the file content is not valid YAML.
+        """
+        if self.__subtrees is not None:
+            return yaml_stream.load_subtrees(self.loader(file), self.__subtrees)
+
+        return yaml.load(file, Loader=self.loader)
+
+    def _dump_data(self, data: dict, file: TextIO) -> None:
+        """
+        Serializes data into the YAML file with the dumper of the active backend.
+
+        Parameters
+        ----------
+        data : dict
+            The data to serialize.
+        file : TextIO
+            The YAML file opened for writing.
+        """
+        yaml.dump(data, file, Dumper=self.dumper, indent=2,
+                  allow_unicode=True, sort_keys=False)
@@ -0,0 +1,408 @@
+"""
+yaml_stream.py
+
+This module provides the loading of YAML files from the event stream of a PyYAML loader,
+building only the parts of the file that are needed.
+
+Functions:
+    load_subtrees: Loads only the subtrees at some key prefixes of a YAML document.
+    iter_documents: Iterates over the documents of a YAML file, one at a time.
+    iter_documents_parallel: Iterates over the documents of a YAML file, parsed by a
+        pool of processes.
+"""
+
+from typing import Iterable, Iterator, TextIO
+from collections import deque
+import yaml
+from yaml.composer import ComposerError
+from yaml.events import (AliasEvent, CollectionEndEvent, CollectionStartEvent,
+                         MappingEndEvent, MappingStartEvent, ScalarEvent, SequenceEndEvent,
+                         StreamEndEvent)
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from yaml_manager import key_path
+
+# The tag of the keys matched against the prefixes
+_STR_TAG = "tag:yaml.org,2002:str"
+
+# The tag of the merge keys, whose values are always composed
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+def _prefix_tree(prefixes: Iterable[str]) -> dict:
+    """
+    Builds a tree of key prefixes, in which None marks a subtree loaded entirely.
+    """
+    tree = {}
+
+    for prefix in prefixes:
+        node = tree
+        parts = key_path.compile_key(prefix)
+
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break
+
+            node = node.setdefault(part, {})
+
+        else:
+            node[parts[-1]] = None
+
+    return tree
+
+
+def _compose(loader: any, anchors: dict) -> Node:
+    """
+    Composes the next node of the event stream, like the composer of PyYAML.
+
+    Parameters
+    ----------
+    loader : Any
+        The PyYAML loader instance.
+    anchors : dict
+        The nodes by anchor, updated with the anchors of the node.
+
+    Returns
+    -------
+    Node
+        The composed node.
+
+    Raises
+    ------
+    ComposerError
+        If an alias refers to an unknown anchor.
+    """
+    event = loader.get_event()
+
+    if isinstance(event, AliasEvent):
+        if event.anchor not in anchors:
+            raise ComposerError(None, None, f"found undefined alias {event.anchor!r}",
+                                event.start_mark)
+
+        return anchors[event.anchor]
+
+    tag = event.tag
+
+    if isinstance(event, ScalarEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(ScalarNode, event.value, event.implicit)
+
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark,
+                          style=event.style)
+
+    else:
+        node_class = MappingNode if isinstance(event, MappingStartEvent) else SequenceNode
+
+        if tag is None or tag == "!":
+            tag = loader.resolve(node_class, None, event.implicit)
+
+        node = node_class(tag, [], event.start_mark, None, flow_style=event.flow_style)
+
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+
+    if isinstance(node, MappingNode):
+        while not loader.check_event(MappingEndEvent):
+            node.value.append((_compose(loader, anchors), _compose(loader, anchors)))
+
+        node.end_mark = loader.get_event().end_mark
+
+    elif isinstance(node, SequenceNode):
+        while not loader.check_event(SequenceEndEvent):
+            node.value.append(_compose(loader, anchors))
+
+        node.end_mark = loader.get_event().end_mark
+
+    return node
+
+
+def _skip(loader: any, anchors: dict) -> None:
+    """
+    Consumes the events of the next node without building it.
+
+    The anchored nodes inside it are still composed, as later aliases may refer to them.
+
+    Parameters
+    ----------
+    loader : Any
+        The PyYAML loader instance.
+    anchors : dict
+        The nodes by anchor, updated with the anchored nodes skipped.
+    """
+    depth = 0
+
+    while True:
+        event = loader.peek_event()
+
+        if not isinstance(event, (AliasEvent, CollectionEndEvent)) and event.anchor is not None:
+            _compose(loader, anchors)
+
+        else:
+            loader.get_event()
+
+            if isinstance(event, CollectionStartEvent):
+                depth += 1
+
+            elif isinstance(event, CollectionEndEvent):
+                depth -= 1
+
+        if depth == 0:
+            return
+
+
+def _select(loader: any, tree: dict, anchors: dict) -> MappingNode:
+    """
+    Composes the next mapping node, keeping only the keys of a prefix tree.
+
+    Parameters
+    ----------
+    loader : Any
+        The PyYAML loader instance, whose next event starts a mapping without anchor.
+    tree : dict
+        The prefix tree of the keys to keep.
+    anchors : dict
+        The nodes by anchor.
+
+    Returns
+    -------
+    MappingNode
+        The mapping node holding the kept keys, and the merge keys.
+    """
+    event = loader.get_event()
+    tag = event.tag
+
+    if tag is None or tag == "!":
+        tag = loader.resolve(MappingNode, None, event.implicit)
+
+    node = MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+
+    while not loader.check_event(MappingEndEvent):
+        key = _compose(loader, anchors)
+
+        if key.tag == _MERGE_TAG:
+            node.value.append((key, _compose(loader, anchors)))
+
+        elif key.tag == _STR_TAG and isinstance(key, ScalarNode) and key.value in tree:
+            subtree = tree[key.value]
+            event = loader.peek_event()
+
+            if (subtree is not None and isinstance(event, MappingStartEvent) and
+                    event.anchor is None):
+                node.value.append((key, _select(loader, subtree, anchors)))
+            else:
+                node.value.append((key, _compose(loader, anchors)))
+
+        else:
+            _skip(loader, anchors)
+
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+
+def _prune(data: dict, tree: dict) -> dict:
+    """
+    Removes the keys outside a prefix tree from data, which merge keys may have added.
+    """
+    pruned = {}
+
+    for key, subtree in tree.items():
+        if key in data:
+            if subtree is None:
+                pruned[key] = data[key]
+
+            elif isinstance(data[key], dict):
+                pruned[key] = _prune(data[key], subtree)
+
+    return pruned
+
+
+def load_subtrees(loader: any, prefixes: Iterable[str]) -> dict:
+    """
+    Loads only the subtrees at some key prefixes of a YAML document.
+
+    The events of the document are read one at a time, and only the nodes of the requested
+    subtrees are composed and constructed, so the time and memory spent depend on the size
+    of these subtrees rather than on the size of the document. The other branches are
+    skipped, except for their anchored nodes, which aliases of the subtrees may refer to.
+
+    Parameters
+    ----------
+    loader : Any
+        A PyYAML loader instance, reading the document.
+    prefixes : Iterable[str]
+        The keys, separated by dots, of the subtrees to load.
+
+    Returns
+    -------
+    dict
+        The data holding only the requested subtrees, at their place in the document.
+        Prefixes that are not found are left out.
+
+    Raises
+    ------
+    yaml.YAMLError
+        If the content is not valid YAML, or holds more than one document.
+    """
+    try:
+        loader.get_event()
+
+        if loader.check_event(StreamEndEvent):
+            return {}
+
+        loader.get_event()
+        tree = _prefix_tree(prefixes)
+        anchors = {}
+        event = loader.peek_event()
+
+        if isinstance(event, MappingStartEvent) and event.anchor is None:
+            root = _select(loader, tree, anchors)
+        else:
+            root = _compose(loader, anchors)
+
+        loader.get_event()
+
+        if not loader.check_event(StreamEndEvent):
+            event = loader.get_event()
+            raise ComposerError("expected a single document in the stream", None,
+                                "but found another document", event.start_mark)
+
+        data = loader.construct_document(root)
+
+    finally:
+        loader.dispose()
+
+    return _prune(data, tree) if isinstance(data, dict) else {}
+
+
+def iter_documents(file_path: str, loader: type) -> Iterator[any]:
+    """
+    Iterates over the documents of a YAML file, one at a time.
+
+    The file is read as the documents are parsed, so only one document is held in memory
+    at a time.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the YAML file.
+    loader : type
+        The PyYAML loader class.
+
+    Yields
+    ------
+    Any
+        The documents, in order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    yaml.YAMLError
+        If the content is not valid YAML.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        yield from yaml.load_all(file, Loader=loader)
+
+
+def _is_document_start(line: str) -> bool:
+    """
+    Checks whether a line starts with a document start marker.
+    """
+    return line.startswith("---") and (len(line) == 3 or line[3] in " \t\r\n")
+
+
+def _split_batches(file: TextIO, batch_size: int) -> Iterator[str]:
+    """
+    Splits the content of a YAML file into batches of whole documents.
+
+    A batch ends before the first document start marker, or directive, found after the
+    batch reached `batch_size` characters. As these markers cannot appear at the start of a
+    line inside a document, each batch can be parsed on its own.
+    """
+    batch = []
+    size = 0
+    directives = False
+
+    for line in file:
+        if size >= batch_size and not directives and (line.startswith("%") or
+                                                      _is_document_start(line)):
+            yield "".join(batch)
+            batch = []
+            size = 0
+
+        # The directives of a document stay in the batch of its start marker
+        if line.startswith("%"):
+            directives = True
+        elif _is_document_start(line):
+            directives = False
+
+        batch.append(line)
+        size += len(line)
+
+    if batch:
+        yield "".join(batch)
+
+
+def _load_batch(text: str, loader: type) -> list:
+    """
+    Parses the documents of a batch, in a worker process.
+    """
+    return list(yaml.load_all(text, Loader=loader))
+
+
+def iter_documents_parallel(
+    file_path: str,
+    loader: type,
+    processes: int,
+    batch_size: int
+) -> Iterator[any]:
+    """
+    Iterates over the documents of a YAML file, parsed by a pool of processes.
+
+    The file is split on document boundaries into batches of about `batch_size` characters,
+    which are parsed by the pool while the documents of the previous batches are yielded.
+    At most two batches per process are pending at a time, so memory stays bounded, and the
+    documents are yielded in the order of the file.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the YAML file.
+    loader : type
+        The PyYAML loader class, which must be importable by the worker processes.
+    processes : int
+        The number of worker processes.
+    batch_size : int
+        The approximate number of characters parsed by a process at a time.
+
+    Yields
+    ------
+    Any
+        The documents, in order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    yaml.YAMLError
+        If the content is not valid YAML.
+    """
+    # Only imported here, as it is slow to import and rarely needed
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        executor = ProcessPoolExecutor(processes)
+        pending = deque()
+
+        try:
+            for batch in _split_batches(file, batch_size):
+                pending.append(executor.submit(_load_batch, batch, loader))
+
+                if len(pending) > 2 * processes:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+        finally:
+            executor.shutdown(cancel_futures=True)